@@ -0,0 +1,164 @@
+"""
+Модуль Async PhoneBook - асинхронный интерфейс справочника для приложений на asyncio
+
+Загрузка, сохранение и поиск выполняются в пуле потоков и не блокируют цикл событий.
+Под фасадом по умолчанию используется ThreadSafePhoneBook, поэтому операции из разных
+задач безопасно выполняются одновременно. Справочник, не безопасный для потоков, получает
+собственный пул из одного потока, и его операции выполняются по очереди. Вызовы save(),
+сделанные до начала записи, объединяются в одну запись файла.
+"""
+
+import asyncio
+import os
+from concurrent.futures import Executor, ThreadPoolExecutor
+from functools import partial
+from typing import AsyncIterator, List, Optional
+from model import Contact, ContactsView, PhoneBook
+from thread_safe import ThreadSafePhoneBook
+
+
+class AsyncPhoneBook:
+    """Асинхронный фасад телефонного справочника"""
+    
+    # Сколько контактов отдает асинхронный итератор, прежде чем вернуть управление циклу событий
+    ITER_BATCH_SIZE = 1000
+    
+    def __init__(self, filename: str = "phonebook.json", phonebook: Optional[PhoneBook] = None,
+                 executor: Optional[Executor] = None, **kwargs):
+        self._phonebook = phonebook if phonebook is not None else ThreadSafePhoneBook(filename, **kwargs)
+        thread_safe = isinstance(self._phonebook, ThreadSafePhoneBook)
+        if executor is not None and not thread_safe:
+            raise ValueError("Справочник, не безопасный для потоков, нельзя использовать с внешним пулом: "
+                             "передайте ThreadSafePhoneBook")
+        # Собственный пул создается, только если пул не передан, и закрывается в close();
+        # операции справочника без блокировок выполняются в одном потоке по очереди
+        self._own_executor = executor is None
+        self._executor = executor if executor is not None else ThreadPoolExecutor(
+            max_workers=None if thread_safe else 1, thread_name_prefix='phonebook'
+        )
+        # Сохранение, которое выполняется сейчас, и следующее, ожидающее его завершения
+        self._active_save: Optional[asyncio.Task] = None
+        self._queued_save: Optional[asyncio.Task] = None
+    
+    @property
+    def phonebook(self) -> PhoneBook:
+        """Геттер для справочника под фасадом"""
+        return self._phonebook
+    
+    async def _run(self, function, *args, **kwargs):
+        """Выполняет функцию справочника в пуле потоков"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, partial(function, *args, **kwargs))
+    
+    async def load(self) -> bool:
+        """Загружает справочник из файла"""
+        return await self._run(self._phonebook.load_from_file)
+    
+    async def save(self) -> bool:
+        """
+        Сохраняет справочник. Если сохранение еще не началось, вызов присоединяется к нему;
+        если запись уже идет, ставится (или присоединяется к) одно следующее сохранение.
+        """
+        if self._queued_save is None:
+            self._queued_save = asyncio.get_running_loop().create_task(self._save_after(self._active_save))
+        # shield: отмена одного ожидающего не отменяет общую запись
+        return await asyncio.shield(self._queued_save)
+    
+    async def _save_after(self, previous: Optional[asyncio.Task]) -> bool:
+        """Дожидается предыдущей записи и сохраняет справочник"""
+        if previous is not None:
+            try:
+                await previous
+            except Exception:
+                # Ошибка предыдущей записи получена ее вызывающими, эта запись выполняется заново
+                pass
+        current = asyncio.current_task()
+        # С этого момента новые вызовы save() ставят следующее сохранение
+        self._queued_save = None
+        self._active_save = current
+        try:
+            if not self._phonebook.has_unsaved_changes() and os.path.exists(self._phonebook.filename):
+                # Изменения уже записаны предыдущим сохранением
+                return True
+            return await self._run(self._phonebook.save_to_file)
+        finally:
+            if self._active_save is current:
+                self._active_save = None
+    
+    async def search(self, search_term: str, field: Optional[str] = None) -> List[Contact]:
+        """Поиск контактов"""
+        return await self._run(self._phonebook.search, search_term, field)
+    
+    async def iter_search(self, search_term: str, field: Optional[str] = None) -> AsyncIterator[Contact]:
+        """Асинхронный итератор по результатам поиска"""
+        results = await self.search(search_term, field)
+        async for contact in self._iterate(results):
+            yield contact
+    
+    async def iter_contacts(self) -> AsyncIterator[Contact]:
+        """Асинхронный итератор по контактам справочника"""
+        contacts = await self.contacts()
+        async for contact in self._iterate(contacts):
+            yield contact
+    
+    async def _iterate(self, contacts) -> AsyncIterator[Contact]:
+        """Отдает контакты, периодически возвращая управление циклу событий"""
+        for i, contact in enumerate(contacts, start=1):
+            yield contact
+            if i % self.ITER_BATCH_SIZE == 0:
+                await asyncio.sleep(0)
+    
+    async def contacts(self) -> ContactsView:
+        """Возвращает представление контактов"""
+        return await self._run(lambda: self._phonebook.contacts)
+    
+    async def find_by_id(self, contact_id: int) -> Optional[Contact]:
+        """Находит контакт по ID"""
+        return await self._run(self._phonebook.find_by_id, contact_id)
+    
+    async def get_contact(self, contact_id: int) -> Contact:
+        """Получает контакт по ID или выбрасывает исключение"""
+        return await self._run(self._phonebook.get_contact, contact_id)
+    
+    async def find_by_phone(self, phone: str) -> List[Contact]:
+        """Находит контакты по канонической форме телефона"""
+        return await self._run(self._phonebook.find_by_phone, phone)
+    
+    async def add_contact(self, contact: Contact) -> Contact:
+        """Добавляет новый контакт"""
+        return await self._run(self._phonebook.add_contact, contact)
+    
+    async def add_contacts(self, contacts) -> List[Contact]:
+        """Добавляет контакты пакетом"""
+        return await self._run(self._phonebook.add_contacts, list(contacts))
+    
+    async def update_contact(self, contact_id: int, **kwargs) -> Contact:
+        """Обновляет контакт"""
+        return await self._run(self._phonebook.update_contact, contact_id, **kwargs)
+    
+    async def delete_contact(self, contact_id: int) -> bool:
+        """Удаляет контакт"""
+        return await self._run(self._phonebook.delete_contact, contact_id)
+    
+    def has_unsaved_changes(self) -> bool:
+        """Проверяет наличие несохраненных изменений"""
+        return self._phonebook.has_unsaved_changes()
+    
+    async def close(self):
+        """Дожидается начатых сохранений и закрывает собственный пул потоков"""
+        for task in (self._queued_save, self._active_save):
+            if task is not None:
+                try:
+                    await task
+                except Exception:
+                    pass
+        if self._own_executor:
+            # Пул дожидается остальных вызовов справочника - ждем в другом потоке, не блокируя цикл событий
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(None, partial(self._executor.shutdown, wait=True))
+    
+    async def __aenter__(self) -> 'AsyncPhoneBook':
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
@@ -0,0 +1,57 @@
+"""
+Бенчмарк экспорта: пропускная способность (МБ/с) и пиковая память потоковых экспортеров
+
+Запуск из корня репозитория:
+    python -m benchmarks.bench_export [количество контактов]
+"""
+
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from model import Contact, PhoneBook, ColumnarContactStore
+from exporters import WRITERS, export_to_file
+
+
+def build_phonebook(count: int) -> PhoneBook:
+    """Создает справочник с синтетическими контактами в колоночном хранилище"""
+    phonebook = PhoneBook(store=ColumnarContactStore())
+    phonebook.add_contacts(
+        Contact(f"Контакт {i}", f"+7 (999) {i:07d}", "Коллега, отдел продаж", i + 1)
+        for i in range(count)
+    )
+    return phonebook
+
+
+def measure(phonebook: PhoneBook, file_format: str, filename: str):
+    """Возвращает (МБ/с, пиковая память в КБ) для экспорта в указанном формате"""
+    start = time.perf_counter()
+    export_to_file(phonebook, filename, file_format)
+    elapsed = time.perf_counter() - start
+    size = os.path.getsize(filename)
+    
+    # Память измеряется отдельным прогоном: tracemalloc заметно замедляет экспорт
+    tracemalloc.start()
+    export_to_file(phonebook, filename, file_format)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    
+    return size / (1024 * 1024) / elapsed, peak / 1024
+
+
+def main():
+    """Запускает бенчмарк и печатает результаты"""
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    phonebook = build_phonebook(count)
+    
+    print(f"Контактов: {count}")
+    with tempfile.TemporaryDirectory() as directory:
+        for file_format in WRITERS:
+            filename = os.path.join(directory, f"export.{file_format}")
+            throughput, peak = measure(phonebook, file_format, filename)
+            print(f"{file_format:7} {throughput:8.1f} МБ/с, пик памяти {peak:8.1f} КБ")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""
+Бенчмарк памяти: байт на контакт для размещения в __dict__, в __slots__
+и в колоночном хранилище, а также пик памяти при загрузке файла в хранилище
+
+Запуск из корня репозитория:
+    python -m benchmarks.bench_memory [количество контактов]
+"""
+
+import os
+import sys
+import tempfile
+import tracemalloc
+from model import Contact, ColumnarContactStore, FileHandler, ListContactStore, PhoneBook
+
+
+class DictContact:
+    """Контакт с прежним размещением атрибутов в __dict__ (для сравнения)"""
+    
+    def __init__(self, name: str, phone: str, comment: str = "", contact_id=None):
+        self._id = contact_id
+        self._name = name.strip()
+        self._phone = phone.strip()
+        self._comment = comment.strip()
+        self._name_key = self._name.casefold()
+        self._phone_key = self._phone.casefold()
+        self._comment_key = self._comment.casefold()
+        self._canonical_phone = Contact.normalize_phone(self._phone)
+
+
+def bytes_per_contact(factory, count: int) -> float:
+    """Измеряет средний объем памяти на один контакт"""
+    # Строки создаются заранее, чтобы измерять только накладные расходы объектов
+    rows = [(f"Контакт {i}", f"+7 (999) {i:07d}", "Коллега", i + 1) for i in range(count)]
+    
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    contacts = [factory(name, phone, comment, contact_id) for name, phone, comment, contact_id in rows]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    
+    del contacts
+    return (after - before) / count
+
+
+def bytes_per_stored_contact(store_factory, count: int) -> float:
+    """Измеряет средний объем памяти хранилища на один контакт"""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    store = store_factory()
+    for i in range(count):
+        store.append(Contact(f"Контакт {i}", f"+7 (999) {i:07d}", "Коллега", i + 1))
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    
+    del store
+    return (after - before) / count
+
+
+def peak_bytes_per_loaded_contact(store_factory, filename: str, count: int) -> float:
+    """Измеряет пик памяти на один контакт при загрузке файла в хранилище"""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    phonebook = PhoneBook(filename=filename, store=store_factory())
+    phonebook.load_from_file()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    
+    del phonebook
+    return (peak - before) / count
+
+
+def main():
+    """Запускает бенчмарк и печатает результаты"""
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    
+    dict_size = bytes_per_contact(DictContact, count)
+    slots_size = bytes_per_contact(Contact, count)
+    
+    print(f"Контактов: {count}")
+    print(f"__dict__:  {dict_size:8.1f} байт/контакт")
+    print(f"__slots__: {slots_size:8.1f} байт/контакт")
+    print(f"Экономия:  {dict_size - slots_size:8.1f} байт/контакт ({1 - slots_size / dict_size:.0%})")
+    
+    list_store_size = bytes_per_stored_contact(ListContactStore, count)
+    columnar_store_size = bytes_per_stored_contact(ColumnarContactStore, count)
+    print(f"ListContactStore:     {list_store_size:8.1f} байт/контакт")
+    print(f"ColumnarContactStore: {columnar_store_size:8.1f} байт/контакт")
+    
+    handle, filename = tempfile.mkstemp(suffix='.json')
+    os.close(handle)
+    try:
+        FileHandler.save_to_file(filename, [
+            Contact(f"Контакт {i}", f"+7 (999) {i:07d}", "Коллега", i + 1) for i in range(count)
+        ])
+        list_peak = peak_bytes_per_loaded_contact(ListContactStore, filename, count)
+        columnar_peak = peak_bytes_per_loaded_contact(ColumnarContactStore, filename, count)
+    finally:
+        os.remove(filename)
+    print(f"Пик при загрузке, ListContactStore:     {list_peak:8.1f} байт/контакт")
+    print(f"Пик при загрузке, ColumnarContactStore: {columnar_peak:8.1f} байт/контакт")
+
+
+if __name__ == "__main__":
+    main()
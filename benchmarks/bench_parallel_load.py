@@ -0,0 +1,56 @@
+"""
+Бенчмарк параллельной загрузки: время загрузки файла NDJSON и JSON при разном числе процессов
+
+Запуск из корня репозитория:
+    python -m benchmarks.bench_parallel_load [количество контактов] [максимум процессов]
+"""
+
+import os
+import sys
+import tempfile
+import time
+from model import Contact, FileHandler, PhoneBook
+
+
+def write_files(directory: str, count: int):
+    """Создает файлы JSON и NDJSON с синтетическими контактами"""
+    contacts = [
+        Contact(f"Контакт {i}", f"+7 (999) {i:07d}", "Коллега, отдел продаж", i + 1)
+        for i in range(count)
+    ]
+    paths = []
+    for extension in ('.ndjson', '.json'):
+        path = os.path.join(directory, 'phonebook' + extension)
+        FileHandler.save_to_file(path, contacts)
+        paths.append(path)
+    return paths
+
+
+def load_time(filename: str, workers: int) -> float:
+    """Возвращает время загрузки файла в секундах"""
+    phonebook = PhoneBook(filename=filename, load_workers=workers)
+    start = time.perf_counter()
+    phonebook.load_from_file()
+    return time.perf_counter() - start
+
+
+def main():
+    """Запускает бенчмарк и печатает результаты"""
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 500_000
+    max_workers = int(sys.argv[2]) if len(sys.argv) > 2 else (os.cpu_count() or 1)
+    
+    print(f"Контактов: {count}, ядер: {os.cpu_count()}")
+    with tempfile.TemporaryDirectory() as directory:
+        for path in write_files(directory, count):
+            baseline = load_time(path, 1)
+            print(f"{os.path.basename(path)}: 1 процесс {baseline:6.2f} с")
+            workers = 2
+            while workers <= max_workers:
+                elapsed = load_time(path, workers)
+                print(f"{os.path.basename(path)}: {workers} процессов {elapsed:6.2f} с, "
+                      f"ускорение {baseline / elapsed:4.2f}x")
+                workers *= 2
+
+
+if __name__ == "__main__":
+    main()
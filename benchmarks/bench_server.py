@@ -0,0 +1,112 @@
+"""
+Бенчмарк HTTP/JSON сервиса: задержка (p50/p99) и число запросов в секунду
+
+Сервер запускается в этом же процессе на свободном порту, клиенты - потоки
+с постоянными соединениями keep-alive. Смесь запросов: получение по ID,
+поиск, пакетное получение, повторное чтение с If-None-Match и создание.
+
+Запуск из корня репозитория:
+    python -m benchmarks.bench_server [количество контактов] [клиентов] [запросов на клиента]
+"""
+
+import http.client
+import json
+import random
+import sys
+import threading
+import time
+from typing import Dict, List
+from model import Contact
+from server import make_server
+from thread_safe import ThreadSafePhoneBook
+
+
+def build_phonebook(count: int) -> ThreadSafePhoneBook:
+    """Создает справочник с синтетическими контактами (файл не записывается)"""
+    phonebook = ThreadSafePhoneBook(filename="bench_server.json")
+    phonebook.add_contacts(
+        Contact(f"Контакт {i}", f"+7 (999) {i:07d}", "Коллега, отдел продаж") for i in range(count)
+    )
+    return phonebook
+
+
+def client(port: int, requests: int, count: int, seed: int, latencies: Dict[str, List[float]]):
+    """Выполняет смесь запросов по одному соединению и записывает задержки по видам запросов"""
+    rng = random.Random(seed)
+    connection = http.client.HTTPConnection('127.0.0.1', port)
+    etag = None
+    for _ in range(requests):
+        kind = rng.choices(('get', 'search', 'batch_get', 'cached', 'create'), (50, 15, 15, 15, 5))[0]
+        headers = {}
+        body = None
+        if kind == 'get':
+            method, path = 'GET', f'/contacts/{rng.randint(1, count)}'
+        elif kind == 'search':
+            method, path = 'GET', f'/contacts?q={rng.randint(0, 9999):04d}&field=phone'
+        elif kind == 'batch_get':
+            method, path = 'POST', '/contacts/batch/get'
+            body = {'ids': [rng.randint(1, count) for _ in range(50)]}
+        elif kind == 'cached':
+            method, path = 'GET', '/contacts?q=999999'
+            if etag:
+                headers['If-None-Match'] = etag
+        else:
+            method, path = 'POST', '/contacts'
+            body = {'name': f"Новый {rng.random()}", 'phone': '+1 555 0100'}
+        
+        payload = None if body is None else json.dumps(body).encode('utf-8')
+        start = time.perf_counter()
+        connection.request(method, path, body=payload, headers=headers)
+        response = connection.getresponse()
+        response.read()
+        latencies[kind].append(time.perf_counter() - start)
+        if kind == 'cached':
+            etag = response.getheader('ETag')
+    connection.close()
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    """Возвращает перцентиль отсортированного списка (в миллисекундах)"""
+    return values[min(len(values) - 1, int(len(values) * fraction))] * 1000
+
+
+def main():
+    """Запускает бенчмарк и печатает результаты"""
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    clients = int(sys.argv[2]) if len(sys.argv) > 2 else 8
+    requests = int(sys.argv[3]) if len(sys.argv) > 3 else 500
+    
+    server = make_server(build_phonebook(count), port=0)
+    server_thread = threading.Thread(target=server.serve_forever, daemon=True)
+    server_thread.start()
+    
+    results = [{kind: [] for kind in ('get', 'search', 'batch_get', 'cached', 'create')} for _ in range(clients)]
+    threads = [
+        threading.Thread(target=client, args=(server.server_port, requests, count, seed, results[seed]))
+        for seed in range(clients)
+    ]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    server.shutdown()
+    server.server_close()
+    
+    print(f"Контактов: {count}, клиентов: {clients}, запросов: {clients * requests}")
+    print(f"Запросов в секунду: {clients * requests / elapsed:.0f}")
+    all_latencies = []
+    for kind in results[0]:
+        values = sorted(value for result in results for value in result[kind])
+        all_latencies.extend(values)
+        if values:
+            print(f"{kind:10} n={len(values):6}  p50 {percentile(values, 0.5):7.2f} мс  "
+                  f"p99 {percentile(values, 0.99):7.2f} мс")
+    all_latencies.sort()
+    print(f"{'всего':10} n={len(all_latencies):6}  p50 {percentile(all_latencies, 0.5):7.2f} мс  "
+          f"p99 {percentile(all_latencies, 0.99):7.2f} мс")
+
+
+if __name__ == "__main__":
+    main()
@@ -30,6 +30,7 @@ class Controller:
         if os.path.exists(self.phonebook.filename):
             self.phonebook.load_from_file()
             self.view.show_file_loaded(self.phonebook.filename, self.phonebook.count)
+            self.view.show_load_report(self.phonebook.load_report)
         else:
             self.view.show_file_not_found(self.phonebook.filename)
         
@@ -80,6 +81,7 @@ class Controller:
                 self.phonebook.filename = filename
             if self.phonebook.load_from_file():
                 self.view.show_file_loaded(self.phonebook.filename, self.phonebook.count)
+                self.view.show_load_report(self.phonebook.load_report)
         except Exception as e:
             self.view.show_error(str(e))
     
@@ -125,7 +127,7 @@ class Controller:
     
     def handle_find_contact(self):
         """Обрабатывает поиск контакта"""
-        if not self.phonebook.contacts:
+        if not self.phonebook.count:
             self.view.show_info("Справочник пуст.")
             return
         
@@ -158,7 +160,7 @@ class Controller:
     
     def handle_edit_contact(self):
         """Обрабатывает редактирование контакта"""
-        if not self.phonebook.contacts:
+        if not self.phonebook.count:
             self.view.show_info("Справочник пуст.")
             return
         
@@ -203,7 +205,7 @@ class Controller:
     
     def handle_delete_contact(self):
         """Обрабатывает удаление контакта"""
-        if not self.phonebook.contacts:
+        if not self.phonebook.count:
             self.view.show_info("Справочник пуст.")
             return
         
@@ -267,6 +269,5 @@ class Controller:
     @staticmethod
     def _validate_phone(phone: str) -> bool:
         """Проверяет формат телефона"""
-        allowed_chars = set('0123456789+-() ')
-        return all(c in allowed_chars for c in phone)
+        return Contact.is_valid_phone(phone)
 
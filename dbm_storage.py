@@ -0,0 +1,275 @@
+"""
+Модуль DBM Storage - хранение справочника в базе ключ-значение (dbm) без загрузки в память
+
+Ключи базы:
+    c:<id>        - контакт: длины и строки имени, телефона и комментария в UTF-8
+    p:<телефон>   - ID контактов с данной канонической формой телефона (индекс на диске)
+    #next_id      - следующий ID
+    #count        - количество контактов
+"""
+
+import dbm
+import struct
+from array import array
+from typing import Iterable, Iterator, List, Optional
+from model import Contact, ContactStore, PhoneBook
+from exceptions import FileCorruptedError, FileOperationError
+
+
+# Длины строк имени, телефона и комментария в закодированном контакте
+RECORD_HEADER = struct.Struct('<III')
+
+CONTACT_PREFIX = b'c:'
+PHONE_PREFIX = b'p:'
+NEXT_ID_KEY = b'#next_id'
+COUNT_KEY = b'#count'
+
+
+def encode_contact(contact: Contact) -> bytes:
+    """Кодирует поля контакта (без ID) в компактное значение"""
+    name = contact.name.encode('utf-8')
+    phone = contact.phone.encode('utf-8')
+    comment = contact.comment.encode('utf-8')
+    return RECORD_HEADER.pack(len(name), len(phone), len(comment)) + name + phone + comment
+
+
+def decode_contact(contact_id: int, value: bytes) -> Contact:
+    """Восстанавливает контакт из значения, записанного encode_contact"""
+    name_length, phone_length, comment_length = RECORD_HEADER.unpack_from(value, 0)
+    start = RECORD_HEADER.size
+    name = value[start:start + name_length].decode('utf-8')
+    start += name_length
+    phone = value[start:start + phone_length].decode('utf-8')
+    start += phone_length
+    comment = value[start:start + comment_length].decode('utf-8')
+    return Contact(name=name, phone=phone, comment=comment, contact_id=contact_id)
+
+
+def open_database(filename: str, flag: str = 'c'):
+    """Открывает базу dbm (модуль dbm выбирает доступную реализацию)"""
+    try:
+        return dbm.open(filename, flag)
+    except dbm.error as e:
+        raise FileCorruptedError(f"Файл {filename} поврежден или не является базой dbm: {e}")
+    except OSError as e:
+        raise FileOperationError(f"Ошибка при открытии файла {filename}: {e}")
+
+
+class DBMContactStore(ContactStore):
+    """
+    Хранилище контактов в базе dbm.
+    
+    Контакт читается с диска при каждом обращении, в памяти ничего не кешируется.
+    Порядок контактов - по возрастанию ID, позицией контакта служит сам ID.
+    """
+    
+    def __init__(self, database):
+        self._db = database
+    
+    @staticmethod
+    def _contact_key(contact_id: int) -> bytes:
+        """Возвращает ключ записи контакта"""
+        return CONTACT_PREFIX + str(contact_id).encode('ascii')
+    
+    @staticmethod
+    def _phone_key(canonical: str) -> bytes:
+        """Возвращает ключ записи индекса телефонов"""
+        return PHONE_PREFIX + canonical.encode('ascii')
+    
+    def _get_int(self, key: bytes) -> int:
+        """Читает служебное число из базы"""
+        value = self._db.get(key)
+        return int(value) if value is not None else 0
+    
+    def _set_int(self, key: bytes, value: int):
+        """Записывает служебное число в базу"""
+        self._db[key] = str(value).encode('ascii')
+    
+    @property
+    def next_id(self) -> int:
+        """Геттер для следующего ID, сохраненного в базе"""
+        return self._get_int(NEXT_ID_KEY) or 1
+    
+    @next_id.setter
+    def next_id(self, value: int):
+        """Сеттер для следующего ID"""
+        self._set_int(NEXT_ID_KEY, value)
+    
+    def __len__(self) -> int:
+        return self._get_int(COUNT_KEY)
+    
+    def ids(self) -> List[int]:
+        """Возвращает ID всех контактов по возрастанию (читаются только ключи)"""
+        prefix_length = len(CONTACT_PREFIX)
+        return sorted(
+            int(key[prefix_length:]) for key in self._db.keys() if key.startswith(CONTACT_PREFIX)
+        )
+    
+    def __iter__(self) -> Iterator[Contact]:
+        # Контакты читаются с диска по одному
+        for contact_id in self.ids():
+            contact = self.get(contact_id)
+            if contact is not None:
+                yield contact
+    
+    def position(self, contact_id: int) -> Optional[int]:
+        """Возвращает ID, если контакт есть в базе, иначе None"""
+        return contact_id if self._contact_key(contact_id) in self._db else None
+    
+    def at(self, position: int) -> Contact:
+        """Возвращает контакт по позиции (ID)"""
+        contact = self.get(position)
+        if contact is None:
+            raise IndexError(position)
+        return contact
+    
+    def get(self, contact_id: int) -> Optional[Contact]:
+        """Возвращает контакт по ID за одно чтение с диска"""
+        value = self._db.get(self._contact_key(contact_id))
+        if value is None:
+            return None
+        try:
+            return decode_contact(contact_id, value)
+        except (struct.error, UnicodeDecodeError):
+            raise FileCorruptedError(f"Запись контакта с ID {contact_id} повреждена")
+    
+    def phone_ids(self, canonical: str) -> List[int]:
+        """Возвращает ID контактов с указанной канонической формой телефона"""
+        value = self._db.get(self._phone_key(canonical))
+        if value is None:
+            return []
+        ids = array('q')
+        ids.frombytes(value)
+        return ids.tolist()
+    
+    def _set_phone_ids(self, canonical: str, ids: List[int]):
+        """Записывает список ID для канонической формы телефона"""
+        key = self._phone_key(canonical)
+        if ids:
+            self._db[key] = array('q', ids).tobytes()
+        elif key in self._db:
+            del self._db[key]
+    
+    def _phone_index_add(self, contact: Contact):
+        """Добавляет контакт в индекс телефонов"""
+        canonical = contact.canonical_phone
+        if canonical is None:
+            return
+        ids = self.phone_ids(canonical)
+        if contact.id not in ids:
+            ids.append(contact.id)
+            self._set_phone_ids(canonical, ids)
+    
+    def _phone_index_remove(self, contact: Contact):
+        """Удаляет контакт из индекса телефонов"""
+        canonical = contact.canonical_phone
+        if canonical is None:
+            return
+        ids = self.phone_ids(canonical)
+        if contact.id in ids:
+            ids.remove(contact.id)
+            self._set_phone_ids(canonical, ids)
+    
+    def append(self, contact: Contact):
+        """Добавляет контакт в базу (при дублирующемся ID сохраняется первый контакт)"""
+        key = self._contact_key(contact.id)
+        if key in self._db:
+            return
+        self._db[key] = encode_contact(contact)
+        self._phone_index_add(contact)
+        self._set_int(COUNT_KEY, len(self) + 1)
+        if contact.id >= self.next_id:
+            self.next_id = contact.id + 1
+    
+    def update(self, contact: Contact):
+        """Перезаписывает контакт и при смене телефона обновляет индекс"""
+        old = self.get(contact.id)
+        if old is None:
+            return
+        self._db[self._contact_key(contact.id)] = encode_contact(contact)
+        if old.canonical_phone != contact.canonical_phone:
+            self._phone_index_remove(old)
+            self._phone_index_add(contact)
+    
+    def remove(self, contact_id: int):
+        """Удаляет контакт из базы"""
+        contact = self.get(contact_id)
+        if contact is None:
+            return
+        del self._db[self._contact_key(contact_id)]
+        self._phone_index_remove(contact)
+        self._set_int(COUNT_KEY, len(self) - 1)
+    
+    def load(self, contacts: Iterable[Contact]):
+        """Заменяет содержимое базы"""
+        for key in list(self._db.keys()):
+            del self._db[key]
+        for contact in contacts:
+            self.append(contact)
+    
+    def sync(self):
+        """Сбрасывает изменения базы на диск"""
+        if hasattr(self._db, 'sync'):
+            self._db.sync()
+    
+    def close(self):
+        """Закрывает базу"""
+        self._db.close()
+
+
+class DBMPhoneBook(PhoneBook):
+    """
+    Телефонный справочник в базе dbm для хостов с малым объемом памяти.
+    
+    База открывается в конструкторе: get_contact, find_by_id и find_by_phone читают
+    записи с диска без load_from_file. Изменения записываются в базу сразу,
+    save_to_file только сбрасывает их на диск. Поиск подстроки просматривает базу потоково.
+    """
+    
+    def __init__(self, filename: str = "phonebook.dbm"):
+        super().__init__(filename=filename, store=DBMContactStore(open_database(filename)))
+        self._connected_filename = filename
+        self._next_id = self._store.next_id
+    
+    def load_from_file(self) -> bool:
+        """Открывает базу (файл задается свойством filename)"""
+        try:
+            if self._connected_filename != self._filename:
+                self._store.close()
+                self._store = DBMContactStore(open_database(self._filename))
+                self._connected_filename = self._filename
+            self._next_id = self._store.next_id
+            self._rebuild_indexes()
+            self._modified = False
+            return True
+        except FileOperationError as e:
+            print(f"Ошибка: {e}")
+            return False
+    
+    def save_to_file(self) -> bool:
+        """Сбрасывает базу на диск; при смене имени файла контакты копируются в новую базу"""
+        try:
+            if self._connected_filename != self._filename:
+                store = DBMContactStore(open_database(self._filename, 'n'))
+                store.load(self._store)
+                store.next_id = self._next_id
+                self._store.close()
+                self._store = store
+                self._connected_filename = self._filename
+            self._store.sync()
+            self._modified = False
+            return True
+        except FileOperationError as e:
+            print(f"Ошибка: {e}")
+            return False
+    
+    def close(self):
+        """Закрывает базу"""
+        self._store.close()
+    
+    def find_by_phone(self, phone: str) -> List[Contact]:
+        """Находит контакты по канонической форме телефона через индекс на диске"""
+        canonical = Contact.normalize_phone(phone.strip())
+        if canonical is None:
+            return []
+        return self._store.get_many(self._store.phone_ids(canonical))
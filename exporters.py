@@ -0,0 +1,156 @@
+"""
+Модуль Exporters - потоковый экспорт контактов в CSV, NDJSON и vCard
+
+Контакты кодируются по одному и пишутся в файл частями фиксированного размера,
+поэтому объем памяти не зависит от размера справочника.
+"""
+
+import csv
+import io
+import json
+import os
+from typing import Callable, Iterable, Iterator, Optional, TextIO
+from model import Contact, PhoneBook
+from importers import FORMATS
+from ndjson_file import INDEX_EXTENSION
+from exceptions import FileOperationError
+
+
+# Размер части (в символах), которая копится перед записью в файл
+EXPORT_CHUNK_SIZE = 64 * 1024
+
+# Максимальная длина строки vCard, длинные строки переносятся
+VCARD_LINE_LENGTH = 75
+
+
+def iter_csv(contacts: Iterable[Contact]) -> Iterator[str]:
+    """Кодирует контакты в строки CSV с заголовком id, name, phone, comment"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator='\n')
+    writer.writerow(('id', 'name', 'phone', 'comment'))
+    yield buffer.getvalue()
+    for contact in contacts:
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerow((contact.id, contact.name, contact.phone, contact.comment))
+        yield buffer.getvalue()
+
+
+def iter_ndjson(contacts: Iterable[Contact]) -> Iterator[str]:
+    """Кодирует контакты в строки NDJSON"""
+    for contact in contacts:
+        yield json.dumps(contact.to_dict(), ensure_ascii=False, separators=(',', ':')) + '\n'
+
+
+def _escape_vcard(value: str) -> str:
+    """Экранирует значение vCard"""
+    return (value.replace('\\', '\\\\').replace('\n', '\\n')
+            .replace(',', '\\,').replace(';', '\\;'))
+
+
+def _fold_vcard(line: str) -> str:
+    """Переносит длинную строку vCard: продолжение начинается с пробела"""
+    if len(line) <= VCARD_LINE_LENGTH:
+        return line + '\r\n'
+    parts = [line[:VCARD_LINE_LENGTH]]
+    for start in range(VCARD_LINE_LENGTH, len(line), VCARD_LINE_LENGTH - 1):
+        parts.append(' ' + line[start:start + VCARD_LINE_LENGTH - 1])
+    return '\r\n'.join(parts) + '\r\n'
+
+
+def iter_vcard(contacts: Iterable[Contact]) -> Iterator[str]:
+    """Кодирует контакты в карточки vCard 3.0"""
+    for contact in contacts:
+        name = _escape_vcard(contact.name)
+        lines = ['BEGIN:VCARD', 'VERSION:3.0', f'FN:{name}', f'N:{name};;;;',
+                 f'TEL:{_escape_vcard(contact.phone)}']
+        if contact.comment:
+            lines.append(f'NOTE:{_escape_vcard(contact.comment)}')
+        lines.append('END:VCARD')
+        yield ''.join(_fold_vcard(line) for line in lines)
+
+
+WRITERS = {
+    'csv': iter_csv,
+    'ndjson': iter_ndjson,
+    'vcard': iter_vcard,
+}
+
+
+def write_chunks(pieces: Iterable[str], f: TextIO, chunk_size: int = EXPORT_CHUNK_SIZE) -> int:
+    """Пишет строки в файл частями не меньше chunk_size символов; возвращает число символов"""
+    chunk = []
+    chunk_length = 0
+    total = 0
+    for piece in pieces:
+        chunk.append(piece)
+        chunk_length += len(piece)
+        if chunk_length >= chunk_size:
+            f.write(''.join(chunk))
+            total += chunk_length
+            chunk = []
+            chunk_length = 0
+    if chunk:
+        f.write(''.join(chunk))
+        total += chunk_length
+    return total
+
+
+def export_contacts(contacts: Iterable[Contact], f: TextIO, file_format: str,
+                    predicate: Optional[Callable[[Contact], bool]] = None,
+                    chunk_size: int = EXPORT_CHUNK_SIZE) -> int:
+    """Пишет контакты в открытый файл в указанном формате; возвращает число контактов"""
+    if file_format not in WRITERS:
+        raise FileOperationError(f"Неизвестный формат экспорта: {file_format}")
+    
+    count = 0
+    
+    def selected() -> Iterator[Contact]:
+        nonlocal count
+        for contact in contacts:
+            if predicate is None or predicate(contact):
+                count += 1
+                yield contact
+    
+    write_chunks(WRITERS[file_format](selected()), f, chunk_size)
+    return count
+
+
+def export_to_file(phonebook: PhoneBook, filename: str, file_format: Optional[str] = None,
+                   predicate: Optional[Callable[[Contact], bool]] = None) -> int:
+    """
+    Экспортирует контакты справочника в файл (формат определяется по расширению).
+    Файл пишется во временный и атомарно заменяет существующий. Возвращает число контактов.
+    """
+    if file_format is None:
+        extension = os.path.splitext(filename)[1].lower()
+        if extension not in FORMATS:
+            raise FileOperationError(
+                f"Неизвестный формат экспорта {extension or filename}: ожидается {', '.join(sorted(FORMATS))}"
+            )
+        file_format = FORMATS[extension]
+    if file_format not in WRITERS:
+        raise FileOperationError(f"Неизвестный формат экспорта: {file_format}")
+    
+    temp_filename = filename + '.tmp'
+    try:
+        with open(temp_filename, 'w', encoding='utf-8', newline='') as f:
+            count = export_contacts(phonebook.iter_contacts(), f, file_format, predicate)
+        if file_format == 'ndjson' and os.path.exists(filename + INDEX_EXTENSION):
+            # Индекс смещений относится к заменяемому файлу: без него индекс строится заново
+            os.remove(filename + INDEX_EXTENSION)
+        os.replace(temp_filename, filename)
+    except OSError as e:
+        raise FileOperationError(f"Ошибка при сохранении файла {filename}: {e}")
+    return count
+
+
+def search_predicate(search_term: str, field: Optional[str] = None) -> Callable[[Contact], bool]:
+    """Возвращает условие отбора с той же семантикой, что и PhoneBook.search"""
+    search_term = search_term.casefold()
+    fields = ('name', 'phone', 'comment') if field is None else (field,)
+    
+    def predicate(contact: Contact) -> bool:
+        return any(search_term in getattr(contact, f'{name}_key', '') for name in fields)
+    
+    return predicate
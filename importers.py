@@ -0,0 +1,213 @@
+"""
+Модуль Importers - потоковый импорт контактов из CSV, vCard и NDJSON
+
+Записи читаются по одной и проверяются теми же правилами, что и при вводе контакта
+(Contact._validate и допустимые символы телефона). Некорректные записи не прерывают
+импорт, а попадают в отчет; корректные добавляются в справочник одним пакетом.
+"""
+
+import csv
+import json
+import os
+from typing import Dict, Iterator, List, Optional, TextIO, Tuple
+from model import Contact, PhoneBook
+from exceptions import ContactValidationError, FileOperationError
+
+
+# Форматы импорта по расширению файла
+FORMATS = {
+    '.csv': 'csv',
+    '.vcf': 'vcard',
+    '.vcard': 'vcard',
+    '.ndjson': 'ndjson',
+    '.jsonl': 'ndjson',
+}
+
+
+class ImportReport:
+    """Отчет об импорте: число добавленных контактов и ошибки по номерам записей"""
+    
+    # Сколько ошибок хранится в отчете подробно, остальные только подсчитываются
+    MAX_REPORTED_ERRORS = 20
+    
+    def __init__(self):
+        self._imported = 0
+        self._error_count = 0
+        self._errors: List[Tuple[int, str]] = []
+    
+    @property
+    def imported(self) -> int:
+        """Геттер для количества добавленных контактов"""
+        return self._imported
+    
+    @property
+    def error_count(self) -> int:
+        """Геттер для общего количества ошибок"""
+        return self._error_count
+    
+    @property
+    def errors(self) -> List[Tuple[int, str]]:
+        """Геттер для первых ошибок: (номер записи, сообщение)"""
+        return list(self._errors)
+    
+    def add_imported(self, count: int):
+        """Учитывает добавленные контакты"""
+        self._imported += count
+    
+    def add_error(self, record_number: int, message: str):
+        """Добавляет ошибку записи в отчет"""
+        self._error_count += 1
+        if len(self._errors) < self.MAX_REPORTED_ERRORS:
+            self._errors.append((record_number, message))
+    
+    def __str__(self) -> str:
+        lines = [f"Импортировано контактов: {self._imported}, ошибок: {self._error_count}"]
+        for record_number, message in self._errors:
+            lines.append(f"  запись #{record_number}: {message}")
+        if self._error_count > len(self._errors):
+            lines.append(f"  ... и еще {self._error_count - len(self._errors)}")
+        return '\n'.join(lines)
+
+
+def read_csv(f: TextIO) -> Iterator[Dict]:
+    """Читает записи CSV с заголовком name, phone[, comment]"""
+    for row in csv.DictReader(f):
+        yield {key.strip().lower(): value for key, value in row.items() if key is not None}
+
+
+def _unescape_vcard(value: str) -> str:
+    """Снимает экранирование значения vCard (\\n, \\, \\; \\\\)"""
+    result = []
+    chars = iter(value)
+    for char in chars:
+        if char == '\\':
+            char = next(chars, '')
+            result.append('\n' if char in 'nN' else char)
+        else:
+            result.append(char)
+    return ''.join(result)
+
+
+def _unfold_vcard(f: TextIO) -> Iterator[str]:
+    """Склеивает продолженные строки vCard (начинающиеся с пробела или табуляции)"""
+    current: Optional[str] = None
+    for line in f:
+        line = line.rstrip('\r\n')
+        if line[:1] in (' ', '\t') and current is not None:
+            current += line[1:]
+            continue
+        if current is not None:
+            yield current
+        current = line
+    if current is not None:
+        yield current
+
+
+def read_vcard(f: TextIO) -> Iterator[Dict]:
+    """Читает карточки vCard: FN (или N) - имя, первый TEL - телефон, NOTE - комментарий"""
+    card: Optional[Dict] = None
+    for line in _unfold_vcard(f):
+        if ':' not in line:
+            continue
+        key, value = line.split(':', 1)
+        prop = key.split(';', 1)[0].split('.')[-1].upper()
+        if prop == 'BEGIN' and value.strip().upper() == 'VCARD':
+            card = {}
+        elif prop == 'END' and value.strip().upper() == 'VCARD':
+            if card is not None:
+                yield card
+            card = None
+        elif card is None:
+            continue
+        elif prop == 'FN':
+            card['name'] = _unescape_vcard(value)
+        elif prop == 'N' and 'name' not in card:
+            # N: фамилия;имя;отчество;... - используется, если нет FN
+            parts = [_unescape_vcard(part).strip() for part in value.split(';')[:3]]
+            card['name'] = ' '.join(part for part in (parts[1:2] + parts[:1]) if part)
+        elif prop == 'TEL' and 'phone' not in card:
+            card['phone'] = _unescape_vcard(value)
+        elif prop == 'NOTE':
+            card['comment'] = _unescape_vcard(value)
+
+
+def read_ndjson(f: TextIO) -> Iterator[Dict]:
+    """Читает записи NDJSON; строка с неверным JSON передается дальше как ошибка"""
+    for line in f:
+        if not line.strip():
+            continue
+        try:
+            yield json.loads(line)
+        except json.JSONDecodeError as e:
+            yield ValueError(f"неверный JSON: {e.msg}")
+
+
+READERS = {
+    'csv': read_csv,
+    'vcard': read_vcard,
+    'ndjson': read_ndjson,
+}
+
+
+def validate_record(data) -> Contact:
+    """Проверяет запись и создает из нее контакт (ID из файла не используется)"""
+    if isinstance(data, Exception):
+        raise ContactValidationError(str(data))
+    if not isinstance(data, dict):
+        raise ContactValidationError("запись должна быть объектом")
+    
+    fields = {}
+    for field in ('name', 'phone', 'comment'):
+        value = data.get(field)
+        if value is not None and not isinstance(value, str):
+            raise ContactValidationError(f"поле '{field}' должно быть строкой")
+        fields[field] = value or ''
+    
+    contact = Contact(name=fields['name'], phone=fields['phone'], comment=fields['comment'])
+    if not Contact.is_valid_phone(contact.phone):
+        raise ContactValidationError("Телефон может содержать только цифры, пробелы, +, -, (, )")
+    return contact
+
+
+def detect_format(filename: str) -> str:
+    """Определяет формат импорта по расширению файла"""
+    extension = os.path.splitext(filename)[1].lower()
+    if extension not in FORMATS:
+        raise FileOperationError(
+            f"Неизвестный формат импорта {extension or filename}: ожидается {', '.join(sorted(FORMATS))}"
+        )
+    return FORMATS[extension]
+
+
+def import_contacts(phonebook: PhoneBook, filename: str, file_format: Optional[str] = None) -> ImportReport:
+    """
+    Импортирует контакты из файла в справочник и возвращает отчет.
+    
+    Файл читается потоково, некорректные записи пропускаются с записью в отчет,
+    корректные добавляются одним вызовом add_contacts.
+    """
+    file_format = file_format or detect_format(filename)
+    if file_format not in READERS:
+        raise FileOperationError(f"Неизвестный формат импорта: {file_format}")
+    
+    report = ImportReport()
+    contacts = []
+    record_number = 0
+    try:
+        # utf-8-sig: выгрузки CSV из табличных редакторов часто начинаются с BOM
+        with open(filename, 'r', encoding='utf-8-sig', newline='') as f:
+            for record_number, data in enumerate(READERS[file_format](f), start=1):
+                try:
+                    contacts.append(validate_record(data))
+                except ContactValidationError as e:
+                    report.add_error(record_number, str(e))
+    except csv.Error as e:
+        report.add_error(record_number + 1, f"неверная строка CSV: {e}")
+    except UnicodeDecodeError as e:
+        report.add_error(record_number + 1, f"файл не в кодировке UTF-8: {e.reason}")
+    except OSError as e:
+        raise FileOperationError(f"Ошибка при чтении файла {filename}: {e}")
+    
+    phonebook.add_contacts(contacts)
+    report.add_imported(len(contacts))
+    return report
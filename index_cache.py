@@ -0,0 +1,130 @@
+"""
+Модуль Index Cache - кеш построенных вторичных индексов в файле рядом со справочником
+
+Файл кеша состоит из строки заголовка JSON (версия формата, версия Python и отпечатки
+исходных файлов: размер и время изменения) и индексов, сериализованных marshal.
+Кеш используется, только если отпечатки совпадают с текущими файлами. SHA-256 исходных
+файлов при сохранении не считается: он дописывается в заголовок при первой загрузке
+актуального кеша и нужен, только если у файла сменилось лишь время изменения.
+"""
+
+import hashlib
+import json
+import marshal
+import os
+import sys
+from typing import Dict, List, Optional
+from indexes import ContactIndex, INDEX_CLASSES
+
+
+CACHE_VERSION = 1
+CACHE_EXTENSION = '.indexes'
+
+# Формат marshal зависит от версии Python, поэтому она входит в заголовок
+PYTHON_VERSION = '%d.%d' % sys.version_info[:2]
+
+
+def cache_path(filename: str) -> str:
+    """Возвращает путь к кешу индексов для файла справочника"""
+    return filename + CACHE_EXTENSION
+
+
+def file_hash(filename: str) -> str:
+    """Считает SHA-256 содержимого файла"""
+    digest = hashlib.sha256()
+    with open(filename, 'rb') as f:
+        for block in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def fingerprint(filenames: List[str]) -> List[Dict]:
+    """Возвращает отпечатки существующих файлов из списка (без чтения содержимого)"""
+    result = []
+    for filename in filenames:
+        if not os.path.exists(filename):
+            continue
+        stat = os.stat(filename)
+        result.append({
+            'path': os.path.basename(filename),
+            'size': stat.st_size,
+            'mtime_ns': stat.st_mtime_ns,
+        })
+    return result
+
+
+def _is_fresh(saved: List[Dict], filenames: List[str]) -> bool:
+    """
+    Проверяет, что исходные файлы не изменились с момента записи кеша.
+    Если совпали размер и время изменения, содержимое не хешируется; при другом
+    времени изменения файл сверяется по хешу, если он уже записан в отпечаток.
+    """
+    existing = [filename for filename in filenames if os.path.exists(filename)]
+    if len(saved) != len(existing):
+        return False
+    for entry, filename in zip(saved, existing):
+        stat = os.stat(filename)
+        if entry.get('path') != os.path.basename(filename) or entry.get('size') != stat.st_size:
+            return False
+        if entry.get('mtime_ns') != stat.st_mtime_ns:
+            if entry.get('sha256') is None or entry['sha256'] != file_hash(filename):
+                return False
+    return True
+
+
+def _record_hashes(saved: List[Dict], filenames: List[str]) -> bool:
+    """Дописывает в отпечатки недостающие хеши файлов; True, если отпечатки изменились"""
+    existing = [filename for filename in filenames if os.path.exists(filename)]
+    changed = False
+    for entry, filename in zip(saved, existing):
+        if entry.get('sha256') is None:
+            entry['sha256'] = file_hash(filename)
+            changed = True
+    return changed
+
+
+def _write_cache(filename: str, header: Dict, states: Dict) -> bool:
+    """Атомарно записывает файл кеша; возвращает False, если записать не удалось"""
+    path = cache_path(filename)
+    temp_path = path + '.tmp'
+    try:
+        with open(temp_path, 'wb') as f:
+            f.write(json.dumps(header, ensure_ascii=False).encode('utf-8') + b'\n')
+            marshal.dump(states, f)
+        os.replace(temp_path, path)
+        return True
+    except (OSError, ValueError):
+        # Кеш необязателен: при ошибке записи индексы просто построятся при следующей загрузке
+        return False
+
+
+def load_index_cache(filename: str, sources: List[str]) -> Optional[Dict[str, ContactIndex]]:
+    """Загружает индексы из кеша; None, если кеша нет, он поврежден или устарел"""
+    try:
+        with open(cache_path(filename), 'rb') as f:
+            header = json.loads(f.readline())
+            if (header.get('version') != CACHE_VERSION or header.get('python') != PYTHON_VERSION
+                    or not _is_fresh(header.get('sources', []), sources)):
+                return None
+            states = marshal.load(f)
+        if _record_hashes(header['sources'], sources):
+            # Хеши считаются один раз после сохранения, а не при каждом сохранении
+            _write_cache(filename, header, states)
+        return {
+            name: INDEX_CLASSES[class_name].from_state(state)
+            for name, (class_name, state) in states.items()
+        }
+    except (OSError, ValueError, EOFError, TypeError, KeyError, IndexError, AttributeError):
+        # Кеш недоступен или поврежден - индексы будут построены заново
+        return None
+
+
+def save_index_cache(filename: str, sources: List[str], indexes: Dict[str, ContactIndex]) -> bool:
+    """Атомарно записывает индексы в кеш; возвращает False, если записать не удалось"""
+    states = {
+        name: (type(index).__name__, index.get_state())
+        for name, index in indexes.items()
+        if type(index).__name__ in INDEX_CLASSES
+    }
+    header = {'version': CACHE_VERSION, 'python': PYTHON_VERSION, 'sources': fingerprint(sources)}
+    return _write_cache(filename, header, states)
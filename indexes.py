@@ -0,0 +1,486 @@
+"""
+Модуль Indexes - содержит вспомогательные индексы для быстрого поиска контактов
+"""
+
+import heapq
+from typing import Dict, Iterable, List, Optional, Set
+
+
+class ContactIndex:
+    """Базовый класс вторичного индекса, поддерживаемого справочником"""
+    
+    def clear(self):
+        """Очищает индекс"""
+        raise NotImplementedError
+    
+    def add(self, contact):
+        """Добавляет контакт в индекс"""
+        raise NotImplementedError
+    
+    def remove(self, contact):
+        """Удаляет контакт из индекса"""
+        raise NotImplementedError
+    
+    def build(self, contacts: Iterable):
+        """Строит индекс заново по списку контактов"""
+        self.clear()
+        for contact in contacts:
+            if contact is not None:
+                self.add(contact)
+    
+    def get_state(self):
+        """Возвращает содержимое индекса из простых типов (для сохранения в кеш)"""
+        raise NotImplementedError
+    
+    @classmethod
+    def from_state(cls, state) -> 'ContactIndex':
+        """Восстанавливает индекс из результата get_state"""
+        raise NotImplementedError
+
+
+class NGramIndex(ContactIndex):
+    """Инвертированный индекс n-грамм по полям контакта для поиска подстрок"""
+    
+    FIELDS = ('name', 'phone', 'comment')
+    
+    def __init__(self, n: int = 3):
+        if n <= 0:
+            raise ValueError("Длина n-граммы должна быть положительным числом")
+        self._n = n
+        self._postings: Dict[str, Dict[str, Set[int]]] = {field: {} for field in self.FIELDS}
+    
+    @property
+    def n(self) -> int:
+        """Геттер для длины n-граммы"""
+        return self._n
+    
+    @staticmethod
+    def _field_text(contact, field: str) -> str:
+        """Возвращает ключ поиска поля контакта (без учета регистра)"""
+        return getattr(contact, f'{field}_key')
+    
+    def _grams(self, text: str) -> Set[str]:
+        """Разбивает текст на множество n-грамм"""
+        n = self._n
+        return {text[i:i + n] for i in range(len(text) - n + 1)}
+    
+    def clear(self):
+        """Очищает индекс"""
+        for postings in self._postings.values():
+            postings.clear()
+    
+    def add(self, contact):
+        """Добавляет контакт в индекс"""
+        for field in self.FIELDS:
+            postings = self._postings[field]
+            for gram in self._grams(self._field_text(contact, field)):
+                ids = postings.get(gram)
+                if ids is None:
+                    postings[gram] = {contact.id}
+                else:
+                    ids.add(contact.id)
+    
+    def remove(self, contact):
+        """Удаляет контакт из индекса"""
+        for field in self.FIELDS:
+            postings = self._postings[field]
+            for gram in self._grams(self._field_text(contact, field)):
+                ids = postings.get(gram)
+                if ids is None:
+                    continue
+                ids.discard(contact.id)
+                if not ids:
+                    del postings[gram]
+    
+    def _field_candidates(self, grams: Set[str], field: str) -> Set[int]:
+        """Пересекает списки вхождений n-грамм запроса для одного поля"""
+        postings = self._postings[field]
+        # Начинаем с самого короткого списка, чтобы пересечение было дешевле
+        lists = sorted((postings.get(gram, ()) for gram in grams), key=len)
+        if not lists or not lists[0]:
+            return set()
+        result = set(lists[0])
+        for ids in lists[1:]:
+            result &= ids
+            if not result:
+                break
+        return result
+    
+    def candidates(self, search_term: str, field: Optional[str] = None) -> Optional[Set[int]]:
+        """
+        Возвращает множество ID контактов, которые могут содержать подстроку.
+        None означает, что запрос короче n-граммы и индекс не применим.
+        """
+        if len(search_term) < self._n:
+            return None
+        
+        grams = self._grams(search_term)
+        if field is None:
+            result: Set[int] = set()
+            for name in self.FIELDS:
+                result |= self._field_candidates(grams, name)
+            return result
+        if field not in self._postings:
+            return set()
+        return self._field_candidates(grams, field)
+    
+    def get_state(self):
+        """Возвращает длину n-граммы и списки вхождений"""
+        postings = {
+            field: {gram: list(ids) for gram, ids in field_postings.items()}
+            for field, field_postings in self._postings.items()
+        }
+        return self._n, postings
+    
+    @classmethod
+    def from_state(cls, state) -> 'NGramIndex':
+        """Восстанавливает индекс n-грамм"""
+        n, postings = state
+        index = cls(n)
+        for field in cls.FIELDS:
+            index._postings[field] = {gram: set(ids) for gram, ids in postings[field].items()}
+        return index
+
+
+class PhoneIndex(ContactIndex):
+    """Хеш-индекс канонической формы телефона -> ID контактов"""
+    
+    def __init__(self):
+        self._ids: Dict[str, List[int]] = {}
+    
+    def clear(self):
+        """Очищает индекс"""
+        self._ids.clear()
+    
+    def add(self, contact):
+        """Добавляет контакт в индекс"""
+        canonical = contact.canonical_phone
+        if canonical is None:
+            return
+        ids = self._ids.get(canonical)
+        if ids is None:
+            self._ids[canonical] = [contact.id]
+        else:
+            ids.append(contact.id)
+    
+    def remove(self, contact):
+        """Удаляет контакт из индекса"""
+        canonical = contact.canonical_phone
+        ids = self._ids.get(canonical)
+        if not ids or contact.id not in ids:
+            return
+        ids.remove(contact.id)
+        if not ids:
+            del self._ids[canonical]
+    
+    def lookup(self, canonical: str) -> List[int]:
+        """Возвращает ID контактов с указанной канонической формой телефона"""
+        return list(self._ids.get(canonical, ()))
+    
+    def get_state(self):
+        """Возвращает словарь телефон -> ID"""
+        return self._ids
+    
+    @classmethod
+    def from_state(cls, state) -> 'PhoneIndex':
+        """Восстанавливает хеш-индекс телефонов"""
+        index = cls()
+        index._ids = dict(state)
+        return index
+
+
+class PhoneTrie(ContactIndex):
+    """Цифровое префиксное дерево по канонической форме телефона"""
+    
+    # Ключ узла, под которым хранятся ID контактов, чей номер заканчивается в этом узле
+    _IDS = None
+    
+    def __init__(self, reverse: bool = False):
+        # reverse=True строит дерево по перевернутым номерам для поиска по окончанию
+        self._reverse = reverse
+        self._root: Dict = {}
+    
+    def _key(self, digits: str) -> str:
+        """Возвращает последовательность цифр в порядке обхода дерева"""
+        return digits[::-1] if self._reverse else digits
+    
+    def clear(self):
+        """Очищает индекс"""
+        self._root = {}
+    
+    def add(self, contact):
+        """Добавляет контакт в индекс"""
+        canonical = contact.canonical_phone
+        if canonical is None:
+            return
+        node = self._root
+        for digit in self._key(canonical):
+            node = node.setdefault(digit, {})
+        node.setdefault(self._IDS, []).append(contact.id)
+    
+    def remove(self, contact):
+        """Удаляет контакт из индекса"""
+        canonical = contact.canonical_phone
+        if canonical is None:
+            return
+        path = [self._root]
+        for digit in self._key(canonical):
+            node = path[-1].get(digit)
+            if node is None:
+                return
+            path.append(node)
+        
+        ids = path[-1].get(self._IDS)
+        if not ids or contact.id not in ids:
+            return
+        ids.remove(contact.id)
+        if not ids:
+            del path[-1][self._IDS]
+        
+        # Удаляем опустевшие узлы снизу вверх
+        key = self._key(canonical)
+        for depth in range(len(key), 0, -1):
+            if path[depth]:
+                break
+            del path[depth - 1][key[depth - 1]]
+    
+    def lookup(self, digits: str) -> List[int]:
+        """Возвращает ID контактов, номер которых начинается (или заканчивается) на digits"""
+        node = self._root
+        for digit in self._key(digits):
+            node = node.get(digit)
+            if node is None:
+                return []
+        
+        result: List[int] = []
+        stack = [node]
+        while stack:
+            node = stack.pop()
+            for key, value in node.items():
+                if key is self._IDS:
+                    result.extend(value)
+                else:
+                    stack.append(value)
+        return result
+    
+    def get_state(self):
+        """Возвращает направление и узлы дерева (вложенные словари)"""
+        return self._reverse, self._root
+    
+    @classmethod
+    def from_state(cls, state) -> 'PhoneTrie':
+        """Восстанавливает префиксное дерево телефонов"""
+        reverse, root = state
+        index = cls(reverse=reverse)
+        index._root = root
+        return index
+
+
+class _RadixNode:
+    """Узел сжатого префиксного дерева"""
+    
+    __slots__ = ('label', 'children', 'ids', 'top')
+    
+    def __init__(self, label: str = ""):
+        self.label = label
+        self.children: Dict[str, '_RadixNode'] = {}  # первый символ метки -> узел
+        self.ids: List[int] = []  # ID контактов, ключ которых заканчивается в этом узле
+        self.top: List[int] = []  # наименьшие ID во всем поддереве (кеш для автодополнения)
+
+
+class NameRadixTree(ContactIndex):
+    """Сжатое префиксное дерево по словам имени для автодополнения"""
+    
+    def __init__(self, top_k: int = 10):
+        if top_k <= 0:
+            raise ValueError("Размер кеша автодополнения должен быть положительным числом")
+        self._top_k = top_k
+        self._root = _RadixNode()
+    
+    @property
+    def top_k(self) -> int:
+        """Геттер для размера кеша в узлах"""
+        return self._top_k
+    
+    @staticmethod
+    def _keys(contact) -> Set[str]:
+        """Возвращает ключи контакта: имя целиком и отдельные слова имени"""
+        name = contact.name_key
+        keys = set(name.split())
+        keys.add(name)
+        return keys
+    
+    def clear(self):
+        """Очищает индекс"""
+        self._root = _RadixNode()
+    
+    def add(self, contact):
+        """Добавляет контакт в индекс"""
+        for key in self._keys(contact):
+            self._insert(key, contact.id)
+    
+    def remove(self, contact):
+        """Удаляет контакт из индекса"""
+        for key in self._keys(contact):
+            self._delete(key, contact.id)
+    
+    def _push_top(self, node: _RadixNode, contact_id: int):
+        """Добавляет ID в кеш узла, сохраняя не более top_k наименьших"""
+        top = node.top
+        if contact_id in top:
+            return
+        if len(top) < self._top_k:
+            top.append(contact_id)
+            top.sort()
+        elif contact_id < top[-1]:
+            top[-1] = contact_id
+            top.sort()
+    
+    def _recompute_top(self, node: _RadixNode):
+        """Пересчитывает кеш узла по собственным ID и кешам дочерних узлов"""
+        candidates = set(node.ids)
+        for child in node.children.values():
+            candidates.update(child.top)
+        node.top = heapq.nsmallest(self._top_k, candidates)
+    
+    def _insert(self, key: str, contact_id: int):
+        """Вставляет ключ с ID контакта"""
+        node = self._root
+        path = [node]
+        rest = key
+        while rest:
+            child = node.children.get(rest[0])
+            if child is None:
+                child = _RadixNode(rest)
+                node.children[rest[0]] = child
+                path.append(child)
+                node = child
+                break
+            
+            label = child.label
+            common = 0
+            limit = min(len(label), len(rest))
+            while common < limit and label[common] == rest[common]:
+                common += 1
+            
+            if common < len(label):
+                # Разделяем ребро: общий префикс становится промежуточным узлом
+                middle = _RadixNode(label[:common])
+                middle.top = list(child.top)
+                child.label = label[common:]
+                middle.children[child.label[0]] = child
+                node.children[rest[0]] = middle
+                child = middle
+            
+            path.append(child)
+            node = child
+            rest = rest[common:]
+        
+        if contact_id not in node.ids:
+            node.ids.append(contact_id)
+        for visited in path:
+            self._push_top(visited, contact_id)
+    
+    def _delete(self, key: str, contact_id: int):
+        """Удаляет ID контакта из ключа"""
+        node = self._root
+        path = [node]
+        rest = key
+        while rest:
+            child = node.children.get(rest[0])
+            if child is None or not rest.startswith(child.label):
+                return
+            rest = rest[len(child.label):]
+            node = child
+            path.append(node)
+        
+        if contact_id not in node.ids:
+            return
+        node.ids.remove(contact_id)
+        
+        # Пересчитываем кеши и убираем лишние узлы снизу вверх
+        for depth in range(len(path) - 1, -1, -1):
+            current = path[depth]
+            if depth > 0 and not current.ids and len(current.children) <= 1:
+                parent = path[depth - 1]
+                if not current.children:
+                    del parent.children[current.label[0]]
+                    continue
+                # Узел без своих ID с единственным ребенком сливается с ним
+                (child,) = current.children.values()
+                child.label = current.label + child.label
+                parent.children[child.label[0]] = child
+                path[depth] = child
+                continue
+            if contact_id in current.top:
+                self._recompute_top(current)
+    
+    def _find(self, prefix: str) -> Optional[_RadixNode]:
+        """Находит узел, поддерево которого содержит все ключи с префиксом prefix"""
+        node = self._root
+        rest = prefix
+        while rest:
+            child = node.children.get(rest[0])
+            if child is None:
+                return None
+            label = child.label
+            if len(rest) <= len(label):
+                return child if label.startswith(rest) else None
+            if not rest.startswith(label):
+                return None
+            rest = rest[len(label):]
+            node = child
+        return node
+    
+    def lookup(self, prefix: str, limit: int) -> List[int]:
+        """Возвращает до limit наименьших ID контактов с ключом, начинающимся на prefix"""
+        if limit <= 0:
+            return []
+        node = self._find(prefix)
+        if node is None:
+            return []
+        if limit <= self._top_k:
+            return node.top[:limit]
+        
+        # Запрошено больше, чем хранится в кеше: обходим поддерево целиком
+        found: Set[int] = set()
+        stack = [node]
+        while stack:
+            current = stack.pop()
+            found.update(current.ids)
+            stack.extend(current.children.values())
+        return heapq.nsmallest(limit, found)
+    
+    def get_state(self):
+        """Возвращает размер кеша и узлы дерева списком (label, ids, top, номер родителя)"""
+        nodes = []
+        # Обход без рекурсии: глубина дерева зависит от длины имен
+        stack = [(self._root, -1)]
+        while stack:
+            node, parent = stack.pop()
+            number = len(nodes)
+            nodes.append((node.label, node.ids, node.top, parent))
+            # Дети кладутся в обратном порядке, чтобы при восстановлении порядок совпал
+            stack.extend((child, number) for child in reversed(list(node.children.values())))
+        return self._top_k, nodes
+    
+    @classmethod
+    def from_state(cls, state) -> 'NameRadixTree':
+        """Восстанавливает сжатое префиксное дерево"""
+        top_k, nodes = state
+        index = cls(top_k)
+        restored: List[_RadixNode] = []
+        for label, ids, top, parent in nodes:
+            node = _RadixNode(label)
+            node.ids = list(ids)
+            node.top = list(top)
+            if parent >= 0:
+                restored[parent].children[label[0]] = node
+            restored.append(node)
+        if restored:
+            index._root = restored[0]
+        return index
+
+
+# Классы индексов, которые можно восстановить из кеша, по имени класса
+INDEX_CLASSES = {cls.__name__: cls for cls in (NGramIndex, PhoneIndex, PhoneTrie, NameRadixTree)}
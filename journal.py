@@ -0,0 +1,139 @@
+"""
+Модуль Journal - журнал изменений справочника (append-only) для сохранения без полной перезаписи файла
+"""
+
+import json
+import os
+from typing import Callable, Dict, Iterator, List, Optional
+from exceptions import FileCorruptedError, FileOperationError
+
+
+class ChangeJournal:
+    """
+    Журнал изменений в виде файла рядом со снимком справочника.
+    
+    Каждая строка файла - компактная JSON-запись одной операции:
+    ["a", {контакт}] - добавление, ["u", id, {поля}] - изменение, ["d", id] - удаление.
+    Записи копятся в памяти и дописываются в файл только при flush(), чтобы
+    несохраненные изменения не попадали на диск.
+    """
+    
+    ADD = 'a'
+    UPDATE = 'u'
+    DELETE = 'd'
+    
+    def __init__(self, path: str):
+        self._path = path
+        self._pending: List[str] = []
+    
+    @property
+    def path(self) -> str:
+        """Геттер для пути к файлу журнала"""
+        return self._path
+    
+    @property
+    def pending_count(self) -> int:
+        """Геттер для количества еще не записанных записей"""
+        return len(self._pending)
+    
+    @property
+    def size(self) -> int:
+        """Геттер для размера файла журнала в байтах"""
+        try:
+            return os.path.getsize(self._path)
+        except OSError:
+            return 0
+    
+    @staticmethod
+    def _encode(record: list) -> str:
+        """Кодирует запись в компактную строку JSON"""
+        return json.dumps(record, ensure_ascii=False, separators=(',', ':')) + '\n'
+    
+    def record_add(self, contact_data: Dict):
+        """Добавляет запись о новом контакте"""
+        self._pending.append(self._encode([self.ADD, contact_data]))
+    
+    def record_update(self, contact_id: int, fields: Dict):
+        """Добавляет запись об изменении полей контакта"""
+        self._pending.append(self._encode([self.UPDATE, contact_id, fields]))
+    
+    def record_delete(self, contact_id: int):
+        """Добавляет запись об удалении контакта"""
+        self._pending.append(self._encode([self.DELETE, contact_id]))
+    
+    def flush(self):
+        """Дописывает накопленные записи в файл и сбрасывает их на диск (fsync)"""
+        if not self._pending:
+            return
+        try:
+            self._truncate_torn_tail()
+            with open(self._path, 'a', encoding='utf-8') as f:
+                f.write(''.join(self._pending))
+                f.flush()
+                os.fsync(f.fileno())
+        except OSError as e:
+            raise FileOperationError(f"Ошибка при записи журнала {self._path}: {e}")
+        self._pending.clear()
+    
+    def _truncate_torn_tail(self):
+        """Обрезает недописанную последнюю строку, чтобы новые записи не склеились с ней"""
+        if not os.path.exists(self._path):
+            return
+        with open(self._path, 'rb+') as f:
+            end = f.seek(0, os.SEEK_END)
+            if end == 0:
+                return
+            f.seek(end - 1)
+            if f.read(1) == b'\n':
+                return
+            
+            # Ищем последний перевод строки, читая файл с конца блоками
+            position = end
+            while position > 0:
+                start = max(0, position - 4096)
+                f.seek(start)
+                block = f.read(position - start)
+                newline = block.rfind(b'\n')
+                if newline != -1:
+                    f.truncate(start + newline + 1)
+                    return
+                position = start
+            f.truncate(0)
+    
+    def clear(self):
+        """Удаляет файл журнала (после того как его содержимое перенесено в снимок)"""
+        try:
+            if os.path.exists(self._path):
+                os.remove(self._path)
+        except OSError as e:
+            raise FileOperationError(f"Ошибка при удалении журнала {self._path}: {e}")
+    
+    def replay(self, on_error: Optional[Callable[[int, str], None]] = None) -> Iterator[list]:
+        """
+        Читает записи из файла журнала; оборванная последняя строка пропускается.
+        
+        Оборванной считается только строка без перевода строки в конце файла.
+        Поврежденная полная строка передается в on_error(номер строки, сообщение)
+        и пропускается, а без on_error вызывает FileCorruptedError: последующие
+        записи журнала не теряются молча.
+        """
+        if not os.path.exists(self._path):
+            return
+        try:
+            with open(self._path, 'r', encoding='utf-8') as f:
+                for line_number, line in enumerate(f, 1):
+                    if not line.endswith('\n'):
+                        # Запись не была дописана до конца (например, при сбое)
+                        break
+                    try:
+                        record = json.loads(line)
+                    except json.JSONDecodeError as e:
+                        message = f"Поврежденная строка журнала. Строка {line_number}: {e.msg}"
+                        if on_error is None:
+                            raise FileCorruptedError(f"{message} ({self._path})")
+                        on_error(line_number, message)
+                        continue
+                    if isinstance(record, list) and record:
+                        yield record
+        except OSError as e:
+            raise FileOperationError(f"Ошибка при чтении журнала {self._path}: {e}")
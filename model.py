@@ -4,8 +4,20 @@
 
 import json
 import os
-from typing import List, Dict, Optional
+import re
+import weakref
+from array import array
+from bisect import bisect_left
+from collections.abc import Sequence
+from itertools import islice
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Dict, Iterable, Iterator, Optional, Set, Tuple
 from datetime import datetime
+from journal import ChangeJournal
+from snapshot import SnapshotReader, write_snapshot
+from ndjson_file import NDJSONFile
+from indexes import ContactIndex, NGramIndex, NameRadixTree, PhoneIndex, PhoneTrie
+from index_cache import load_index_cache, save_index_cache
 from exceptions import (
     ContactValidationError, 
     ContactNotFoundError, 
@@ -15,31 +27,70 @@ from exceptions import (
 )
 
 
+# Символы, допустимые в номере телефона
+PHONE_ALLOWED_CHARS = frozenset('0123456789+-() ')
+
+
 class DataClassMeta(type):
-    """Кастомный метакласс для создания датакласса"""
+    """
+    Кастомный метакласс для создания датакласса.
     
-    def __new__(cls, name, bases, namespace):
+    Если передан параметр fields, методы __repr__, __eq__ и __hash__ строятся
+    по объявленным полям, что позволяет классу использовать __slots__ без __dict__.
+    """
+    
+    def __new__(cls, name, bases, namespace, fields: Optional[tuple] = None):
+        if fields is not None:
+            fields = tuple(fields)
+            namespace['__fields__'] = fields
+        
         # Добавляем метод __repr__ если его нет
         if '__repr__' not in namespace:
-            def __repr__(self):
-                attrs = ', '.join(f'{k}={v!r}' for k, v in self.__dict__.items())
-                return f'{name}({attrs})'
+            if fields is not None:
+                def __repr__(self):
+                    attrs = ', '.join(f'{k}={getattr(self, k)!r}' for k in fields)
+                    return f'{name}({attrs})'
+            else:
+                def __repr__(self):
+                    attrs = ', '.join(f'{k}={v!r}' for k, v in self.__dict__.items())
+                    return f'{name}({attrs})'
             namespace['__repr__'] = __repr__
         
         # Добавляем метод __eq__ если его нет
         if '__eq__' not in namespace:
-            def __eq__(self, other):
-                if not isinstance(other, self.__class__):
-                    return False
-                return self.__dict__ == other.__dict__
+            if fields is not None:
+                def __eq__(self, other):
+                    if not isinstance(other, self.__class__):
+                        return False
+                    return all(getattr(self, k) == getattr(other, k) for k in fields)
+            else:
+                def __eq__(self, other):
+                    if not isinstance(other, self.__class__):
+                        return False
+                    return self.__dict__ == other.__dict__
             namespace['__eq__'] = __eq__
         
+        # Добавляем метод __hash__, согласованный с __eq__, если известны поля
+        if fields is not None and '__hash__' not in namespace:
+            def __hash__(self):
+                return hash(tuple(getattr(self, k) for k in fields))
+            namespace['__hash__'] = __hash__
+        
         return super().__new__(cls, name, bases, namespace)
+    
+    def __init__(cls, name, bases, namespace, fields: Optional[tuple] = None):
+        super().__init__(name, bases, namespace)
 
 
-class Contact(metaclass=DataClassMeta):
+class Contact(metaclass=DataClassMeta, fields=('id', 'name', 'phone', 'comment')):
     """Класс для представления контакта (кастомный датакласс)"""
     
+    # Компактное размещение без __dict__ у каждого экземпляра
+    __slots__ = (
+        '_id', '_name', '_phone', '_comment',
+        '_name_key', '_phone_key', '_comment_key', '_canonical_phone',
+    )
+    
     def __init__(self, name: str, phone: str, comment: str = "", contact_id: Optional[int] = None):
         self._id = contact_id
         self._name = name.strip()
@@ -48,6 +99,12 @@ class Contact(metaclass=DataClassMeta):
         
         # Валидация при создании
         self._validate()
+        
+        # Ключи поиска без учета регистра вычисляются один раз и обновляются сеттерами
+        self._name_key = self._name.casefold()
+        self._phone_key = self._phone.casefold()
+        self._comment_key = self._comment.casefold()
+        self._canonical_phone = self.normalize_phone(self._phone)
     
     def _validate(self):
         """Валидация данных контакта"""
@@ -80,6 +137,7 @@ class Contact(metaclass=DataClassMeta):
         if not value:
             raise ContactValidationError("Имя не может быть пустым")
         self._name = value
+        self._name_key = value.casefold()
     
     @property
     def phone(self) -> str:
@@ -93,6 +151,8 @@ class Contact(metaclass=DataClassMeta):
         if not value:
             raise ContactValidationError("Телефон не может быть пустым")
         self._phone = value
+        self._phone_key = value.casefold()
+        self._canonical_phone = self.normalize_phone(value)
     
     @property
     def comment(self) -> str:
@@ -103,6 +163,43 @@ class Contact(metaclass=DataClassMeta):
     def comment(self, value: str):
         """Сеттер для комментария"""
         self._comment = value.strip()
+        self._comment_key = self._comment.casefold()
+    
+    @property
+    def name_key(self) -> str:
+        """Геттер для ключа поиска по имени (без учета регистра)"""
+        return self._name_key
+    
+    @property
+    def phone_key(self) -> str:
+        """Геттер для ключа поиска по телефону (без учета регистра)"""
+        return self._phone_key
+    
+    @property
+    def comment_key(self) -> str:
+        """Геттер для ключа поиска по комментарию (без учета регистра)"""
+        return self._comment_key
+    
+    @property
+    def canonical_phone(self) -> Optional[str]:
+        """Геттер для канонической формы телефона (только цифры)"""
+        return self._canonical_phone
+    
+    @staticmethod
+    def is_valid_phone(phone: str) -> bool:
+        """Проверяет, что телефон содержит только допустимые символы"""
+        return all(c in PHONE_ALLOWED_CHARS for c in phone)
+    
+    @staticmethod
+    def normalize_phone(phone: str) -> Optional[str]:
+        """
+        Приводит телефон к канонической форме из одних цифр (E.164 без '+').
+        Возвращает None, если телефон содержит недопустимые символы или не содержит цифр.
+        """
+        if not Contact.is_valid_phone(phone):
+            return None
+        digits = ''.join(c for c in phone if c.isdigit())
+        return digits or None
     
     def to_dict(self) -> Dict:
         """Преобразует контакт в словарь"""
@@ -127,20 +224,634 @@ class Contact(metaclass=DataClassMeta):
             contact_id=data.get('id')
         )
     
+    def __reduce__(self):
+        """Компактная сериализация для pickle (передача контактов между процессами)"""
+        return Contact._restore, tuple(getattr(self, slot) for slot in Contact.__slots__)
+    
+    @staticmethod
+    def _restore(*values) -> 'Contact':
+        """Восстанавливает контакт из значений слотов без повторной проверки и вычисления ключей"""
+        contact = Contact.__new__(Contact)
+        for slot, value in zip(Contact.__slots__, values):
+            setattr(contact, slot, value)
+        return contact
+    
     def __str__(self) -> str:
         id_str = str(self._id) if self._id is not None else "Нет"
         return f"ID: {id_str} | {self._name} | {self._phone} | {self._comment}"
 
 
+class ContactsView(Sequence):
+    """
+    Неизменяемое представление списка контактов на момент его получения.
+    
+    Представление ссылается на список хранилища без копирования: хранилище только
+    дописывает в конец (длина представления зафиксирована), а перед изменением
+    списка на месте копирует его, если на него ссылаются живые представления.
+    """
+    
+    __slots__ = ('_contacts', '_length', '__weakref__')
+    
+    def __init__(self, contacts: List[Contact], length: Optional[int] = None):
+        self._contacts = contacts
+        self._length = len(contacts) if length is None else length
+    
+    def __len__(self) -> int:
+        return self._length
+    
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return ContactsView(self._contacts[:self._length][index])
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError("Индекс контакта вне диапазона")
+        return self._contacts[index]
+    
+    def __iter__(self) -> Iterator[Contact]:
+        return islice(self._contacts, self._length)
+    
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, (ContactsView, list, tuple)):
+            return NotImplemented
+        return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+    
+    __hash__ = None
+    
+    def __repr__(self) -> str:
+        return f"ContactsView({list(self)!r})"
+
+
+class ContactStore:
+    """Базовый класс хранилища контактов справочника"""
+    
+    def __len__(self) -> int:
+        raise NotImplementedError
+    
+    def __iter__(self) -> Iterator[Contact]:
+        """Перебирает контакты в порядке справочника"""
+        raise NotImplementedError
+    
+    def position(self, contact_id: int) -> Optional[int]:
+        """Возвращает позицию контакта в хранилище или None"""
+        raise NotImplementedError
+    
+    def at(self, position: int) -> Contact:
+        """Возвращает контакт по позиции"""
+        raise NotImplementedError
+    
+    def append(self, contact: Contact):
+        """Добавляет контакт в конец хранилища"""
+        raise NotImplementedError
+    
+    def update(self, contact: Contact):
+        """Сохраняет измененные поля контакта"""
+        raise NotImplementedError
+    
+    def remove(self, contact_id: int):
+        """Удаляет контакт по ID"""
+        raise NotImplementedError
+    
+    def load(self, contacts: Iterable[Contact]):
+        """Заменяет содержимое хранилища"""
+        raise NotImplementedError
+    
+    def empty(self) -> 'ContactStore':
+        """Возвращает новое пустое хранилище того же типа (для загрузки файла)"""
+        return type(self)()
+    
+    def get(self, contact_id: int) -> Optional[Contact]:
+        """Возвращает контакт по ID или None"""
+        position = self.position(contact_id)
+        if position is None:
+            return None
+        return self.at(position)
+    
+    def get_many(self, contact_ids: Iterable[int]) -> List[Contact]:
+        """Возвращает контакты по ID в порядке справочника"""
+        positions = sorted(
+            position for position in map(self.position, contact_ids) if position is not None
+        )
+        return [self.at(position) for position in positions]
+    
+    def to_list(self) -> List[Contact]:
+        """Возвращает список всех контактов"""
+        return list(self)
+    
+    def view(self) -> ContactsView:
+        """Возвращает неизменяемое представление контактов"""
+        return ContactsView(self.to_list())
+
+
+class ListContactStore(ContactStore):
+    """Хранилище контактов в списке объектов с индексом ID -> позиция"""
+    
+    # Минимальное число удаленных позиций, после которого список уплотняется
+    _COMPACT_MIN_HOLES = 32
+    
+    def __init__(self):
+        self._contacts: List[Optional[Contact]] = []
+        self._positions: Dict[int, int] = {}  # ID -> позиция в self._contacts
+        # ID, под которыми в списке больше одного контакта (индекс указывает на первый из них)
+        self._duplicate_ids: Set[int] = set()
+        self._holes = 0  # Количество удаленных (None) позиций в self._contacts
+        # Живые представления, ссылающиеся на self._contacts (копирование при записи)
+        self._views: List[weakref.ref] = []
+    
+    def __len__(self) -> int:
+        return len(self._contacts) - self._holes
+    
+    def __iter__(self) -> Iterator[Contact]:
+        for contact in self._contacts:
+            if contact is not None:
+                yield contact
+    
+    def position(self, contact_id: int) -> Optional[int]:
+        """Возвращает позицию контакта в списке или None"""
+        return self._positions.get(contact_id)
+    
+    def at(self, position: int) -> Contact:
+        """Возвращает контакт по позиции"""
+        return self._contacts[position]
+    
+    def append(self, contact: Contact):
+        """Добавляет контакт в конец списка"""
+        if contact.id in self._positions:
+            self._duplicate_ids.add(contact.id)
+        else:
+            self._positions[contact.id] = len(self._contacts)
+        self._contacts.append(contact)
+    
+    def update(self, contact: Contact):
+        """Контакты хранятся как объекты, поэтому изменения уже применены"""
+        pass
+    
+    def remove(self, contact_id: int):
+        """Удаляет контакт, не сдвигая список: позиция освобождается и периодически уплотняется"""
+        position = self._positions.pop(contact_id)
+        if any(view() is not None for view in self._views):
+            # Список виден через представления - изменяем его копию
+            self._contacts = self._contacts.copy()
+            self._views = []
+        self._contacts[position] = None
+        self._holes += 1
+        if contact_id in self._duplicate_ids:
+            self._point_to_next_duplicate(contact_id, position)
+        if self._holes > self._COMPACT_MIN_HOLES and self._holes * 2 > len(self._contacts):
+            self._compact()
+    
+    def load(self, contacts: Iterable[Contact]):
+        """Заменяет содержимое хранилища"""
+        self._contacts = list(contacts)
+        self._holes = 0
+        self._views = []
+        self._rebuild_positions()
+    
+    def to_list(self) -> List[Contact]:
+        """Возвращает копию списка контактов"""
+        if self._holes:
+            return [contact for contact in self._contacts if contact is not None]
+        return self._contacts.copy()
+    
+    def view(self) -> ContactsView:
+        """Возвращает представление контактов без копирования списка"""
+        if self._holes:
+            # В представлении не должно быть удаленных позиций: уплотнение создает новый список
+            self._compact()
+        view = ContactsView(self._contacts)
+        self._views = [ref for ref in self._views if ref() is not None]
+        self._views.append(weakref.ref(view))
+        return view
+    
+    def _point_to_next_duplicate(self, contact_id: int, position: int):
+        """Направляет индекс на следующий контакт с тем же ID после удаленной позиции"""
+        following = [
+            index for index in range(position + 1, len(self._contacts))
+            if self._contacts[index] is not None and self._contacts[index].id == contact_id
+        ]
+        if following:
+            self._positions[contact_id] = following[0]
+        if len(following) < 2:
+            self._duplicate_ids.discard(contact_id)
+    
+    def _rebuild_positions(self):
+        """Перестраивает индекс ID -> позиция в списке контактов"""
+        self._positions = {}
+        self._duplicate_ids = set()
+        for position, contact in enumerate(self._contacts):
+            if contact is not None:
+                # При дублирующихся ID находится первый контакт, как и при линейном поиске
+                if contact.id in self._positions:
+                    self._duplicate_ids.add(contact.id)
+                else:
+                    self._positions[contact.id] = position
+    
+    def _compact(self):
+        """Убирает удаленные позиции из списка контактов"""
+        # Новый список: существующие представления продолжают ссылаться на старый
+        self._contacts = [contact for contact in self._contacts if contact is not None]
+        self._holes = 0
+        self._views = []
+        self._rebuild_positions()
+
+
+class ColumnarContactStore(ContactStore):
+    """
+    Компактное колоночное хранилище для очень больших справочников.
+    
+    ID хранятся в array('q'), строки полей - в общем буфере UTF-8 с массивами
+    смещений и длин. Объекты Contact создаются только при обращении к записи,
+    поэтому изменения полей нужно сохранять через update().
+    """
+    
+    FIELDS = ('name', 'phone', 'comment')
+    
+    # Минимальное число удаленных записей, после которого хранилище уплотняется
+    _COMPACT_MIN_HOLES = 32
+    # Минимальный объем неиспользуемых байт буфера, после которого он уплотняется
+    _COMPACT_MIN_GARBAGE = 64 * 1024
+    
+    def __init__(self):
+        self._clear()
+    
+    def _clear(self):
+        """Очищает хранилище"""
+        self._ids = array('q')
+        self._deleted = bytearray()
+        self._heap = bytearray()
+        self._offsets = {field: array('q') for field in self.FIELDS}
+        self._lengths = {field: array('L') for field in self.FIELDS}
+        self._holes = 0
+        self._garbage = 0  # Байты буфера, на которые больше не ссылается ни одна запись
+        # Словарь ID -> строка нужен, только если ID идут не по возрастанию
+        self._row_index: Optional[Dict[int, int]] = None
+        # ID, под которыми в словаре больше одной строки (словарь указывает на первую из них)
+        self._duplicate_ids: Set[int] = set()
+    
+    @property
+    def heap_size(self) -> int:
+        """Геттер для размера буфера строк в байтах"""
+        return len(self._heap)
+    
+    def __len__(self) -> int:
+        return len(self._ids) - self._holes
+    
+    def __iter__(self) -> Iterator[Contact]:
+        for row in range(len(self._ids)):
+            if not self._deleted[row]:
+                yield self.at(row)
+    
+    def _put_string(self, value: str) -> Tuple[int, int]:
+        """Записывает строку в буфер и возвращает ее смещение и длину"""
+        data = value.encode('utf-8')
+        offset = len(self._heap)
+        self._heap += data
+        return offset, len(data)
+    
+    def _get_string(self, field: str, row: int) -> str:
+        """Читает строку поля записи из буфера"""
+        offset = self._offsets[field][row]
+        return self._heap[offset:offset + self._lengths[field][row]].decode('utf-8')
+    
+    def position(self, contact_id: int) -> Optional[int]:
+        """Возвращает номер строки контакта или None"""
+        ids = self._ids
+        if self._row_index is not None:
+            row = self._row_index.get(contact_id)
+            return None if row is None or self._deleted[row] else row
+        
+        # ID упорядочены по возрастанию: ищем двоичным поиском без дополнительной памяти
+        row = bisect_left(ids, contact_id)
+        while row < len(ids) and ids[row] == contact_id:
+            if not self._deleted[row]:
+                return row
+            row += 1
+        return None
+    
+    def at(self, position: int) -> Contact:
+        """Создает объект контакта по номеру строки"""
+        return Contact(
+            name=self._get_string('name', position),
+            phone=self._get_string('phone', position),
+            comment=self._get_string('comment', position),
+            contact_id=self._ids[position]
+        )
+    
+    def append(self, contact: Contact):
+        """Добавляет контакт в конец хранилища"""
+        if contact.id is None:
+            raise ValueError("Колоночное хранилище принимает только контакты с ID")
+        
+        self._append_id(contact.id)
+        for field in self.FIELDS:
+            offset, length = self._put_string(getattr(contact, field))
+            self._offsets[field].append(offset)
+            self._lengths[field].append(length)
+    
+    def _append_id(self, contact_id: int):
+        """Добавляет строку с ID, при нарушении порядка ID переходит на словарь ID -> строка"""
+        row = len(self._ids)
+        if self._row_index is None and self._ids and contact_id < self._ids[-1]:
+            self._row_index = {}
+            for existing_row, existing_id in enumerate(self._ids):
+                self._index_row(existing_id, existing_row)
+        if self._row_index is not None:
+            self._index_row(contact_id, row)
+        
+        self._ids.append(contact_id)
+        self._deleted.append(0)
+    
+    def _index_row(self, contact_id: int, row: int):
+        """Добавляет строку в словарь ID -> строка (при дублирующихся ID остается первая)"""
+        if contact_id in self._row_index:
+            self._duplicate_ids.add(contact_id)
+        else:
+            self._row_index[contact_id] = row
+    
+    def update(self, contact: Contact):
+        """Записывает поля контакта в буфер"""
+        row = self.position(contact.id)
+        if row is None:
+            return
+        for field in self.FIELDS:
+            value = getattr(contact, field)
+            if value == self._get_string(field, row):
+                continue
+            self._garbage += self._lengths[field][row]
+            offset, length = self._put_string(value)
+            self._offsets[field][row] = offset
+            self._lengths[field][row] = length
+        self._maybe_compact()
+    
+    def remove(self, contact_id: int):
+        """Помечает запись удаленной"""
+        row = self.position(contact_id)
+        if row is None:
+            return
+        self._deleted[row] = 1
+        self._holes += 1
+        self._garbage += sum(self._lengths[field][row] for field in self.FIELDS)
+        if contact_id in self._duplicate_ids:
+            self._point_to_next_duplicate(contact_id, row)
+        self._maybe_compact()
+    
+    def _point_to_next_duplicate(self, contact_id: int, row: int):
+        """Направляет словарь ID -> строка на следующую строку с тем же ID после удаленной"""
+        ids, deleted = self._ids, self._deleted
+        following = [index for index in range(row + 1, len(ids)) if ids[index] == contact_id and not deleted[index]]
+        if following:
+            self._row_index[contact_id] = following[0]
+        if len(following) < 2:
+            self._duplicate_ids.discard(contact_id)
+    
+    def load(self, contacts: Iterable[Contact]):
+        """Заменяет содержимое хранилища"""
+        self._clear()
+        for contact in contacts:
+            self.append(contact)
+    
+    def _maybe_compact(self):
+        """Уплотняет хранилище, если удаленных записей или мусора в буфере слишком много"""
+        if self._holes > self._COMPACT_MIN_HOLES and self._holes * 2 > len(self._ids):
+            self._compact()
+        elif self._garbage > self._COMPACT_MIN_GARBAGE and self._garbage * 2 > len(self._heap):
+            self._compact()
+    
+    def _compact(self):
+        """Переписывает массивы и буфер, оставляя только живые записи"""
+        ids, deleted, heap = self._ids, self._deleted, self._heap
+        offsets, lengths = self._offsets, self._lengths
+        self._clear()
+        
+        for row in range(len(ids)):
+            if deleted[row]:
+                continue
+            self._append_id(ids[row])
+            for field in self.FIELDS:
+                offset = offsets[field][row]
+                length = lengths[field][row]
+                self._offsets[field].append(len(self._heap))
+                self._lengths[field].append(length)
+                self._heap += heap[offset:offset + length]
+
+
+class MappedContactStore(ContactStore):
+    """
+    Хранилище поверх снимка .pbk, открытого через mmap.
+    
+    Записи снимка декодируются только при обращении; изменения, удаления и новые
+    контакты хранятся в памяти поверх неизменяемого снимка.
+    """
+    
+    def __init__(self, snapshot: SnapshotReader):
+        self._snapshot: Optional[SnapshotReader] = snapshot
+        self._base_count = len(snapshot)
+        self._deleted_rows: Set[int] = set()
+        self._overrides: Dict[int, Contact] = {}  # строка снимка -> измененный контакт
+        self._appended = ListContactStore()
+    
+    @property
+    def snapshot(self) -> Optional[SnapshotReader]:
+        """Геттер для открытого снимка (None после load или close)"""
+        return self._snapshot
+    
+    def __len__(self) -> int:
+        return self._base_count - len(self._deleted_rows) + len(self._appended)
+    
+    def __iter__(self) -> Iterator[Contact]:
+        for row in range(self._base_count):
+            if row not in self._deleted_rows:
+                yield self.at(row)
+        yield from self._appended
+    
+    def position(self, contact_id: int) -> Optional[int]:
+        """Возвращает позицию контакта: сначала строки снимка, затем добавленные контакты"""
+        if self._snapshot is not None:
+            row = self._snapshot.find_row(contact_id)
+            if row is not None and row not in self._deleted_rows:
+                return row
+        position = self._appended.position(contact_id)
+        return None if position is None else self._base_count + position
+    
+    def at(self, position: int) -> Contact:
+        """Возвращает контакт по позиции, декодируя запись снимка при необходимости"""
+        if position >= self._base_count:
+            return self._appended.at(position - self._base_count)
+        contact = self._overrides.get(position)
+        if contact is None:
+            contact = Contact.from_dict(self._snapshot.record(position))
+        return contact
+    
+    def append(self, contact: Contact):
+        """Добавляет контакт поверх снимка"""
+        self._appended.append(contact)
+    
+    def update(self, contact: Contact):
+        """Запоминает измененный контакт вместо записи снимка"""
+        position = self.position(contact.id)
+        if position is None:
+            return
+        if position < self._base_count:
+            self._overrides[position] = contact
+        else:
+            self._appended.update(contact)
+    
+    def remove(self, contact_id: int):
+        """Помечает контакт удаленным"""
+        position = self.position(contact_id)
+        if position is None:
+            return
+        if position < self._base_count:
+            self._deleted_rows.add(position)
+            self._overrides.pop(position, None)
+        else:
+            self._appended.remove(contact_id)
+    
+    def load(self, contacts: Iterable[Contact]):
+        """Заменяет содержимое: снимок больше не используется"""
+        # Контакты могут читаться из снимка, поэтому он закрывается только после их загрузки
+        self._appended.load(contacts)
+        self.close()
+    
+    def close(self):
+        """Закрывает снимок; в хранилище остаются только контакты, добавленные поверх него"""
+        if self._snapshot is not None:
+            self._snapshot.close()
+            self._snapshot = None
+        self._base_count = 0
+        self._deleted_rows = set()
+        self._overrides = {}
+
+
+class _JSONStreamReader:
+    """Потоковый разбор JSON поверх буфера, читаемого из файла частями"""
+    
+    _WHITESPACE = re.compile(r'[ \t\n\r]*')
+    # Ошибка ближе этого числа символов к концу буфера может означать оборванный литерал, число или \u-escape
+    _TRUNCATION_MARGIN = 16
+    # Символы, которыми может продолжаться число JSON
+    _NUMBER_CHARS = frozenset('0123456789.eE+-')
+    
+    def __init__(self, file, chunk_size: int):
+        self._file = file
+        self._chunk_size = chunk_size
+        self._decoder = json.JSONDecoder()
+        self._buffer = ""
+        self._pos = 0
+        self._eof = False
+    
+    def _read_more(self, size: Optional[int] = None) -> bool:
+        """Дочитывает следующую часть файла, отбрасывая уже разобранное начало буфера"""
+        if self._eof:
+            return False
+        chunk = self._file.read(size or self._chunk_size)
+        if not chunk:
+            self._eof = True
+            return False
+        self._buffer = self._buffer[self._pos:] + chunk
+        self._pos = 0
+        return True
+    
+    def peek(self) -> str:
+        """Пропускает пробельные символы и возвращает следующий символ ('' в конце файла)"""
+        while True:
+            self._pos = self._WHITESPACE.match(self._buffer, self._pos).end()
+            if self._pos < len(self._buffer):
+                return self._buffer[self._pos]
+            if not self._read_more():
+                return ""
+    
+    def expect(self, chars: str) -> str:
+        """Читает следующий символ и проверяет, что он один из chars"""
+        char = self.peek()
+        if not char or char not in chars:
+            raise json.JSONDecodeError(f"Ожидался один из символов {chars!r}", self._buffer, self._pos)
+        self._pos += 1
+        return char
+    
+    def _truncated(self, error: json.JSONDecodeError) -> bool:
+        """Проверяет, что ошибку разбора может объяснить конец буфера, а не поврежденные данные"""
+        if error.msg.startswith('Unterminated string'):
+            # Закрывающая кавычка не найдена до конца буфера
+            return True
+        return error.pos >= len(self._buffer) - self._TRUNCATION_MARGIN
+    
+    def value(self):
+        """Разбирает очередное JSON-значение целиком"""
+        self.peek()
+        # Размер дочитывания удваивается, чтобы длинное значение не разбиралось заново на каждой части
+        size = self._chunk_size
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buffer, self._pos)
+            except json.JSONDecodeError as e:
+                # Значение могло оборваться на границе буфера
+                if self._truncated(e) and self._read_more(size):
+                    size *= 2
+                    continue
+                raise
+            # Число или литерал в конце буфера может продолжаться в следующей части; число, оборванное
+            # после '.', 'e' или знака экспоненты, разбирается не целиком - за ним следует его продолжение
+            continues = end == len(self._buffer) or (
+                type(value) in (int, float) and self._buffer[end] in self._NUMBER_CHARS
+            )
+            if continues and self._read_more(size):
+                size *= 2
+                continue
+            self._pos = end
+            return value
+
+
 class FileHandler:
     """Класс для работы с файлами"""
     
+    # Размер части файла (в символах) при потоковом чтении
+    STREAM_CHUNK_SIZE = 64 * 1024
+    # Расширение двоичного снимка; остальные файлы читаются и пишутся как JSON
+    SNAPSHOT_EXTENSION = '.pbk'
+    # Расширение формата NDJSON (один контакт на строку, с индексом смещений)
+    NDJSON_EXTENSION = '.ndjson'
+    
+    @staticmethod
+    def is_snapshot(filename: str) -> bool:
+        """Проверяет, что файл в двоичном формате .pbk (по расширению)"""
+        return filename.lower().endswith(FileHandler.SNAPSHOT_EXTENSION)
+    
+    @staticmethod
+    def open_snapshot(filename: str) -> Optional[SnapshotReader]:
+        """Открывает снимок .pbk через mmap; для JSON или отсутствующего файла возвращает None"""
+        if not FileHandler.is_snapshot(filename) or not os.path.exists(filename):
+            return None
+        return SnapshotReader(filename)
+    
+    @staticmethod
+    def is_ndjson(filename: str) -> bool:
+        """Проверяет, что файл в формате NDJSON (по расширению)"""
+        return filename.lower().endswith(FileHandler.NDJSON_EXTENSION)
+    
+    @staticmethod
+    def open_ndjson(filename: str) -> NDJSONFile:
+        """Открывает файл NDJSON с индексом для чтения отдельных контактов и частичной записи"""
+        return NDJSONFile(filename)
+    
     @staticmethod
     def load_from_file(filename: str) -> Dict:
-        """Загружает данные из JSON файла"""
+        """Загружает данные из JSON файла (или снимка .pbk, или NDJSON)"""
         if not os.path.exists(filename):
             return {'contacts': []}
         
+        if FileHandler.is_ndjson(filename):
+            # Неверные строки NDJSON (ошибки ValueError) в данные JSON не попадают
+            return {'contacts': [data for data in FileHandler.iter_contacts(filename)
+                                 if not isinstance(data, Exception)]}
+        
+        if FileHandler.is_snapshot(filename):
+            snapshot = SnapshotReader(filename)
+            try:
+                return {'contacts': list(snapshot)}
+            finally:
+                snapshot.close()
+        
         try:
             with open(filename, 'r', encoding='utf-8') as f:
                 data = json.load(f)
@@ -150,31 +861,251 @@ class FileHandler:
         except Exception as e:
             raise FileOperationError(f"Ошибка при чтении файла {filename}: {e}")
     
+    @staticmethod
+    def iter_contacts(filename: str, chunk_size: int = STREAM_CHUNK_SIZE) -> Iterator[Dict]:
+        """
+        Потоково читает JSON файл и по одному возвращает словари из массива 'contacts',
+        не строя в памяти дерево всего документа.
+        """
+        if not os.path.exists(filename):
+            return
+        
+        if FileHandler.is_snapshot(filename):
+            snapshot = SnapshotReader(filename)
+            try:
+                yield from snapshot
+            finally:
+                snapshot.close()
+            return
+        
+        if FileHandler.is_ndjson(filename):
+            ndjson = NDJSONFile(filename)
+            try:
+                # Индекс перестроен или дополнен при открытии - сохраняем его для следующих загрузок
+                ndjson.flush_index()
+            except FileOperationError:
+                pass  # Индекс - только кеш, без него файл читается так же
+            yield from ndjson
+            return
+        
+        try:
+            f = open(filename, 'r', encoding='utf-8')
+        except Exception as e:
+            raise FileOperationError(f"Ошибка при чтении файла {filename}: {e}")
+        
+        with f:
+            try:
+                reader = _JSONStreamReader(f, chunk_size)
+                reader.expect('{')
+                if reader.peek() == '}':
+                    reader.expect('}')
+                else:
+                    while True:
+                        key = reader.value()
+                        reader.expect(':')
+                        if key == 'contacts':
+                            reader.expect('[')
+                            if reader.peek() == ']':
+                                reader.expect(']')
+                            else:
+                                while True:
+                                    yield reader.value()
+                                    if reader.expect(',]') == ']':
+                                        break
+                        else:
+                            # Остальные поля верхнего уровня пропускаем
+                            reader.value()
+                        if reader.expect(',}') == '}':
+                            break
+                if reader.peek():
+                    raise json.JSONDecodeError("Лишние данные после конца документа", "", 0)
+            except json.JSONDecodeError:
+                raise FileCorruptedError(f"Файл {filename} поврежден или имеет неверный формат JSON")
+            except UnicodeDecodeError as e:
+                raise FileOperationError(f"Ошибка при чтении файла {filename}: {e}")
+    
     @staticmethod
     def save_to_file(filename: str, contacts: List[Contact]) -> bool:
-        """Сохраняет контакты в JSON файл"""
+        """Сохраняет контакты в JSON файл (или снимок .pbk, или NDJSON - по расширению)"""
+        if FileHandler.is_snapshot(filename):
+            write_snapshot(filename, (contact.to_dict() for contact in contacts))
+            return True
+        
+        if FileHandler.is_ndjson(filename):
+            NDJSONFile(filename, load_index=False).rewrite(contact.to_dict() for contact in contacts)
+            return True
+        
         try:
             data = {
                 'contacts': [contact.to_dict() for contact in contacts],
                 'last_updated': datetime.now().isoformat()
             }
             
-            with open(filename, 'w', encoding='utf-8') as f:
+            # Пишем во временный файл и атомарно заменяем основной, чтобы сбой не оставил его поврежденным
+            temp_filename = filename + '.tmp'
+            with open(temp_filename, 'w', encoding='utf-8') as f:
                 json.dump(data, f, ensure_ascii=False, indent=2)
+            os.replace(temp_filename, filename)
             
             return True
         except Exception as e:
             raise FileOperationError(f"Ошибка при сохранении файла {filename}: {e}")
+    
+    @staticmethod
+    def convert(source: str, target: str) -> int:
+        """
+        Конвертирует справочник между JSON, .pbk и NDJSON (формат определяется по расширению).
+        Некорректные контакты пропускаются. Возвращает число записанных контактов.
+        """
+        if not os.path.exists(source):
+            raise FileOperationError(f"Файл {source} не найден")
+        
+        contacts = []
+        for contact_data in FileHandler.iter_contacts(source):
+            if not isinstance(contact_data, dict):
+                continue
+            try:
+                contacts.append(Contact.from_dict(contact_data))
+            except ContactValidationError:
+                continue
+        FileHandler.save_to_file(target, contacts)
+        return len(contacts)
+
+
+def _contacts_from_records(records: Iterable, start: int = 1) -> Tuple[List[Contact], List[Tuple[int, str]]]:
+    """
+    Создает контакты из словарей записей.
+    Возвращает контакты и ошибки (номер записи, сообщение); номера записей начинаются со start.
+    """
+    contacts = []
+    errors = []
+    for number, data in enumerate(records, start=start):
+        try:
+            contacts.append(_contact_from_record(data))
+        except ContactValidationError as e:
+            errors.append((number, str(e)))
+    return contacts, errors
+
+
+def _contact_from_record(data) -> Contact:
+    """Создает контакт из записи файла; некорректная запись вызывает ContactValidationError"""
+    if isinstance(data, Exception):
+        # Запись, которую читатель файла не смог разобрать
+        raise ContactValidationError(str(data))
+    if not isinstance(data, dict):
+        raise ContactValidationError("Запись контакта должна быть объектом JSON")
+    return Contact.from_dict(data)
+
+
+def _contacts_from_ndjson(filename: str, entries: List[Tuple[int, int]],
+                          start: int) -> Tuple[List[Contact], List[Tuple[int, str]]]:
+    """Читает строки NDJSON по смещениям и создает из них контакты (выполняется в процессе пула)"""
+    return _contacts_from_records(NDJSONFile.read_entries(filename, entries), start)
+
+
+class LoadReport:
+    """
+    Отчет о загрузке справочника: пропущенные записи по типам ошибок
+    и первые примеры с номерами записей (объем отчета ограничен).
+    """
+    
+    # Сколько примеров ошибок хранится в отчете
+    MAX_EXAMPLES = 10
+    
+    def __init__(self):
+        self._loaded = 0
+        self._skipped = 0
+        self._assigned_ids = range(0)
+        self._counts: Dict[str, int] = {}
+        self._examples: List[Tuple[int, str]] = []
+    
+    @property
+    def loaded(self) -> int:
+        """Геттер для количества загруженных контактов"""
+        return self._loaded
+    
+    @loaded.setter
+    def loaded(self, value: int):
+        """Сеттер для количества загруженных контактов"""
+        self._loaded = value
+    
+    @property
+    def assigned_ids(self) -> range:
+        """Геттер для диапазона ID, присвоенных при загрузке контактам без ID"""
+        return self._assigned_ids
+    
+    @assigned_ids.setter
+    def assigned_ids(self, value: range):
+        """Сеттер для диапазона присвоенных ID"""
+        self._assigned_ids = value
+    
+    @property
+    def skipped(self) -> int:
+        """Геттер для количества пропущенных записей"""
+        return self._skipped
+    
+    @property
+    def counts(self) -> Dict[str, int]:
+        """Геттер для количества пропущенных записей по типам ошибок"""
+        return dict(self._counts)
+    
+    @property
+    def examples(self) -> List[Tuple[int, str]]:
+        """Геттер для первых ошибок: (номер записи, сообщение)"""
+        return list(self._examples)
+    
+    @staticmethod
+    def error_type(message: str) -> str:
+        """Возвращает тип ошибки: первое предложение сообщения без подробностей"""
+        return message.split('. ', 1)[0]
+    
+    def add_error(self, record_number: int, message: str):
+        """Учитывает пропущенную запись"""
+        self._skipped += 1
+        error_type = self.error_type(message)
+        self._counts[error_type] = self._counts.get(error_type, 0) + 1
+        if len(self._examples) < self.MAX_EXAMPLES:
+            self._examples.append((record_number, message))
 
 
 class PhoneBook:
     """Класс для работы с телефонным справочником"""
     
-    def __init__(self, filename: str = "phonebook.json"):
+    # Размер журнала изменений (в байтах), после которого он переносится в основной файл
+    JOURNAL_COMPACT_SIZE = 1024 * 1024
+    # Количество записей в одной части при параллельной загрузке
+    PARALLEL_CHUNK_SIZE = 20000
+    
+    def __init__(self, filename: str = "phonebook.json", search_index: bool = False,
+                 store: Optional[ContactStore] = None, journal: bool = False,
+                 journal_compact_size: int = JOURNAL_COMPACT_SIZE, index_cache: bool = False,
+                 load_workers: int = 1):
         self._filename = filename
-        self._contacts: List[Contact] = []
+        # Хранилище контактов: по умолчанию список объектов, для больших справочников - колоночное
+        self._store: ContactStore = store if store is not None else ListContactStore()
+        # Хранилище по умолчанию можно заменить на отображение снимка .pbk при загрузке
+        self._default_store = store is None
+        # Вторичные индексы, поддерживаемые при изменениях справочника (строятся при первом обращении)
+        self._indexes: Dict[str, ContactIndex] = {}
+        if search_index:
+            # Необязательный индекс триграмм для поиска подстрок
+            self._indexes['ngram'] = NGramIndex()
         self._next_id = 1
         self._modified = False
+        
+        # Режим журнала: изменения дописываются в файл <filename>.journal вместо полной перезаписи
+        self._journal: Optional[ChangeJournal] = None
+        self._journal_enabled = journal
+        self._journal_compact_size = journal_compact_size
+        
+        # Кеш индексов: построенные индексы сохраняются в <filename>.indexes и не строятся при загрузке
+        self._index_cache = index_cache
+        
+        # Отчет о последней загрузке (пропущенные некорректные записи)
+        self._load_report = LoadReport()
+        
+        # Число процессов для разбора и проверки записей при загрузке (1 - без пула процессов)
+        self._load_workers = load_workers
     
     @property
     def filename(self) -> str:
@@ -189,9 +1120,13 @@ class PhoneBook:
         self._filename = value
     
     @property
-    def contacts(self) -> List[Contact]:
-        """Геттер для списка контактов"""
-        return self._contacts.copy()  # Возвращаем копию для защиты от изменений
+    def contacts(self) -> ContactsView:
+        """Геттер для неизменяемого представления контактов (без копирования списка)"""
+        return self._store.view()
+    
+    def iter_contacts(self) -> Iterator[Contact]:
+        """Перебирает контакты без построения списка (для потоковой обработки)"""
+        return iter(self._store)
     
     @property
     def next_id(self) -> int:
@@ -206,27 +1141,42 @@ class PhoneBook:
     @property
     def count(self) -> int:
         """Геттер для количества контактов"""
-        return len(self._contacts)
+        return len(self._store)
+    
+    @property
+    def load_report(self) -> LoadReport:
+        """Геттер для отчета о последней загрузке"""
+        return self._load_report
     
     def load_from_file(self) -> bool:
         """Загружает контакты из файла"""
+        self._load_report = report = LoadReport()
         try:
-            data = FileHandler.load_from_file(self._filename)
-            
-            # Загружаем контакты с обработкой ошибок валидации
-            contacts_list = []
-            for i, contact_data in enumerate(data.get('contacts', [])):
-                try:
-                    contacts_list.append(Contact.from_dict(contact_data))
-                except ContactValidationError as e:
-                    print(f"Предупреждение: Пропущен некорректный контакт #{i+1}: {e}")
-                    continue
+            snapshot = FileHandler.open_snapshot(self._filename) if self._default_store else None
+            if snapshot is not None and not snapshot.missing_ids:
+                # Снимок .pbk не разбирается целиком: записи читаются из mmap при обращении
+                self._replace_store(MappedContactStore(snapshot))
+                self._next_id = snapshot.max_id + 1
+                assigned_ids = False
+            else:
+                if snapshot is not None:
+                    snapshot.close()
+                
+                # Контакты загружаются в новое хранилище: ошибка чтения не портит справочник
+                store = ListContactStore() if self._default_store else self._store.empty()
+                report.assigned_ids = self._load_store(store, report)
+                assigned_ids = bool(report.assigned_ids)
+                self._replace_store(store)
             
-            self._contacts = contacts_list
+            if self._journal_enabled:
+                journal = ChangeJournal(self._journal_path(self._filename))
+                self._replay_journal(journal)
+                # Если ID назначены при загрузке, журнал нельзя продолжать: нужен новый снимок
+                self._journal = None if assigned_ids else journal
             
-            # Определяем следующий ID и присваиваем ID контактам без него
-            self._assign_missing_ids()
+            self._load_indexes()
             
+            report.loaded = len(self._store)
             self._modified = False
             return True
             
@@ -237,55 +1187,267 @@ class PhoneBook:
             print(f"Ошибка: {e}")
             return False
     
+    def _replace_store(self, store: ContactStore):
+        """Заменяет хранилище, закрывая отображение снимка предыдущего"""
+        if isinstance(self._store, MappedContactStore):
+            self._store.close()
+        self._store = store
+    
+    def _load_store(self, store: ContactStore, report: LoadReport) -> range:
+        """
+        Загружает контакты файла в хранилище потоково, не собирая их в список.
+        
+        Контакты без ID при первом проходе пропускаются. Если они есть, файл читается
+        второй раз и они получают ID после максимального ID файла в порядке файла.
+        Возвращает диапазон присвоенных ID.
+        """
+        max_id = 0
+        missing = 0
+        
+        def with_ids(contacts: Iterator[Contact]) -> Iterator[Contact]:
+            nonlocal max_id, missing
+            for contact in contacts:
+                if contact.id is None:
+                    missing += 1
+                    continue
+                max_id = max(max_id, contact.id)
+                yield contact
+        
+        store.load(with_ids(self._iter_file_contacts(report)))
+        if not missing:
+            if max_id:
+                self._next_id = max_id + 1
+            return range(0)
+        
+        next_id = max_id + 1
+        
+        def assign_ids(contacts: Iterator[Contact]) -> Iterator[Contact]:
+            nonlocal next_id
+            for contact in contacts:
+                if contact.id is None:
+                    contact.id = next_id
+                    next_id += 1
+                yield contact
+        
+        # Ошибки записей уже учтены в отчете первого прохода
+        store.load(assign_ids(self._iter_file_contacts(LoadReport())))
+        self._next_id = next_id
+        return range(max_id + 1, next_id)
+    
+    def _iter_file_contacts(self, report: LoadReport) -> Iterator[Contact]:
+        """Перебирает контакты файла по одному; некорректные записи учитываются в отчете"""
+        if self._load_workers > 1:
+            yield from self._iter_contacts_parallel(report)
+            return
+        for number, data in enumerate(FileHandler.iter_contacts(self._filename), start=1):
+            try:
+                yield _contact_from_record(data)
+            except ContactValidationError as e:
+                report.add_error(number, str(e))
+    
+    def _iter_contacts_parallel(self, report: LoadReport) -> Iterator[Contact]:
+        """
+        Создает контакты из записей файла в пуле процессов.
+        Записи делятся на части (строки NDJSON по смещениям или срезы разобранного массива JSON),
+        результаты передаются дальше по частям в исходном порядке.
+        """
+        chunk_size = self.PARALLEL_CHUNK_SIZE
+        if FileHandler.is_ndjson(self._filename) and os.path.exists(self._filename):
+            # Процессы сами читают свои строки файла, передаются только смещения
+            entries = FileHandler.open_ndjson(self._filename).entries()
+            starts = range(0, len(entries), chunk_size)
+            task = _contacts_from_ndjson
+            arguments = ([self._filename] * len(starts),
+                         [entries[start:start + chunk_size] for start in starts],
+                         [start + 1 for start in starts])
+        else:
+            records = list(FileHandler.iter_contacts(self._filename))
+            starts = range(0, len(records), chunk_size)
+            task = _contacts_from_records
+            arguments = ([records[start:start + chunk_size] for start in starts],
+                         [start + 1 for start in starts])
+        
+        if len(starts) <= 1:
+            # Одна часть - пул процессов не окупается
+            yield from self._collect_results(map(task, *arguments), report)
+        else:
+            with ProcessPoolExecutor(max_workers=self._load_workers) as executor:
+                yield from self._collect_results(executor.map(task, *arguments), report)
+    
+    @staticmethod
+    def _collect_results(results, report: LoadReport) -> Iterator[Contact]:
+        """Перебирает контакты частей, учитывая их ошибки в отчете"""
+        for contacts, errors in results:
+            for number, message in errors:
+                report.add_error(number, message)
+            yield from contacts
+    
     def save_to_file(self) -> bool:
         """Сохраняет контакты в файл"""
         try:
-            FileHandler.save_to_file(self._filename, self._contacts)
+            if not self._journal_enabled:
+                FileHandler.save_to_file(self._filename, self._store)
+            elif self._journal is None or self._journal.path != self._journal_path(self._filename):
+                # Журнал относится к другому снимку (или его еще нет): пишем снимок целиком
+                self.compact_journal()
+            else:
+                self._journal.flush()
+                if self._journal.size > self._journal_compact_size:
+                    self.compact_journal()
+            if self._index_cache:
+                save_index_cache(self._filename, self._index_sources(), self._indexes)
             self._modified = False
             return True
         except FileOperationError as e:
             print(f"Ошибка: {e}")
             return False
     
-    def _assign_missing_ids(self):
-        """Присваивает ID контактам, у которых его нет"""
-        modified_by_id = False
-        
-        if self._contacts:
-            # Находим максимальный ID среди контактов, у которых есть ID
-            ids_with_values = [contact.id for contact in self._contacts if contact.id is not None]
-            if ids_with_values:
-                self._next_id = max(ids_with_values) + 1
-            else:
-                self._next_id = 1
-            
-            # Присваиваем ID всем контактам, у которых его нет
-            for contact in self._contacts:
-                if contact.id is None:
-                    contact.id = self._next_id
-                    self._next_id += 1
-                    modified_by_id = True
+    @staticmethod
+    def _journal_path(filename: str) -> str:
+        """Возвращает путь к журналу изменений для файла справочника"""
+        return filename + '.journal'
+    
+    def compact_journal(self):
+        """Переносит журнал в основной файл: записывает полный снимок и удаляет журнал"""
+        FileHandler.save_to_file(self._filename, self._store)
+        journal = ChangeJournal(self._journal_path(self._filename))
+        journal.clear()
+        self._journal = journal
+    
+    def _replay_journal(self, journal: ChangeJournal):
+        """
+        Применяет записи журнала к загруженному снимку (повторное применение безопасно).
+        Поврежденные строки журнала пропускаются и попадают в отчет о загрузке.
+        """
+        for i, record in enumerate(journal.replay(self._load_report.add_error)):
+            try:
+                operation = record[0]
+                if operation == ChangeJournal.ADD:
+                    contact = Contact.from_dict(record[1])
+                    if contact.id is None:
+                        continue
+                    if self._store.get(contact.id) is None:
+                        self._store.append(contact)
+                    else:
+                        self._store.update(contact)
+                    self._next_id = max(self._next_id, contact.id + 1)
+                elif operation == ChangeJournal.UPDATE:
+                    contact = self._store.get(record[1])
+                    if contact is None:
+                        continue
+                    for field, value in record[2].items():
+                        if field in ('name', 'phone', 'comment'):
+                            setattr(contact, field, value)
+                    self._store.update(contact)
+                elif operation == ChangeJournal.DELETE:
+                    if self._store.get(record[1]) is not None:
+                        self._store.remove(record[1])
+            except (ContactValidationError, IndexError, TypeError, AttributeError) as e:
+                self._load_report.add_error(i + 1, f"Некорректная запись журнала. {e}")
+    
+    def _rebuild_indexes(self):
+        """Перестраивает вторичные индексы"""
+        for index in self._indexes.values():
+            index.build(self._store)
+    
+    def _index_sources(self) -> List[str]:
+        """Возвращает файлы, по содержимому которых проверяется актуальность кеша индексов"""
+        sources = [self._filename]
+        if self._journal_enabled:
+            sources.append(self._journal_path(self._filename))
+        return sources
+    
+    def _load_indexes(self):
+        """Берет индексы из кеша, если он актуален; остальные строит и обновляет кеш"""
+        if not self._index_cache:
+            self._rebuild_indexes()
+            return
         
-        if modified_by_id:
-            self._modified = True
+        cached = load_index_cache(self._filename, self._index_sources())
+        fresh = cached is not None
+        cached = cached or {}
+        rebuilt = False
+        for name, index in self._indexes.items():
+            if name in cached:
+                continue
+            index.build(self._store)
+            cached[name] = index
+            rebuilt = True
+        self._indexes = cached
+        if rebuilt or not fresh:
+            save_index_cache(self._filename, self._index_sources(), self._indexes)
+    
+    def _get_index(self, name: str, factory) -> ContactIndex:
+        """Возвращает вторичный индекс, при первом обращении строит его по текущим контактам"""
+        index = self._indexes.get(name)
+        if index is None:
+            index = factory()
+            index.build(self._store)
+            self._indexes[name] = index
+            if self._index_cache and not self._modified:
+                # Справочник совпадает с файлом - новый индекс можно сразу добавить в кеш
+                save_index_cache(self._filename, self._index_sources(), self._indexes)
+        return index
+    
+    def _index_add(self, contact: Contact):
+        """Добавляет контакт во вторичные индексы"""
+        for index in self._indexes.values():
+            index.add(contact)
+    
+    def _index_remove(self, contact: Contact):
+        """Удаляет контакт из вторичных индексов"""
+        for index in self._indexes.values():
+            index.remove(contact)
     
     def add_contact(self, contact: Contact) -> Contact:
         """Добавляет новый контакт"""
         contact.id = self._next_id
-        self._contacts.append(contact)
-        self._next_id += 1
-        self._modified = True
+        self._insert(contact)
         return contact
     
+    def _insert(self, contact: Contact):
+        """Добавляет контакт с уже назначенным ID (ID выделяет вызывающий код)"""
+        self._store.append(contact)
+        self._next_id = max(self._next_id, contact.id + 1)
+        self._index_add(contact)
+        if self._journal is not None:
+            self._journal.record_add(contact.to_dict())
+        self._modified = True
+    
+    def add_contacts(self, contacts: Iterable[Contact]) -> List[Contact]:
+        """
+        Добавляет контакты пакетом: ID выделяются одним диапазоном,
+        а индексы обновляются один раз после добавления всех контактов.
+        """
+        contacts = list(contacts)
+        if not contacts:
+            return contacts
+        
+        first_id = self._next_id
+        for contact_id, contact in enumerate(contacts, start=first_id):
+            contact.id = contact_id
+            self._store.append(contact)
+            if self._journal is not None:
+                self._journal.record_add(contact.to_dict())
+        self._next_id = first_id + len(contacts)
+        
+        for index in self._indexes.values():
+            if len(contacts) * 2 > len(self._store):
+                # Пакет больше половины справочника - дешевле построить индекс заново
+                index.build(self._store)
+            else:
+                for contact in contacts:
+                    index.add(contact)
+        
+        self._modified = True
+        return contacts
+    
     def find_by_id(self, contact_id: int) -> Optional[Contact]:
         """Находит контакт по ID"""
         if contact_id <= 0:
             raise InvalidContactIDError(f"ID должен быть положительным числом, получено: {contact_id}")
         
-        for contact in self._contacts:
-            if contact.id == contact_id:
-                return contact
-        return None
+        return self._store.get(contact_id)
     
     def get_contact(self, contact_id: int) -> Contact:
         """Получает контакт по ID или выбрасывает исключение"""
@@ -298,12 +1460,23 @@ class PhoneBook:
         """Обновляет контакт"""
         contact = self.get_contact(contact_id)
         
-        if 'name' in kwargs:
-            contact.name = kwargs['name']
-        if 'phone' in kwargs:
-            contact.phone = kwargs['phone']
-        if 'comment' in kwargs:
-            contact.comment = kwargs['comment']
+        self._index_remove(contact)
+        try:
+            if 'name' in kwargs:
+                contact.name = kwargs['name']
+            if 'phone' in kwargs:
+                contact.phone = kwargs['phone']
+            if 'comment' in kwargs:
+                contact.comment = kwargs['comment']
+        finally:
+            # Хранилище и индексы должны соответствовать контакту даже после ошибки валидации
+            self._store.update(contact)
+            self._index_add(contact)
+            if self._journal is not None:
+                fields = {field: getattr(contact, field) for field in ('name', 'phone', 'comment')
+                          if field in kwargs}
+                if fields:
+                    self._journal.record_update(contact_id, fields)
         
         self._modified = True
         return contact
@@ -311,34 +1484,76 @@ class PhoneBook:
     def delete_contact(self, contact_id: int) -> bool:
         """Удаляет контакт"""
         contact = self.get_contact(contact_id)
-        self._contacts.remove(contact)
+        self._index_remove(contact)
+        self._store.remove(contact_id)
+        if self._journal is not None:
+            self._journal.record_delete(contact_id)
         self._modified = True
         return True
     
     def search(self, search_term: str, field: Optional[str] = None) -> List[Contact]:
         """Поиск контактов"""
-        search_term = search_term.lower()
+        search_term = search_term.casefold()
         results = []
         
-        for contact in self._contacts:
+        contacts: Iterable[Contact] = self._store
+        ngram_index = self._indexes.get('ngram')
+        if ngram_index is not None:
+            candidate_ids = ngram_index.candidates(search_term, field)
+            if candidate_ids is not None:
+                # Проверяем только кандидатов из индекса
+                contacts = self._store.get_many(candidate_ids)
+        
+        for contact in contacts:
             if field is None:
                 # Общий поиск
-                if (search_term in contact.name.lower() or 
-                    search_term in contact.phone.lower() or 
-                    search_term in contact.comment.lower()):
+                if (search_term in contact.name_key or 
+                    search_term in contact.phone_key or 
+                    search_term in contact.comment_key):
                     results.append(contact)
             elif field == 'name':
-                if search_term in contact.name.lower():
+                if search_term in contact.name_key:
                     results.append(contact)
             elif field == 'phone':
-                if search_term in contact.phone.lower():
+                if search_term in contact.phone_key:
                     results.append(contact)
             elif field == 'comment':
-                if search_term in contact.comment.lower():
+                if search_term in contact.comment_key:
                     results.append(contact)
         
         return results
     
+    def find_by_phone(self, phone: str) -> List[Contact]:
+        """Находит контакты по точному совпадению канонической формы телефона"""
+        canonical = Contact.normalize_phone(phone.strip())
+        if canonical is None:
+            return []
+        phone_index = self._get_index('phone', PhoneIndex)
+        return self._store.get_many(phone_index.lookup(canonical))
+    
+    def search_phone_prefix(self, prefix: str) -> List[Contact]:
+        """Находит контакты, канонический телефон которых начинается с prefix"""
+        digits = Contact.normalize_phone(prefix.strip())
+        if digits is None:
+            return []
+        trie = self._get_index('phone_prefix', PhoneTrie)
+        return self._store.get_many(trie.lookup(digits))
+    
+    def search_phone_suffix(self, suffix: str) -> List[Contact]:
+        """Находит контакты, канонический телефон которых заканчивается на suffix"""
+        digits = Contact.normalize_phone(suffix.strip())
+        if digits is None:
+            return []
+        trie = self._get_index('phone_suffix', lambda: PhoneTrie(reverse=True))
+        return self._store.get_many(trie.lookup(digits))
+    
+    def complete(self, prefix: str, limit: int = 10) -> List[Contact]:
+        """Автодополнение: контакты, имя или слово имени которых начинается с prefix"""
+        tree = self._get_index('name_radix', NameRadixTree)
+        contact_ids = tree.lookup(prefix.strip().casefold(), limit)
+        contacts = (self._store.get(contact_id) for contact_id in contact_ids)
+        return [contact for contact in contacts if contact is not None]
+    
     def has_unsaved_changes(self) -> bool:
         """Проверяет наличие несохраненных изменений"""
         return self._modified
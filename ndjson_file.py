@@ -0,0 +1,344 @@
+"""
+Модуль NDJSON File - справочник в формате NDJSON (один контакт на строку) с индексом смещений
+
+Рядом с файлом данных хранится компактный индекс <файл>.idx: ID -> (смещение, длина) строки.
+Заголовок индекса содержит отпечаток файла данных (время изменения и хеш первой и последней
+покрытых строк): индекс файла, перезаписанного другим содержимым, строится заново.
+Контакт читается одним seek + read; изменение дописывает новую строку в конец файла
+и перенаправляет индекс, удаление дописывает строку-метку {"id": ..., "deleted": true}.
+Устаревшие строки остаются в файле до уплотнения (compact). Строка с неверным JSON
+не прерывает чтение: при переборе она передается как ошибка ValueError, и загрузка
+справочника учитывает ее как пропущенную запись.
+"""
+
+import hashlib
+import json
+import os
+import struct
+from typing import Dict, Iterator, List, Optional, Tuple
+from exceptions import FileCorruptedError, FileOperationError
+
+
+INDEX_MAGIC = b'NDX\x00'
+INDEX_VERSION = 2
+
+# Сигнатура, версия, резерв, размер файла данных, покрытый индексом, число записей,
+# время изменения файла данных (нс), смещение последней покрытой строки, хеш первой и последней строк
+INDEX_HEADER = struct.Struct('<4sHHQQQQ8s')
+# Ключ записи, смещение и длина строки
+INDEX_ENTRY = struct.Struct('<qQI')
+
+INDEX_EXTENSION = '.idx'
+
+
+def _encode_line(data: Dict) -> bytes:
+    """Кодирует запись в одну строку JSON"""
+    return (json.dumps(data, ensure_ascii=False, separators=(',', ':')) + '\n').encode('utf-8')
+
+
+class NDJSONFile:
+    """
+    Файл NDJSON с индексом смещений строк.
+    
+    Порядок контактов - порядок их первого добавления: изменение контакта
+    не перемещает его в конец справочника. Строки без ID (и неверные строки)
+    получают в индексе отрицательный ключ и читаются только при переборе.
+    Повторный контакт с тем же ID записывается с пометкой "duplicate": true,
+    чтобы при чтении он не считался изменением первого, и тоже индексируется по смещению.
+    """
+    
+    def __init__(self, filename: str, load_index: bool = True):
+        self._filename = filename
+        self._entries: Dict[int, Tuple[int, int]] = {}  # ключ -> (смещение, длина) актуальной строки
+        self._size = 0  # размер файла данных
+        self._tail_offset = 0  # смещение последней строки файла данных
+        self._live_bytes = 0  # суммарная длина актуальных строк
+        self._index_dirty = False
+        if load_index:
+            self._open_index()
+    
+    @property
+    def filename(self) -> str:
+        """Геттер для имени файла данных"""
+        return self._filename
+    
+    @property
+    def index_filename(self) -> str:
+        """Геттер для имени файла индекса"""
+        return self._filename + INDEX_EXTENSION
+    
+    @property
+    def dead_bytes(self) -> int:
+        """Геттер для объема устаревших строк, освобождаемого уплотнением"""
+        return self._size - self._live_bytes
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    def __contains__(self, contact_id: int) -> bool:
+        return contact_id in self._entries
+    
+    def _open_index(self):
+        """Загружает индекс; строки, дописанные после его сохранения, дочитываются из файла"""
+        try:
+            stat = os.stat(self._filename) if os.path.exists(self._filename) else None
+        except OSError as e:
+            raise FileOperationError(f"Ошибка при чтении файла {self._filename}: {e}")
+        self._size = stat.st_size if stat is not None else 0
+        
+        covered = self._read_index(stat.st_mtime_ns if stat is not None else 0)
+        if covered is None:
+            # Индекса нет или он не соответствует файлу: строим его заново
+            self._entries = {}
+            self._live_bytes = 0
+            self._tail_offset = 0
+            covered = 0
+        if covered < self._size:
+            self._scan(covered)
+            self._index_dirty = True
+    
+    def _fingerprint(self, tail_offset: int, covered: int) -> bytes:
+        """Возвращает хеш первой строки файла данных и строки [tail_offset, covered)"""
+        digest = hashlib.blake2b(digest_size=8)
+        if covered:
+            try:
+                with open(self._filename, 'rb') as f:
+                    digest.update(f.readline())
+                    f.seek(tail_offset)
+                    digest.update(f.read(covered - tail_offset))
+            except OSError as e:
+                raise FileOperationError(f"Ошибка при чтении файла {self._filename}: {e}")
+        return digest.digest()
+    
+    def _read_index(self, mtime_ns: int) -> Optional[int]:
+        """Читает файл индекса; возвращает покрытый им размер данных или None"""
+        try:
+            with open(self.index_filename, 'rb') as f:
+                data = f.read()
+        except OSError:
+            return None
+        
+        if len(data) < INDEX_HEADER.size:
+            return None
+        magic, version, _, covered, count, index_mtime_ns, tail_offset, fingerprint = INDEX_HEADER.unpack_from(data, 0)
+        if (magic != INDEX_MAGIC or version != INDEX_VERSION or covered > self._size or tail_offset > covered
+                or len(data) != INDEX_HEADER.size + count * INDEX_ENTRY.size):
+            return None
+        if (index_mtime_ns != mtime_ns or covered != self._size) and \
+                self._fingerprint(tail_offset, covered) != fingerprint:
+            # Файл изменен после сохранения индекса не только дописыванием строк
+            return None
+        
+        entries = {}
+        live_bytes = 0
+        for key, offset, length in INDEX_ENTRY.iter_unpack(memoryview(data)[INDEX_HEADER.size:]):
+            entries[key] = (offset, length)
+            live_bytes += length
+        self._entries = entries
+        self._live_bytes = live_bytes
+        self._tail_offset = tail_offset
+        return covered
+    
+    def _scan(self, start: int):
+        """Читает строки файла начиная со смещения start и применяет их к индексу"""
+        try:
+            with open(self._filename, 'rb') as f:
+                f.seek(start)
+                offset = start
+                for line in f:
+                    if not line.endswith(b'\n'):
+                        # Строка не была дописана до конца (например, при сбое) - не учитываем ее
+                        self._size = offset
+                        break
+                    self._apply_line(line, offset)
+                    self._tail_offset = offset
+                    offset += len(line)
+        except OSError as e:
+            raise FileOperationError(f"Ошибка при чтении файла {self._filename}: {e}")
+    
+    def _apply_line(self, line: bytes, offset: int):
+        """Применяет одну строку файла к индексу"""
+        if not line.strip():
+            return
+        data = self._parse_line(line, offset)
+        if not isinstance(data, dict):
+            # Неверная строка остается в индексе, чтобы загрузка учла ее как пропущенную запись
+            self._point(-(offset + 1), offset, len(line))
+            return
+        
+        contact_id = data.get('id')
+        if not isinstance(contact_id, int) or contact_id <= 0 or data.get('duplicate'):
+            # Строка без ID или повторный контакт с тем же ID: отрицательный ключ по смещению
+            # сохраняет ее место в порядке контактов
+            contact_id = -(offset + 1)
+        
+        if data.get('deleted'):
+            self._drop(contact_id)
+        else:
+            self._point(contact_id, offset, len(line))
+    
+    def _point(self, key: int, offset: int, length: int):
+        """Направляет ключ индекса на новую строку"""
+        previous = self._entries.get(key)
+        if previous is not None:
+            self._live_bytes -= previous[1]
+        self._entries[key] = (offset, length)
+        self._live_bytes += length
+    
+    def _drop(self, key: int):
+        """Удаляет ключ из индекса"""
+        previous = self._entries.pop(key, None)
+        if previous is not None:
+            self._live_bytes -= previous[1]
+    
+    def _parse_line(self, line: bytes, offset: int):
+        """Разбирает строку файла; неверный JSON возвращается как ошибка ValueError"""
+        try:
+            return json.loads(line)
+        except (json.JSONDecodeError, UnicodeDecodeError):
+            return ValueError(f"Неверная строка JSON. Смещение {offset} в файле {self._filename}")
+    
+    def _read_at(self, f, offset: int, length: int):
+        """Читает и разбирает одну строку по смещению"""
+        f.seek(offset)
+        return self._parse_line(f.read(length), offset)
+    
+    def read(self, contact_id: int) -> Optional[Dict]:
+        """Читает контакт по ID одним seek + read"""
+        entry = self._entries.get(contact_id)
+        if entry is None:
+            return None
+        try:
+            with open(self._filename, 'rb') as f:
+                data = self._read_at(f, *entry)
+        except OSError as e:
+            raise FileOperationError(f"Ошибка при чтении файла {self._filename}: {e}")
+        if not isinstance(data, dict):
+            # Строка с ID проверена при построении индекса: файл изменен в обход него
+            raise FileCorruptedError(
+                f"Файл {self._filename} поврежден: неверная строка по смещению {entry[0]}"
+            )
+        return data
+    
+    def entries(self) -> List[Tuple[int, int]]:
+        """Возвращает (смещение, длина) актуальных строк в порядке справочника"""
+        return list(self._entries.values())
+    
+    @classmethod
+    def read_entries(cls, filename: str, entries: List[Tuple[int, int]]) -> Iterator[Dict]:
+        """Читает строки по списку (смещение, длина) без загрузки индекса (для параллельного чтения)"""
+        ndjson = cls(filename, load_index=False)
+        try:
+            with open(filename, 'rb') as f:
+                for offset, length in entries:
+                    yield ndjson._read_at(f, offset, length)
+        except OSError as e:
+            raise FileOperationError(f"Ошибка при чтении файла {filename}: {e}")
+    
+    def __iter__(self) -> Iterator[Dict]:
+        """Перебирает актуальные записи в порядке справочника (неверные строки - как ошибки ValueError)"""
+        try:
+            with open(self._filename, 'rb') as f:
+                for offset, length in list(self._entries.values()):
+                    yield self._read_at(f, offset, length)
+        except FileNotFoundError:
+            return
+        except OSError as e:
+            raise FileOperationError(f"Ошибка при чтении файла {self._filename}: {e}")
+    
+    def _append_lines(self, lines):
+        """Дописывает строки в конец файла; возвращает смещение первой из них"""
+        try:
+            with open(self._filename, 'ab') as f:
+                # Недописанный хвост (после сбоя) отрезается, чтобы новая строка не склеилась с ним
+                if f.tell() != self._size:
+                    f.truncate(self._size)
+                    f.seek(self._size)
+                offset = self._size
+                f.write(b''.join(lines))
+        except OSError as e:
+            raise FileOperationError(f"Ошибка при записи файла {self._filename}: {e}")
+        self._size += sum(len(line) for line in lines)
+        self._tail_offset = self._size - len(lines[-1])
+        self._index_dirty = True
+        return offset
+    
+    def put(self, data: Dict):
+        """Добавляет или изменяет контакт: дописывает строку и перенаправляет индекс"""
+        contact_id = data.get('id')
+        if not isinstance(contact_id, int) or contact_id <= 0:
+            raise ValueError("Для записи в NDJSON контакт должен иметь положительный ID")
+        line = _encode_line(data)
+        offset = self._append_lines([line])
+        self._point(contact_id, offset, len(line))
+    
+    def delete(self, contact_id: int) -> bool:
+        """Удаляет контакт: дописывает строку-метку удаления"""
+        if contact_id not in self._entries:
+            return False
+        self._append_lines([_encode_line({'id': contact_id, 'deleted': True})])
+        self._drop(contact_id)
+        return True
+    
+    def flush_index(self):
+        """Сохраняет индекс рядом с файлом данных (атомарно)"""
+        if not self._index_dirty:
+            return
+        try:
+            mtime_ns = os.stat(self._filename).st_mtime_ns if self._size else 0
+        except OSError as e:
+            raise FileOperationError(f"Ошибка при чтении файла {self._filename}: {e}")
+        parts = [INDEX_HEADER.pack(INDEX_MAGIC, INDEX_VERSION, 0, self._size, len(self._entries), mtime_ns,
+                                   self._tail_offset, self._fingerprint(self._tail_offset, self._size))]
+        parts.extend(INDEX_ENTRY.pack(key, offset, length) for key, (offset, length) in self._entries.items())
+        temp_filename = self.index_filename + '.tmp'
+        try:
+            with open(temp_filename, 'wb') as f:
+                f.write(b''.join(parts))
+            os.replace(temp_filename, self.index_filename)
+        except OSError as e:
+            raise FileOperationError(f"Ошибка при сохранении индекса {self.index_filename}: {e}")
+        self._index_dirty = False
+    
+    def rewrite(self, records) -> int:
+        """Записывает файл заново из записей (атомарно) и возвращает их число"""
+        entries: Dict[int, Tuple[int, int]] = {}
+        offset = tail_offset = 0
+        temp_filename = self._filename + '.tmp'
+        try:
+            with open(temp_filename, 'wb') as f:
+                for data in records:
+                    if not isinstance(data, dict):
+                        # Неверные строки при перезаписи отбрасываются
+                        continue
+                    contact_id = data.get('id')
+                    if not isinstance(contact_id, int) or contact_id <= 0:
+                        contact_id = -(offset + 1)
+                    elif contact_id in entries:
+                        # Повторный ID сохраняется, как и в JSON: пометка отличает его от изменения контакта
+                        data = dict(data, duplicate=True)
+                        contact_id = -(offset + 1)
+                    line = _encode_line(data)
+                    f.write(line)
+                    entries[contact_id] = (offset, len(line))
+                    tail_offset = offset
+                    offset += len(line)
+            os.replace(temp_filename, self._filename)
+        except OSError as e:
+            raise FileOperationError(f"Ошибка при сохранении файла {self._filename}: {e}")
+        
+        self._entries = entries
+        self._size = offset
+        self._tail_offset = tail_offset
+        self._live_bytes = sum(length for _, length in entries.values())
+        self._index_dirty = True
+        self.flush_index()
+        return len(entries)
+    
+    def compact(self) -> int:
+        """Уплотняет файл: оставляет только актуальные строки; возвращает освобожденный объем"""
+        reclaimed = self.dead_bytes
+        if reclaimed:
+            # Актуальные строки читаются из старого файла, пока новый пишется во временный
+            self.rewrite(iter(self))
+        return reclaimed
@@ -0,0 +1,330 @@
+"""
+Модуль Server - локальный HTTP/JSON сервис поверх телефонного справочника
+
+Запуск из корня репозитория:
+    python server.py [--file phonebook.json] [--host 127.0.0.1] [--port 8080]
+
+Маршруты:
+    GET    /contacts                 все контакты или поиск (?q=...&field=name|phone|comment)
+    GET    /contacts/<id>            контакт по ID
+    POST   /contacts                 создание контакта {"name", "phone", "comment"}
+    PATCH  /contacts/<id>            изменение полей контакта
+    DELETE /contacts/<id>            удаление контакта
+    POST   /contacts/batch/get       получение пакета {"ids": [...]}
+    POST   /contacts/batch/create    создание пакета {"contacts": [{...}, ...]}
+    POST   /save                     сохранение справочника в файл
+
+Соединения поддерживают keep-alive (HTTP/1.1). Ответы на чтение содержат ETag с токеном сервера
+и номером изменения справочника: запрос с If-None-Match получает 304 без тела, если справочник
+не менялся. Токен новый при каждом запуске, поэтому ETag прошлого запуска с тем же номером
+изменения не совпадет.
+"""
+
+import argparse
+import json
+import re
+import secrets
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+from model import Contact
+from importers import validate_record
+from thread_safe import ThreadSafePhoneBook
+from exceptions import (
+    ContactNotFoundError,
+    ContactValidationError,
+    FileOperationError,
+    InvalidInputError
+)
+
+
+# Максимальный размер тела запроса
+MAX_BODY_SIZE = 16 * 1024 * 1024
+# Максимальное число записей в пакетном запросе
+MAX_BATCH_SIZE = 10000
+
+SEARCH_FIELDS = ('name', 'phone', 'comment')
+
+_CONTACT_PATH = re.compile(r'^/contacts/(\d+)$')
+
+
+class HTTPError(Exception):
+    """Ошибка запроса с кодом ответа HTTP"""
+    
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+class PhoneBookRequestHandler(BaseHTTPRequestHandler):
+    """Обработчик запросов JSON API справочника"""
+    
+    # HTTP/1.1: соединение остается открытым между запросами (keep-alive)
+    protocol_version = 'HTTP/1.1'
+    server_version = 'PhoneBookHTTP/1.0'
+    # Заголовки и тело отправляются отдельными записями: без TCP_NODELAY алгоритм Нейгла
+    # вместе с отложенным ACK клиента добавляет к каждому ответу keep-alive ~40 мс
+    disable_nagle_algorithm = True
+    
+    @property
+    def phonebook(self) -> ThreadSafePhoneBook:
+        """Геттер для справочника сервера"""
+        return self.server.phonebook
+    
+    def log_message(self, format, *args):
+        """Журнал запросов выводится, только если он включен при создании сервера"""
+        if self.server.verbose:
+            super().log_message(format, *args)
+    
+    def _etag(self) -> str:
+        """Возвращает ETag текущего состояния справочника: токен сервера и номер изменения"""
+        return f'"{self.server.etag_token}-{self.phonebook.version}"'
+    
+    def _send_json(self, status: int, data: Optional[Dict] = None, etag: Optional[str] = None):
+        """Отправляет ответ JSON (или пустой ответ, если data is None)"""
+        body = b'' if data is None else json.dumps(data, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        if data is not None:
+            self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        # Номер изменения берется из ETag, если он есть: оба относятся к состоянию, из которого взято тело
+        version = etag.strip('"').rsplit('-', 1)[1] if etag is not None else self.phonebook.version
+        self.send_header('X-PhoneBook-Version', str(version))
+        if etag is not None:
+            self.send_header('ETag', etag)
+        self.end_headers()
+        if body:
+            self.wfile.write(body)
+    
+    def _read_body(self) -> bytes:
+        """Читает тело запроса целиком, чтобы следующий запрос соединения начинался с начала"""
+        try:
+            length = int(self.headers.get('Content-Length', 0))
+        except ValueError:
+            self.close_connection = True
+            raise HTTPError(400, "Неверный заголовок Content-Length")
+        if length > MAX_BODY_SIZE:
+            # Тело не читается, поэтому соединение нельзя использовать дальше
+            self.close_connection = True
+            raise HTTPError(413, "Слишком большое тело запроса")
+        return self.rfile.read(length) if length > 0 else b''
+    
+    def _read_json(self) -> Dict:
+        """Разбирает тело запроса JSON"""
+        try:
+            data = json.loads(self._body or b'{}')
+        except (json.JSONDecodeError, UnicodeDecodeError):
+            raise HTTPError(400, "Тело запроса должно быть JSON")
+        if not isinstance(data, dict):
+            raise HTTPError(400, "Тело запроса должно быть объектом JSON")
+        return data
+    
+    def _read_batch(self, data: Dict, key: str) -> list:
+        """Возвращает список пакетного запроса"""
+        items = data.get(key)
+        if not isinstance(items, list):
+            raise HTTPError(400, f"Поле '{key}' должно быть списком")
+        if len(items) > MAX_BATCH_SIZE:
+            raise HTTPError(413, f"В пакете не больше {MAX_BATCH_SIZE} записей")
+        return items
+    
+    def _not_modified(self) -> Optional[str]:
+        """Отвечает 304, если ETag клиента совпадает с текущим; иначе возвращает ETag"""
+        etag = self._etag()
+        if etag in (tag.strip() for tag in self.headers.get('If-None-Match', '').split(',')):
+            self._send_json(304, etag=etag)
+            return None
+        return etag
+    
+    def _dispatch(self, method: str):
+        """Вызывает обработчик маршрута и преобразует ошибки в ответы JSON"""
+        url = urlsplit(self.path)
+        self._body = b''
+        try:
+            self._body = self._read_body()
+            handler, args = self._route(method, url.path)
+            handler(parse_qs(url.query), *args)
+        except HTTPError as e:
+            self._send_json(e.status, {'error': str(e)})
+        except ContactNotFoundError as e:
+            self._send_json(404, {'error': str(e)})
+        except (ContactValidationError, InvalidInputError) as e:
+            self._send_json(400, {'error': str(e)})
+        except FileOperationError as e:
+            self._send_json(500, {'error': str(e)})
+    
+    def _route(self, method: str, path: str) -> Tuple:
+        """Возвращает обработчик и аргументы маршрута"""
+        path = path.rstrip('/') or '/'
+        routes = {
+            ('GET', '/contacts'): self._list_contacts,
+            ('POST', '/contacts'): self._create_contact,
+            ('POST', '/contacts/batch/get'): self._batch_get,
+            ('POST', '/contacts/batch/create'): self._batch_create,
+            ('POST', '/save'): self._save,
+        }
+        if (method, path) in routes:
+            return routes[method, path], ()
+        
+        match = _CONTACT_PATH.match(path)
+        if match:
+            handlers = {'GET': self._get_contact, 'PATCH': self._update_contact, 'DELETE': self._delete_contact}
+            if method not in handlers:
+                raise HTTPError(405, f"Метод {method} не поддерживается для {path}")
+            return handlers[method], (int(match.group(1)),)
+        
+        if any(route_path == path for _, route_path in routes):
+            raise HTTPError(405, f"Метод {method} не поддерживается для {path}")
+        raise HTTPError(404, f"Маршрут {path} не найден")
+    
+    def _list_contacts(self, query: Dict):
+        """GET /contacts: все контакты или результаты поиска"""
+        etag = self._not_modified()
+        if etag is None:
+            return
+        search_term = query.get('q', [None])[0]
+        field = query.get('field', [None])[0]
+        if field is not None and field not in SEARCH_FIELDS:
+            raise HTTPError(400, f"Поле поиска должно быть одним из: {', '.join(SEARCH_FIELDS)}")
+        contacts = self.phonebook.contacts if search_term is None else self.phonebook.search(search_term, field)
+        self._send_json(200, {'contacts': [contact.to_dict() for contact in contacts]}, etag)
+    
+    def _get_contact(self, query: Dict, contact_id: int):
+        """GET /contacts/<id>"""
+        etag = self._not_modified()
+        if etag is None:
+            return
+        self._send_json(200, self.phonebook.get_contact(contact_id).to_dict(), etag)
+    
+    def _create_contact(self, query: Dict):
+        """POST /contacts"""
+        contact = validate_record(self._read_json())
+        # Тело и ETag берутся под той же блокировкой, что и изменение, чтобы они соответствовали друг другу
+        with self.phonebook.write_lock():
+            body = self.phonebook.add_contact(contact).to_dict()
+            etag = self._etag()
+        self._send_json(201, body, etag)
+    
+    def _update_contact(self, query: Dict, contact_id: int):
+        """PATCH /contacts/<id>"""
+        data = self._read_json()
+        fields = {}
+        for field in SEARCH_FIELDS:
+            if field in data:
+                if not isinstance(data[field], str):
+                    raise HTTPError(400, f"Поле '{field}' должно быть строкой")
+                fields[field] = data[field]
+        # Все поля проверяются до изменения: update_contact применяет поля по одному,
+        # и ошибка во втором поле оставила бы первое уже измененным
+        if 'name' in fields and not fields['name'].strip():
+            raise HTTPError(400, "Имя не может быть пустым")
+        if 'phone' in fields:
+            phone = fields['phone'].strip()
+            if not phone:
+                raise HTTPError(400, "Телефон не может быть пустым")
+            if not Contact.is_valid_phone(phone):
+                raise HTTPError(400, "Телефон может содержать только цифры, пробелы, +, -, (, )")
+        with self.phonebook.write_lock():
+            body = self.phonebook.update_contact(contact_id, **fields).to_dict()
+            etag = self._etag()
+        self._send_json(200, body, etag)
+    
+    def _delete_contact(self, query: Dict, contact_id: int):
+        """DELETE /contacts/<id>"""
+        self.phonebook.delete_contact(contact_id)
+        self._send_json(204)
+    
+    def _batch_get(self, query: Dict):
+        """POST /contacts/batch/get: контакты по списку ID и список ненайденных ID"""
+        contact_ids = self._read_batch(self._read_json(), 'ids')
+        if not all(isinstance(contact_id, int) and contact_id > 0 for contact_id in contact_ids):
+            raise HTTPError(400, "ID должны быть положительными целыми числами")
+        contacts, missing = [], []
+        # Весь пакет читается под одной блокировкой - это один согласованный снимок справочника
+        with self.phonebook.read_lock():
+            for contact_id in contact_ids:
+                contact = self.phonebook.find_by_id(contact_id)
+                if contact is None:
+                    missing.append(contact_id)
+                else:
+                    contacts.append(contact.to_dict())
+            etag = self._etag()
+        self._send_json(200, {'contacts': contacts, 'missing': missing}, etag)
+    
+    def _batch_create(self, query: Dict):
+        """POST /contacts/batch/create: корректные записи добавляются одним пакетом, ошибки - по номерам"""
+        records = self._read_batch(self._read_json(), 'contacts')
+        contacts, errors = [], []
+        for index, record in enumerate(records):
+            try:
+                contacts.append(validate_record(record))
+            except ContactValidationError as e:
+                errors.append({'index': index, 'error': str(e)})
+        with self.phonebook.write_lock():
+            created = [contact.to_dict() for contact in self.phonebook.add_contacts(contacts)]
+            etag = self._etag()
+        status = 201 if created else 400
+        self._send_json(status, {'created': created, 'errors': errors}, etag)
+    
+    def _save(self, query: Dict):
+        """POST /save"""
+        if not self.phonebook.save_to_file():
+            raise HTTPError(500, f"Не удалось сохранить файл {self.phonebook.filename}")
+        self._send_json(200, {'saved': True})
+    
+    def do_GET(self):
+        self._dispatch('GET')
+    
+    def do_POST(self):
+        self._dispatch('POST')
+    
+    def do_PUT(self):
+        self._dispatch('PUT')
+    
+    def do_PATCH(self):
+        self._dispatch('PATCH')
+    
+    def do_DELETE(self):
+        self._dispatch('DELETE')
+
+
+def make_server(phonebook: ThreadSafePhoneBook, host: str = '127.0.0.1', port: int = 8080,
+                verbose: bool = False) -> ThreadingHTTPServer:
+    """Создает сервер (порт 0 - любой свободный); запуск - serve_forever()"""
+    server = ThreadingHTTPServer((host, port), PhoneBookRequestHandler)
+    server.daemon_threads = True
+    server.phonebook = phonebook
+    server.verbose = verbose
+    # Номер изменения начинается заново в каждом процессе, токен отличает ETag разных запусков
+    server.etag_token = secrets.token_hex(8)
+    return server
+
+
+def main(argv=None):
+    """Загружает справочник и запускает сервер до Ctrl+C, затем сохраняет изменения"""
+    parser = argparse.ArgumentParser(description="HTTP/JSON сервис телефонного справочника")
+    parser.add_argument('--file', default='phonebook.json', help="файл справочника")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--verbose', action='store_true', help="выводить журнал запросов")
+    args = parser.parse_args(argv)
+    
+    phonebook = ThreadSafePhoneBook(filename=args.file)
+    if not phonebook.load_from_file():
+        return 1
+    
+    server = make_server(phonebook, args.host, args.port, args.verbose)
+    print(f"Справочник {args.file}: {phonebook.count} контактов, http://{args.host}:{server.server_port}/contacts")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        if phonebook.has_unsaved_changes():
+            phonebook.save_to_file()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
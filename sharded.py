@@ -0,0 +1,228 @@
+"""
+Модуль Sharded - справочник, разделенный на несколько файлов (шардов) по ID контакта
+
+Основной файл справочника хранит манифест: список файлов шардов и следующий ID.
+Имя манифеста по умолчанию (phonebook.shards.json) отличается от имени обычного
+справочника, чтобы их файлы не путались. Контакт с ID n хранится в шарде n % N. При сохранении перезаписываются только
+шарды, измененные с момента последнего сохранения, причем параллельно в пуле потоков.
+"""
+
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Iterable, List, Optional
+from model import Contact, ContactsView, PhoneBook
+from exceptions import FileCorruptedError, FileOperationError
+
+
+class ShardedPhoneBook:
+    """Телефонный справочник из N шардов с тем же интерфейсом, что и PhoneBook"""
+    
+    DEFAULT_SHARDS = 8
+    DEFAULT_FILENAME = "phonebook.shards.json"
+    
+    def __init__(self, filename: str = DEFAULT_FILENAME, shards: int = DEFAULT_SHARDS,
+                 save_workers: Optional[int] = None):
+        if shards <= 0:
+            raise ValueError("Количество шардов должно быть положительным числом")
+        self._filename = filename
+        self._save_workers = save_workers
+        self._shards: List[PhoneBook] = [PhoneBook(filename=self._shard_filename(i)) for i in range(shards)]
+        self._next_id = 1
+        # Манифест нужно записать (новый справочник, смена файла или числа шардов)
+        self._manifest_dirty = True
+        # Все шарды нужно записать заново (например, после смены имени файла)
+        self._rewrite_all = False
+    
+    def _shard_filename(self, number: int) -> str:
+        """Возвращает имя файла шарда: phonebook.json -> phonebook.shard0.json"""
+        root, extension = os.path.splitext(self._filename)
+        return f"{root}.shard{number}{extension or '.json'}"
+    
+    def _shard(self, contact_id: int) -> PhoneBook:
+        """Возвращает шард, в котором хранится контакт с данным ID"""
+        return self._shards[contact_id % len(self._shards)]
+    
+    @property
+    def filename(self) -> str:
+        """Геттер для имени файла манифеста"""
+        return self._filename
+    
+    @filename.setter
+    def filename(self, value: str):
+        """Сеттер для имени файла: шарды будут записаны рядом с новым манифестом"""
+        if not value or not isinstance(value, str):
+            raise ValueError("Имя файла должно быть непустой строкой")
+        self._filename = value
+        for number, shard in enumerate(self._shards):
+            shard.filename = self._shard_filename(number)
+        self._manifest_dirty = True
+        self._rewrite_all = True
+    
+    @property
+    def shard_count(self) -> int:
+        """Геттер для количества шардов"""
+        return len(self._shards)
+    
+    @property
+    def dirty_shards(self) -> List[int]:
+        """Геттер для номеров шардов, которые будут перезаписаны при сохранении"""
+        return [
+            number for number, shard in enumerate(self._shards)
+            if self._rewrite_all or shard.modified or not os.path.exists(shard.filename)
+        ]
+    
+    @property
+    def contacts(self) -> ContactsView:
+        """Геттер для представления контактов (по возрастанию ID)"""
+        contacts = [contact for shard in self._shards for contact in shard.iter_contacts()]
+        contacts.sort(key=lambda contact: contact.id)
+        return ContactsView(contacts)
+    
+    @property
+    def next_id(self) -> int:
+        """Геттер для следующего ID"""
+        return self._next_id
+    
+    @property
+    def modified(self) -> bool:
+        """Геттер для флага изменений"""
+        return self.has_unsaved_changes()
+    
+    @property
+    def count(self) -> int:
+        """Геттер для количества контактов"""
+        return sum(shard.count for shard in self._shards)
+    
+    def load_from_file(self) -> bool:
+        """Загружает манифест и все шарды"""
+        if not os.path.exists(self._filename):
+            self._shards = [PhoneBook(filename=self._shard_filename(i)) for i in range(len(self._shards))]
+            self._next_id = 1
+            self._manifest_dirty = True
+            self._rewrite_all = False
+            return True
+        
+        try:
+            try:
+                with open(self._filename, 'r', encoding='utf-8') as f:
+                    manifest = json.load(f)
+                shard_files = [str(name) for name in manifest['shards']]
+                next_id = int(manifest.get('next_id', 1))
+            except (json.JSONDecodeError, KeyError, TypeError, ValueError):
+                raise FileCorruptedError(f"Файл {self._filename} поврежден или не является манифестом шардов")
+            except OSError as e:
+                raise FileOperationError(f"Ошибка при чтении файла {self._filename}: {e}")
+            if not shard_files:
+                raise FileCorruptedError(f"Файл {self._filename} поврежден: список шардов пуст")
+        except FileOperationError as e:
+            print(f"Ошибка: {e}")
+            return False
+        
+        # Пути шардов в манифесте указаны относительно него
+        directory = os.path.dirname(self._filename)
+        shards = [PhoneBook(filename=os.path.join(directory, name)) for name in shard_files]
+        if not all(shard.load_from_file() for shard in shards):
+            return False
+        
+        self._shards = shards
+        # Шард без ID в файле присваивает их сам, начиная со своего следующего ID: такие ID
+        # могут совпасть в разных шардах и не соответствовать шарду n % N - назначаем их заново
+        self._next_id = max([next_id] + [
+            shard.load_report.assigned_ids.start if shard.load_report.assigned_ids else shard.next_id
+            for shard in shards
+        ])
+        self._manifest_dirty = False
+        self._rewrite_all = False
+        self._reassign_loaded_ids()
+        return True
+    
+    def _reassign_loaded_ids(self):
+        """Выдает контактам, получившим ID при загрузке шарда, общие ID и переносит их в свои шарды"""
+        for shard in list(self._shards):
+            assigned = shard.load_report.assigned_ids
+            if not assigned:
+                continue
+            contacts = [contact for contact in shard.iter_contacts() if contact.id in assigned]
+            for contact in contacts:
+                shard.delete_contact(contact.id)
+                self.add_contact(contact)
+    
+    def save_to_file(self) -> bool:
+        """Перезаписывает измененные шарды параллельно, затем манифест"""
+        dirty = [self._shards[number] for number in self.dirty_shards]
+        if dirty:
+            with ThreadPoolExecutor(max_workers=self._save_workers) as executor:
+                results = list(executor.map(lambda shard: shard.save_to_file(), dirty))
+            if not all(results):
+                return False
+        
+        if self._manifest_dirty or not os.path.exists(self._filename):
+            try:
+                self._save_manifest()
+            except FileOperationError as e:
+                print(f"Ошибка: {e}")
+                return False
+        self._rewrite_all = False
+        return True
+    
+    def _save_manifest(self):
+        """Атомарно записывает манифест"""
+        data = {
+            'shards': [os.path.basename(shard.filename) for shard in self._shards],
+            'next_id': self._next_id,
+            'last_updated': datetime.now().isoformat()
+        }
+        temp_filename = self._filename + '.tmp'
+        try:
+            with open(temp_filename, 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False, indent=2)
+            os.replace(temp_filename, self._filename)
+        except OSError as e:
+            raise FileOperationError(f"Ошибка при сохранении файла {self._filename}: {e}")
+        self._manifest_dirty = False
+    
+    def add_contact(self, contact: Contact) -> Contact:
+        """Добавляет новый контакт в шард по его ID"""
+        contact.id = self._next_id
+        self._shard(contact.id)._insert(contact)
+        self._next_id += 1
+        self._manifest_dirty = True
+        return contact
+    
+    def add_contacts(self, contacts: Iterable[Contact]) -> List[Contact]:
+        """Добавляет контакты пакетом"""
+        return [self.add_contact(contact) for contact in contacts]
+    
+    def find_by_id(self, contact_id: int) -> Optional[Contact]:
+        """Находит контакт по ID в его шарде"""
+        return self._shard(contact_id).find_by_id(contact_id)
+    
+    def get_contact(self, contact_id: int) -> Contact:
+        """Получает контакт по ID или выбрасывает исключение"""
+        return self._shard(contact_id).get_contact(contact_id)
+    
+    def update_contact(self, contact_id: int, **kwargs) -> Contact:
+        """Обновляет контакт в его шарде"""
+        return self._shard(contact_id).update_contact(contact_id, **kwargs)
+    
+    def delete_contact(self, contact_id: int) -> bool:
+        """Удаляет контакт из его шарда"""
+        return self._shard(contact_id).delete_contact(contact_id)
+    
+    def search(self, search_term: str, field: Optional[str] = None) -> List[Contact]:
+        """Поиск контактов во всех шардах (результаты по возрастанию ID)"""
+        results = [contact for shard in self._shards for contact in shard.search(search_term, field)]
+        results.sort(key=lambda contact: contact.id)
+        return results
+    
+    def find_by_phone(self, phone: str) -> List[Contact]:
+        """Находит контакты по канонической форме телефона во всех шардах"""
+        results = [contact for shard in self._shards for contact in shard.find_by_phone(phone)]
+        results.sort(key=lambda contact: contact.id)
+        return results
+    
+    def has_unsaved_changes(self) -> bool:
+        """Проверяет наличие несохраненных изменений"""
+        return self._manifest_dirty or self._rewrite_all or any(shard.modified for shard in self._shards)
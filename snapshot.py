@@ -0,0 +1,165 @@
+"""
+Модуль Snapshot - двоичный формат снимка справочника (.pbk) с доступом через mmap
+
+Структура файла (все числа little-endian):
+    заголовок   - сигнатура, версия, число записей, максимальный ID,
+                  число записей без ID, смещение кучи строк
+    таблица     - записи фиксированной ширины: ID и (смещение, длина) строк имени,
+                  телефона и комментария в куче
+    индекс ID   - номера записей, упорядоченные по ID, для двоичного поиска
+    куча строк  - строки полей в UTF-8
+"""
+
+import mmap
+import os
+import struct
+from array import array
+from typing import Dict, Iterable, Iterator, Optional
+from exceptions import FileCorruptedError, FileOperationError
+
+
+MAGIC = b'PBK\x00'
+VERSION = 1
+
+# Сигнатура, версия, резерв, число записей, максимальный ID, записей без ID, смещение кучи
+HEADER = struct.Struct('<4sHHQQQQ')
+# ID (0 - нет ID), смещение и длина имени, телефона и комментария
+RECORD = struct.Struct('<qQIQIQI')
+# Номер записи в индексе, упорядоченном по ID
+INDEX_ENTRY = struct.Struct('<Q')
+
+FIELDS = ('name', 'phone', 'comment')
+
+
+def write_snapshot(filename: str, contacts: Iterable[Dict]) -> int:
+    """Записывает контакты (словари to_dict) в файл .pbk и возвращает число записей"""
+    table = bytearray()
+    heap = bytearray()
+    ids = array('q')
+    max_id = 0
+    missing_ids = 0
+    
+    for data in contacts:
+        contact_id = data.get('id') or 0
+        if contact_id:
+            max_id = max(max_id, contact_id)
+        else:
+            missing_ids += 1
+        ids.append(contact_id)
+        
+        fields = []
+        for field in FIELDS:
+            encoded = (data.get(field) or '').encode('utf-8')
+            fields.extend((len(heap), len(encoded)))
+            heap += encoded
+        table += RECORD.pack(contact_id, *fields)
+    
+    count = len(ids)
+    # Записи без ID (0) оказываются в начале индекса и поиском по положительному ID не находятся
+    index = bytearray()
+    for row in sorted(range(count), key=lambda row: (ids[row], row)):
+        index += INDEX_ENTRY.pack(row)
+    
+    heap_offset = HEADER.size + len(table) + len(index)
+    header = HEADER.pack(MAGIC, VERSION, 0, count, max_id, missing_ids, heap_offset)
+    
+    temp_filename = filename + '.tmp'
+    try:
+        with open(temp_filename, 'wb') as f:
+            f.write(header)
+            f.write(table)
+            f.write(index)
+            f.write(heap)
+        os.replace(temp_filename, filename)
+    except OSError as e:
+        raise FileOperationError(f"Ошибка при сохранении файла {filename}: {e}")
+    return count
+
+
+class SnapshotReader:
+    """Чтение снимка .pbk через mmap: открытие O(1), записи декодируются при обращении"""
+    
+    def __init__(self, filename: str):
+        self._filename = filename
+        try:
+            with open(filename, 'rb') as f:
+                size = os.fstat(f.fileno()).st_size
+                if size < HEADER.size:
+                    raise FileCorruptedError(f"Файл {filename} поврежден или не является снимком .pbk")
+                self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except OSError as e:
+            raise FileOperationError(f"Ошибка при чтении файла {filename}: {e}")
+        
+        magic, version, _, count, max_id, missing_ids, heap_offset = HEADER.unpack_from(self._map, 0)
+        self._table_offset = HEADER.size
+        self._index_offset = self._table_offset + count * RECORD.size
+        if (magic != MAGIC or version != VERSION
+                or heap_offset != self._index_offset + count * INDEX_ENTRY.size or heap_offset > size):
+            self._map.close()
+            raise FileCorruptedError(f"Файл {filename} поврежден или не является снимком .pbk")
+        
+        self._count = count
+        self._max_id = max_id
+        self._missing_ids = missing_ids
+        self._heap_offset = heap_offset
+    
+    @property
+    def filename(self) -> str:
+        """Геттер для имени файла"""
+        return self._filename
+    
+    @property
+    def max_id(self) -> int:
+        """Геттер для максимального ID в снимке"""
+        return self._max_id
+    
+    @property
+    def missing_ids(self) -> int:
+        """Геттер для числа записей без ID"""
+        return self._missing_ids
+    
+    def __len__(self) -> int:
+        return self._count
+    
+    def __iter__(self) -> Iterator[Dict]:
+        for row in range(self._count):
+            yield self.record(row)
+    
+    def close(self):
+        """Закрывает отображение файла"""
+        self._map.close()
+    
+    def record_id(self, row: int) -> Optional[int]:
+        """Возвращает ID записи без декодирования строк"""
+        contact_id = struct.unpack_from('<q', self._map, self._table_offset + row * RECORD.size)[0]
+        return contact_id or None
+    
+    def record(self, row: int) -> Dict:
+        """Декодирует запись в словарь в формате Contact.to_dict"""
+        if not 0 <= row < self._count:
+            raise IndexError(row)
+        contact_id, *fields = RECORD.unpack_from(self._map, self._table_offset + row * RECORD.size)
+        data = {'id': contact_id or None}
+        heap_offset = self._heap_offset
+        try:
+            for i, field in enumerate(FIELDS):
+                start = heap_offset + fields[2 * i]
+                data[field] = self._map[start:start + fields[2 * i + 1]].decode('utf-8')
+        except UnicodeDecodeError:
+            raise FileCorruptedError(f"Файл {self._filename} поврежден: запись #{row + 1} не читается")
+        return data
+    
+    def find_row(self, contact_id: int) -> Optional[int]:
+        """Находит номер первой записи с данным ID двоичным поиском по индексу"""
+        low, high = 0, self._count
+        while low < high:
+            middle = (low + high) // 2
+            row = INDEX_ENTRY.unpack_from(self._map, self._index_offset + middle * INDEX_ENTRY.size)[0]
+            if (self.record_id(row) or 0) < contact_id:
+                low = middle + 1
+            else:
+                high = middle
+        if low == self._count:
+            return None
+        row = INDEX_ENTRY.unpack_from(self._map, self._index_offset + low * INDEX_ENTRY.size)[0]
+        return row if self.record_id(row) == contact_id else None
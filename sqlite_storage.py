@@ -0,0 +1,287 @@
+"""
+Модуль SQLite Storage - хранение справочника в базе SQLite с полнотекстовым поиском (FTS5)
+
+Контакты хранятся в таблице contacts с первичным ключом id, для поиска подстрок
+используется виртуальная таблица FTS5 с токенизатором trigram по ключам поиска
+(имя, телефон и комментарий без учета регистра). Изменения выполняются в базе сразу,
+а фиксируются (COMMIT) при сохранении справочника.
+"""
+
+import os
+import sqlite3
+from typing import Iterable, Iterator, List, Optional
+from model import Contact, ContactStore, FileHandler, PhoneBook
+from exceptions import ContactValidationError, FileCorruptedError, FileOperationError
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS contacts (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    phone TEXT NOT NULL,
+    comment TEXT NOT NULL DEFAULT ''
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS contacts_fts USING fts5(
+    name, phone, comment, tokenize='trigram'
+);
+"""
+
+# Поля контакта, по которым выполняется поиск
+SEARCH_FIELDS = ('name', 'phone', 'comment')
+
+# Минимальная длина запроса, при которой работает индекс триграмм
+FTS_MIN_LENGTH = 3
+
+
+def _connect(filename: str) -> sqlite3.Connection:
+    """Открывает базу и создает схему при необходимости"""
+    try:
+        connection = sqlite3.connect(filename)
+    except sqlite3.Error as e:
+        raise FileOperationError(f"Ошибка при открытии файла {filename}: {e}")
+    try:
+        connection.executescript(SCHEMA)
+        connection.commit()
+    except sqlite3.DatabaseError as e:
+        connection.close()
+        raise FileCorruptedError(f"Файл {filename} поврежден или не является базой SQLite: {e}")
+    return connection
+
+
+def _row_to_contact(row) -> Contact:
+    """Создает контакт из строки таблицы contacts"""
+    return Contact(name=row[1], phone=row[2], comment=row[3], contact_id=row[0])
+
+
+class SQLiteContactStore(ContactStore):
+    """
+    Хранилище контактов в базе SQLite.
+    
+    Контакты упорядочены по ID, позицией контакта служит сам ID.
+    При дублирующихся ID сохраняется первый контакт, как и в остальных хранилищах.
+    """
+    
+    def __init__(self, connection: Optional[sqlite3.Connection] = None):
+        self._connection = connection if connection is not None else _connect(':memory:')
+    
+    @property
+    def connection(self) -> sqlite3.Connection:
+        """Геттер для соединения с базой"""
+        return self._connection
+    
+    def __len__(self) -> int:
+        return self._connection.execute("SELECT COUNT(*) FROM contacts").fetchone()[0]
+    
+    def __iter__(self) -> Iterator[Contact]:
+        cursor = self._connection.execute("SELECT id, name, phone, comment FROM contacts ORDER BY id")
+        for row in cursor:
+            yield _row_to_contact(row)
+    
+    def position(self, contact_id: int) -> Optional[int]:
+        """Возвращает ID, если контакт есть в базе, иначе None"""
+        row = self._connection.execute("SELECT 1 FROM contacts WHERE id = ?", (contact_id,)).fetchone()
+        return None if row is None else contact_id
+    
+    def at(self, position: int) -> Contact:
+        """Возвращает контакт по позиции (ID)"""
+        contact = self.get(position)
+        if contact is None:
+            raise IndexError(position)
+        return contact
+    
+    def get(self, contact_id: int) -> Optional[Contact]:
+        """Возвращает контакт по ID (поиск по первичному ключу)"""
+        row = self._connection.execute(
+            "SELECT id, name, phone, comment FROM contacts WHERE id = ?", (contact_id,)
+        ).fetchone()
+        return None if row is None else _row_to_contact(row)
+    
+    def get_many(self, contact_ids: Iterable[int]) -> List[Contact]:
+        """Возвращает контакты по ID одним запросом"""
+        contact_ids = list(contact_ids)
+        contacts = []
+        # Ограничение SQLite на число параметров запроса
+        for start in range(0, len(contact_ids), 500):
+            chunk = contact_ids[start:start + 500]
+            placeholders = ','.join('?' * len(chunk))
+            cursor = self._connection.execute(
+                f"SELECT id, name, phone, comment FROM contacts WHERE id IN ({placeholders})", chunk
+            )
+            contacts.extend(_row_to_contact(row) for row in cursor)
+        contacts.sort(key=lambda contact: contact.id)
+        return contacts
+    
+    def append(self, contact: Contact):
+        """Добавляет контакт в базу"""
+        cursor = self._connection.execute(
+            "INSERT OR IGNORE INTO contacts (id, name, phone, comment) VALUES (?, ?, ?, ?)",
+            (contact.id, contact.name, contact.phone, contact.comment)
+        )
+        if cursor.rowcount:
+            self._fts_insert(contact)
+    
+    def update(self, contact: Contact):
+        """Записывает измененные поля контакта в базу"""
+        cursor = self._connection.execute(
+            "UPDATE contacts SET name = ?, phone = ?, comment = ? WHERE id = ?",
+            (contact.name, contact.phone, contact.comment, contact.id)
+        )
+        if cursor.rowcount:
+            self._connection.execute("DELETE FROM contacts_fts WHERE rowid = ?", (contact.id,))
+            self._fts_insert(contact)
+    
+    def remove(self, contact_id: int):
+        """Удаляет контакт из базы"""
+        self._connection.execute("DELETE FROM contacts WHERE id = ?", (contact_id,))
+        self._connection.execute("DELETE FROM contacts_fts WHERE rowid = ?", (contact_id,))
+    
+    def load(self, contacts: Iterable[Contact]):
+        """Заменяет содержимое базы"""
+        self._connection.execute("DELETE FROM contacts")
+        self._connection.execute("DELETE FROM contacts_fts")
+        for contact in contacts:
+            self.append(contact)
+    
+    def max_id(self) -> int:
+        """Возвращает максимальный ID в базе (0, если база пуста)"""
+        return self._connection.execute("SELECT COALESCE(MAX(id), 0) FROM contacts").fetchone()[0]
+    
+    def _fts_insert(self, contact: Contact):
+        """Добавляет ключи поиска контакта в таблицу FTS"""
+        self._connection.execute(
+            "INSERT INTO contacts_fts (rowid, name, phone, comment) VALUES (?, ?, ?, ?)",
+            (contact.id, contact.name_key, contact.phone_key, contact.comment_key)
+        )
+    
+    def search_candidates(self, search_term: str, field: Optional[str] = None) -> Optional[List[int]]:
+        """
+        Возвращает ID контактов, ключи которых могут содержать подстроку (по индексу FTS5).
+        None означает, что запрос короче триграммы и индекс не применим.
+        """
+        if len(search_term) < FTS_MIN_LENGTH:
+            return None
+        if field is not None and field not in SEARCH_FIELDS:
+            return []
+        # Запрос - одна фраза в кавычках, чтобы спецсимволы FTS5 не интерпретировались
+        phrase = '"' + search_term.replace('"', '""') + '"'
+        query = phrase if field is None else f"{field} : {phrase}"
+        cursor = self._connection.execute(
+            "SELECT rowid FROM contacts_fts WHERE contacts_fts MATCH ?", (query,)
+        )
+        return [row[0] for row in cursor]
+
+
+class SQLitePhoneBook(PhoneBook):
+    """
+    Телефонный справочник, хранящийся в базе SQLite.
+    
+    Добавление, изменение и удаление сразу выполняются в базе в рамках открытой
+    транзакции; save_to_file фиксирует ее, а несохраненные изменения отменяются
+    при повторной загрузке или закрытии справочника.
+    """
+    
+    def __init__(self, filename: str = "phonebook.db"):
+        super().__init__(filename=filename, store=SQLiteContactStore())
+        self._connected_filename: Optional[str] = None
+    
+    def load_from_file(self) -> bool:
+        """Открывает базу (несохраненные изменения отменяются)"""
+        try:
+            self.close()
+            self._store = SQLiteContactStore(_connect(self._filename))
+            self._connected_filename = self._filename
+            self._next_id = self._store.max_id() + 1
+            self._rebuild_indexes()
+            self._modified = False
+            return True
+        except FileOperationError as e:
+            print(f"Ошибка: {e}")
+            return False
+    
+    def save_to_file(self) -> bool:
+        """Фиксирует изменения в базе; при смене имени файла база копируется в новый файл"""
+        try:
+            connection = self._store.connection
+            connection.commit()
+            if self._connected_filename != self._filename:
+                target = _connect(self._filename)
+                connection.backup(target)
+                connection.close()
+                self._store = SQLiteContactStore(target)
+                self._connected_filename = self._filename
+            self._modified = False
+            return True
+        except sqlite3.Error as e:
+            print(f"Ошибка: Ошибка при сохранении файла {self._filename}: {e}")
+            return False
+        except FileOperationError as e:
+            print(f"Ошибка: {e}")
+            return False
+    
+    def close(self):
+        """Закрывает базу без фиксации несохраненных изменений"""
+        self._store.connection.close()
+        self._store = SQLiteContactStore()
+        self._connected_filename = None
+        self._rebuild_indexes()
+    
+    def search(self, search_term: str, field: Optional[str] = None) -> List[Contact]:
+        """Поиск контактов по индексу FTS5 с проверкой совпадения подстроки"""
+        key = search_term.casefold()
+        candidate_ids = self._store.search_candidates(key, field)
+        if candidate_ids is None:
+            return super().search(search_term, field)
+        
+        fields = SEARCH_FIELDS if field is None else (field,)
+        return [
+            contact for contact in self._store.get_many(candidate_ids)
+            if any(key in getattr(contact, f'{name}_key') for name in fields)
+        ]
+
+
+def migrate_from_json(source: str, target: str) -> int:
+    """
+    Переносит справочник из JSON (или .pbk) в новую базу SQLite, возвращает число контактов.
+    
+    Некорректные контакты пропускаются, контактам без ID назначаются новые ID.
+    База записывается во временный файл и заменяет target только после успешного переноса.
+    """
+    temp_filename = target + '.tmp'
+    if os.path.exists(temp_filename):
+        os.remove(temp_filename)
+    
+    connection = _connect(temp_filename)
+    try:
+        store = SQLiteContactStore(connection)
+        without_id = []
+        for contact_data in FileHandler.iter_contacts(source):
+            if not isinstance(contact_data, dict):
+                continue
+            try:
+                contact = Contact.from_dict(contact_data)
+            except ContactValidationError:
+                continue
+            if contact.id is None:
+                without_id.append(contact)
+            else:
+                store.append(contact)
+        
+        next_id = store.max_id() + 1
+        for contact in without_id:
+            contact.id = next_id
+            store.append(contact)
+            next_id += 1
+        
+        count = len(store)
+        connection.commit()
+    except BaseException:
+        connection.close()
+        os.remove(temp_filename)
+        raise
+    connection.close()
+    
+    try:
+        os.replace(temp_filename, target)
+    except OSError as e:
+        raise FileOperationError(f"Ошибка при сохранении файла {target}: {e}")
+    return count
@@ -4,6 +4,7 @@
 
 import pytest
 import os
+import glob
 import json
 import tempfile
 from pathlib import Path
@@ -17,9 +18,10 @@ def temp_file():
     fd, path = tempfile.mkstemp(suffix='.json', prefix='test_')
     os.close(fd)
     yield path
-    # Удаляем файл после теста
-    if os.path.exists(path):
-        os.remove(path)
+    # Удаляем файл и служебные файлы рядом с ним (журнал, индексы) после теста
+    for leftover in [path] + glob.glob(glob.escape(path) + '.*'):
+        if os.path.exists(leftover):
+            os.remove(leftover)
 
 
 @pytest.fixture
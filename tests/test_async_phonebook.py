@@ -0,0 +1,146 @@
+"""
+Тесты для асинхронного фасада справочника
+"""
+
+import pytest
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from model import Contact, FileHandler, PhoneBook
+from async_phonebook import AsyncPhoneBook
+from thread_safe import ThreadSafePhoneBook
+
+
+@pytest.fixture
+def counted_saves(monkeypatch):
+    """Подсчитывает записи файла; событие release задерживает запись, пока его не установят"""
+    state = {'writes': 0, 'release': threading.Event()}
+    state['release'].set()
+    original_save = FileHandler.save_to_file
+    
+    def save_to_file(filename, contacts):
+        state['release'].wait(timeout=5)
+        state['writes'] += 1
+        return original_save(filename, contacts)
+    
+    monkeypatch.setattr(FileHandler, 'save_to_file', staticmethod(save_to_file))
+    return state
+
+
+class TestAsyncPhoneBook:
+    """Тесты загрузки, поиска и объединения сохранений"""
+    
+    def test_load_search_and_iterate(self, phonebook_with_contacts):
+        """Тест загрузки, поиска и асинхронных итераторов"""
+        phonebook_with_contacts.save_to_file()
+        
+        async def scenario():
+            async with AsyncPhoneBook(phonebook_with_contacts.filename) as book:
+                assert await book.load() is True
+                found = await book.search("иван")
+                names = [contact.name async for contact in book.iter_search("999", field="phone")]
+                ids = [contact.id async for contact in book.iter_contacts()]
+                contact = await book.get_contact(2)
+                return found, names, ids, contact
+        
+        found, names, ids, contact = asyncio.run(scenario())
+        assert [c.id for c in found] == [1]
+        assert names == ["Иван Иванов", "Мария Петрова"]
+        assert ids == [1, 2, 3]
+        assert contact.name == "Мария Петрова"
+    
+    def test_back_to_back_saves_coalesced(self, temp_file, counted_saves):
+        """Тест что сохранения, вызванные подряд, дают одну запись"""
+        async def scenario():
+            async with AsyncPhoneBook(temp_file) as book:
+                await book.add_contact(Contact(name="Первый", phone="1"))
+                results = await asyncio.gather(*(book.save() for _ in range(5)))
+                return results, book.has_unsaved_changes()
+        
+        results, unsaved = asyncio.run(scenario())
+        assert results == [True] * 5
+        assert unsaved is False
+        assert counted_saves['writes'] == 1
+        
+        loaded = PhoneBook(filename=temp_file)
+        loaded.load_from_file()
+        assert [c.name for c in loaded.contacts] == ["Первый"]
+    
+    def test_saves_during_write_queue_one_more(self, temp_file, counted_saves):
+        """Тест что вызовы во время записи объединяются в одно следующее сохранение"""
+        counted_saves['release'].clear()
+        
+        async def scenario():
+            async with AsyncPhoneBook(temp_file) as book:
+                await book.add_contact(Contact(name="Первый", phone="1"))
+                first = asyncio.ensure_future(book.save())
+                # Даем первой записи начаться (она ждет события release)
+                while book._active_save is None:
+                    await asyncio.sleep(0.001)
+                await book.add_contact(Contact(name="Второй", phone="2"))
+                later = [asyncio.ensure_future(book.save()) for _ in range(3)]
+                await asyncio.sleep(0.01)
+                counted_saves['release'].set()
+                return await asyncio.gather(first, *later)
+        
+        assert asyncio.run(scenario()) == [True] * 4
+        assert counted_saves['writes'] == 2
+        loaded = PhoneBook(filename=temp_file)
+        loaded.load_from_file()
+        assert loaded.count == 2
+    
+    def test_close_does_not_block_event_loop(self, temp_file):
+        """Тест что close() ждет вызовов в пуле, не останавливая цикл событий"""
+        release = threading.Event()
+        
+        async def scenario():
+            book = AsyncPhoneBook(temp_file)
+            pending = asyncio.ensure_future(book._run(release.wait, 5))
+            await asyncio.sleep(0.01)
+            closing = asyncio.ensure_future(book.close())
+            await asyncio.sleep(0.05)
+            closed_early = closing.done()
+            release.set()
+            await closing
+            return closed_early, await pending
+        
+        assert asyncio.run(scenario()) == (False, True)
+    
+    def test_plain_phonebook_runs_in_one_thread(self, temp_file):
+        """Тест что операции справочника без блокировок выполняются по очереди в одном потоке"""
+        threads = set()
+        
+        class RecordingPhoneBook(PhoneBook):
+            def find_by_id(self, contact_id):
+                threads.add(threading.get_ident())
+                return super().find_by_id(contact_id)
+        
+        async def scenario():
+            async with AsyncPhoneBook(phonebook=RecordingPhoneBook(temp_file)) as book:
+                await book.add_contact(Contact(name="Первый", phone="1"))
+                return await asyncio.gather(*(book.find_by_id(1) for _ in range(20)))
+        
+        results = asyncio.run(scenario())
+        assert [contact.name for contact in results] == ["Первый"] * 20
+        assert len(threads) == 1
+    
+    def test_plain_phonebook_with_external_executor_rejected(self, temp_file):
+        """Тест что справочник без блокировок нельзя передать вместе с внешним пулом"""
+        executor = ThreadPoolExecutor(max_workers=4)
+        try:
+            with pytest.raises(ValueError):
+                AsyncPhoneBook(phonebook=PhoneBook(temp_file), executor=executor)
+            AsyncPhoneBook(phonebook=ThreadSafePhoneBook(temp_file), executor=executor)
+        finally:
+            executor.shutdown()
+    
+    def test_save_skipped_without_changes(self, temp_file, counted_saves):
+        """Тест что сохранение без изменений не переписывает существующий файл"""
+        async def scenario():
+            async with AsyncPhoneBook(temp_file) as book:
+                await book.add_contact(Contact(name="Первый", phone="1"))
+                await book.save()
+                return await book.save()
+        
+        assert asyncio.run(scenario()) is True
+        assert counted_saves['writes'] == 1
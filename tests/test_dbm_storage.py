@@ -0,0 +1,112 @@
+"""
+Тесты для справочника в базе dbm
+"""
+
+import pytest
+from model import Contact
+from dbm_storage import DBMPhoneBook, DBMContactStore, encode_contact, decode_contact, open_database
+from exceptions import ContactNotFoundError
+
+
+@pytest.fixture
+def dbm_file(temp_file):
+    """Возвращает путь к базе dbm (файлы удаляются вместе с temp_file)"""
+    return temp_file + '.dbm'
+
+
+@pytest.fixture
+def dbm_phonebook(dbm_file, sample_contacts):
+    """Создает справочник dbm с контактами"""
+    phonebook = DBMPhoneBook(filename=dbm_file)
+    for contact in sample_contacts:
+        phonebook.add_contact(contact)
+    phonebook.save_to_file()
+    yield phonebook
+    phonebook.close()
+
+
+class TestEncoding:
+    """Тесты кодирования записей"""
+    
+    @pytest.mark.parametrize("name,phone,comment", [
+        ("Иван", "123", ""),
+        ("😀 Эмодзи", "+7 (999) 123-45-67", "Комментарий\nс переводом строки"),
+    ])
+    def test_roundtrip(self, name, phone, comment):
+        """Тест что контакт восстанавливается без потерь"""
+        contact = Contact(name=name, phone=phone, comment=comment, contact_id=7)
+        assert decode_contact(7, encode_contact(contact)) == contact
+
+
+class TestDBMPhoneBook:
+    """Тесты справочника dbm"""
+    
+    def test_access_without_load(self, dbm_phonebook, dbm_file):
+        """Тест что контакты доступны сразу после открытия, без load_from_file"""
+        dbm_phonebook.close()
+        phonebook = DBMPhoneBook(filename=dbm_file)
+        try:
+            assert phonebook.count == 3
+            assert phonebook.next_id == 4
+            assert phonebook.get_contact(2).name == "Мария Петрова"
+            assert phonebook.find_by_id(5) is None
+            assert [c.id for c in phonebook.find_by_phone("8 (800) 555-35-35")] == [3]
+        finally:
+            phonebook.close()
+    
+    def test_crud(self, dbm_phonebook):
+        """Тест добавления, изменения и удаления"""
+        dbm_phonebook.add_contact(Contact(name="Анна", phone="123"))
+        dbm_phonebook.update_contact(4, phone="456", comment="Соседка")
+        assert dbm_phonebook.get_contact(4).comment == "Соседка"
+        assert dbm_phonebook.find_by_phone("123") == []
+        assert [c.id for c in dbm_phonebook.find_by_phone("456")] == [4]
+        
+        dbm_phonebook.delete_contact(4)
+        with pytest.raises(ContactNotFoundError):
+            dbm_phonebook.get_contact(4)
+        assert dbm_phonebook.find_by_phone("456") == []
+        assert dbm_phonebook.count == 3
+    
+    def test_shared_phone(self, dbm_phonebook):
+        """Тест что индекс телефонов хранит несколько ID"""
+        dbm_phonebook.add_contact(Contact(name="Иван-2", phone="+79991234567"))
+        assert [c.id for c in dbm_phonebook.find_by_phone("89991234567")] == []
+        assert [c.id for c in dbm_phonebook.find_by_phone("79991234567")] == [1, 4]
+    
+    def test_search_streams(self, dbm_phonebook):
+        """Тест поиска подстроки просмотром базы"""
+        assert [c.id for c in dbm_phonebook.search("петр")] == [2, 3]
+        assert [c.id for c in dbm_phonebook.search("999", 'phone')] == [1, 2]
+    
+    def test_next_id_survives_delete(self, dbm_phonebook, dbm_file):
+        """Тест что ID удаленного последнего контакта не используется повторно"""
+        dbm_phonebook.delete_contact(3)
+        dbm_phonebook.close()
+        phonebook = DBMPhoneBook(filename=dbm_file)
+        try:
+            assert phonebook.add_contact(Contact(name="Новый", phone="1")).id == 4
+        finally:
+            phonebook.close()
+    
+    def test_save_to_new_file(self, dbm_phonebook, dbm_file):
+        """Тест сохранения в другой файл"""
+        dbm_phonebook.filename = dbm_file + '.copy'
+        assert dbm_phonebook.save_to_file() is True
+        dbm_phonebook.close()
+        phonebook = DBMPhoneBook(filename=dbm_file + '.copy')
+        try:
+            assert [c.id for c in phonebook.contacts] == [1, 2, 3]
+            assert [c.id for c in phonebook.find_by_phone("+7 999 234 56 78")] == [2]
+        finally:
+            phonebook.close()
+    
+    def test_duplicate_id_keeps_first(self, dbm_file):
+        """Тест что при дублирующихся ID сохраняется первый контакт"""
+        store = DBMContactStore(open_database(dbm_file))
+        try:
+            store.load([Contact("А", "1", contact_id=1), Contact("Б", "2", contact_id=1)])
+            assert len(store) == 1
+            assert store.get(1).name == "А"
+        finally:
+            store.close()
@@ -0,0 +1,107 @@
+"""
+Тесты для потокового экспорта контактов
+"""
+
+import pytest
+import io
+import json
+import os
+from model import Contact, PhoneBook
+from exporters import export_contacts, export_to_file, search_predicate, write_chunks
+from importers import import_contacts
+from exceptions import FileOperationError
+
+
+class TestExportFormats:
+    """Тесты кодирования контактов в форматы экспорта"""
+    
+    def test_csv(self, sample_contacts):
+        """Тест экспорта CSV с заголовком и экранированием"""
+        sample_contacts[0].comment = 'Друг, "лучший"'
+        output = io.StringIO()
+        assert export_contacts(sample_contacts, output, 'csv') == 3
+        lines = output.getvalue().splitlines()
+        assert lines[0] == "id,name,phone,comment"
+        assert lines[1] == '1,Иван Иванов,+7 (999) 123-45-67,"Друг, ""лучший"""'
+        assert len(lines) == 4
+    
+    def test_ndjson(self, sample_contacts):
+        """Тест экспорта NDJSON"""
+        output = io.StringIO()
+        export_contacts(sample_contacts, output, 'ndjson')
+        records = [json.loads(line) for line in output.getvalue().splitlines()]
+        assert records == [contact.to_dict() for contact in sample_contacts]
+    
+    def test_vcard_folds_long_lines(self):
+        """Тест что длинные строки vCard переносятся"""
+        contact = Contact(name="Иван", phone="1", comment="очень длинный комментарий " * 10, contact_id=1)
+        output = io.StringIO()
+        export_contacts([contact], output, 'vcard')
+        lines = output.getvalue().split('\r\n')
+        assert lines[0] == "BEGIN:VCARD"
+        assert all(len(line) <= 75 for line in lines)
+        assert any(line.startswith(' ') for line in lines)
+    
+    def test_predicate(self, sample_contacts):
+        """Тест отбора контактов условием поиска"""
+        output = io.StringIO()
+        assert export_contacts(sample_contacts, output, 'ndjson', search_predicate("999", 'phone')) == 2
+    
+    def test_unknown_format(self, sample_contacts):
+        """Тест что неизвестный формат вызывает ошибку"""
+        with pytest.raises(FileOperationError):
+            export_contacts(sample_contacts, io.StringIO(), 'xml')
+
+
+class TestWriteChunks:
+    """Тесты записи частями"""
+    
+    def test_chunks(self):
+        """Тест что строки объединяются в части не меньше заданного размера"""
+        writes = []
+        
+        class Recorder:
+            def write(self, data):
+                writes.append(data)
+        
+        total = write_chunks(("x" * 3 for _ in range(10)), Recorder(), chunk_size=10)
+        assert total == 30
+        assert writes == ["x" * 12, "x" * 12, "x" * 6]
+
+
+class TestExportToFile:
+    """Тесты экспорта справочника в файл"""
+    
+    @pytest.mark.parametrize("extension", ['.csv', '.ndjson', '.vcf'])
+    def test_roundtrip_with_importer(self, phonebook_with_contacts, temp_file, extension):
+        """Тест что экспортированный файл импортируется обратно без потерь"""
+        phonebook_with_contacts.update_contact(1, comment="Друг; сосед, \\ коллега\nвторая строка")
+        path = temp_file + extension
+        assert export_to_file(phonebook_with_contacts, path) == 3
+        
+        imported = PhoneBook(filename=temp_file)
+        report = import_contacts(imported, path)
+        assert report.error_count == 0
+        assert imported.contacts == phonebook_with_contacts.contacts
+    
+    def test_ndjson_export_over_book_drops_index(self, phonebook_with_contacts, temp_file):
+        """Тест что экспорт поверх справочника NDJSON удаляет его индекс смещений"""
+        path = temp_file + '.ndjson'
+        phonebook_with_contacts.filename = path
+        phonebook_with_contacts.save_to_file()
+        assert os.path.exists(path + '.idx')
+        
+        other = PhoneBook(filename=temp_file)
+        other.add_contacts(Contact(name=f"Другой {i}", phone=str(i)) for i in range(6))
+        assert export_to_file(other, path) == 6
+        assert not os.path.exists(path + '.idx')
+        
+        loaded = PhoneBook(filename=path)
+        assert loaded.load_from_file() is True
+        assert [c.name for c in loaded.contacts] == [f"Другой {i}" for i in range(6)]
+        assert loaded.load_report.skipped == 0
+    
+    def test_unknown_extension(self, phonebook_with_contacts, temp_file):
+        """Тест что неизвестное расширение вызывает ошибку"""
+        with pytest.raises(FileOperationError):
+            export_to_file(phonebook_with_contacts, temp_file + '.xml')
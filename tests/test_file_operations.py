@@ -3,9 +3,11 @@
 """
 
 import pytest
+import io
 import os
 import json
-from model import PhoneBook, Contact, FileHandler
+from model import PhoneBook, Contact, FileHandler, _JSONStreamReader
+from view import View
 from exceptions import FileCorruptedError, FileOperationError
 
 
@@ -163,3 +165,170 @@ class TestFileOperations:
         assert phonebook.count == 1
         assert phonebook.contacts[0].name == "Иван"
 
+
+class _CountingReader(io.StringIO):
+    """Строковый файл, считающий вызовы read"""
+    
+    reads = 0
+    
+    def read(self, size=-1):
+        self.reads += 1
+        return super().read(size)
+
+
+class TestStreamingLoad:
+    """Тесты для потокового чтения контактов из JSON"""
+    
+    @pytest.mark.parametrize("chunk_size", [1, 2, 3, 7, 64, 65536])
+    def test_iter_contacts_matches_json_load(self, temp_file, chunk_size):
+        """Тест что потоковое чтение дает те же словари, что и json.load"""
+        data = {
+            "version": [1, {"nested": "]}{["}],
+            "contacts": [
+                {"id": 1, "name": "Иван \"Ваня\"", "phone": "+7 (999) 123-45-67", "comment": "😀"},
+                {"id": 22, "name": "Мария", "phone": "222", "comment": "a\\nb"},
+                {"id": 333, "name": "Петр", "phone": "333", "score": 12.5e3},
+            ],
+            "last_updated": "2024-01-01T12:00:00"
+        }
+        with open(temp_file, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+        
+        contacts = list(FileHandler.iter_contacts(temp_file, chunk_size=chunk_size))
+        assert contacts == data["contacts"]
+    
+    def test_iter_contacts_number_at_chunk_boundary(self, temp_file):
+        """Тест что число на границе части файла не обрезается"""
+        with open(temp_file, 'w', encoding='utf-8') as f:
+            f.write('{"contacts": [12345, 678]}')
+        assert list(FileHandler.iter_contacts(temp_file, chunk_size=17)) == [12345, 678]
+    
+    @pytest.mark.parametrize("number", ['1.5e10', '-0.25', '3E-7', '12.0', '6.02e+23', '-1'])
+    def test_iter_contacts_float_at_chunk_boundary(self, temp_file, number):
+        """Тест что дробное число и экспонента на границе части файла не обрезаются"""
+        content = f'{{"v": {number}, "contacts": [{number}, {{"x": [{number}]}}, {number}]}}'
+        with open(temp_file, 'w', encoding='utf-8') as f:
+            f.write(content)
+        expected = json.loads(content)["contacts"]
+        for chunk_size in range(1, len(content) + 1):
+            assert list(FileHandler.iter_contacts(temp_file, chunk_size=chunk_size)) == expected
+    
+    @pytest.mark.parametrize("content,expected", [
+        ('{}', []),
+        ('{"contacts": []}', []),
+        (' \n{ "last_updated" : "x" } \n', []),
+    ])
+    def test_iter_contacts_empty(self, temp_file, content, expected):
+        """Тест документов без контактов"""
+        with open(temp_file, 'w', encoding='utf-8') as f:
+            f.write(content)
+        assert list(FileHandler.iter_contacts(temp_file, chunk_size=4)) == expected
+    
+    def test_iter_contacts_nonexistent_file(self, temp_file):
+        """Тест что несуществующий файл не дает контактов"""
+        os.remove(temp_file)
+        assert list(FileHandler.iter_contacts(temp_file)) == []
+    
+    @pytest.mark.parametrize("content", [
+        '{"contacts": [{"id": 1, "name": "Тест", "phone": "1"}',
+        '{"contacts": [{"id": 1}} ]}',
+        '{"contacts": [] } лишнее',
+        '[]',
+        '',
+        '{невалидный}',
+    ])
+    def test_iter_contacts_corrupted(self, temp_file, content):
+        """Тест что поврежденный JSON вызывает FileCorruptedError"""
+        with open(temp_file, 'w', encoding='utf-8') as f:
+            f.write(content)
+        with pytest.raises(FileCorruptedError):
+            list(FileHandler.iter_contacts(temp_file, chunk_size=5))
+    
+    def test_corrupted_record_does_not_read_rest_of_file(self):
+        """Тест что ошибка в середине буфера не дочитывает файл: это не обрыв значения"""
+        source = _CountingReader('{"contacts": [{"id": 1,, "name": "Тест"}, ' + '{"id": 2}, ' * 10000 + ']}')
+        reader = _JSONStreamReader(source, 64)
+        reader.expect('{')
+        reader.value()
+        reader.expect(':')
+        reader.expect('[')
+        with pytest.raises(json.JSONDecodeError):
+            reader.value()
+        assert source.reads == 1
+    
+    def test_long_value_read_with_growing_chunks(self):
+        """Тест что длинное значение дочитывается частями растущего размера"""
+        comment = "x" * 100000
+        source = _CountingReader(json.dumps({"comment": comment}))
+        reader = _JSONStreamReader(source, 16)
+        assert reader.value() == {"comment": comment}
+        assert source.reads < 20
+    
+    def test_corrupted_file_keeps_loaded_contacts(self, sample_json_data):
+        """Тест что ошибка в середине файла не портит уже загруженный справочник"""
+        phonebook = PhoneBook(filename=sample_json_data)
+        phonebook.load_from_file()
+        
+        with open(sample_json_data, 'w', encoding='utf-8') as f:
+            f.write('{"contacts": [{"id": 7, "name": "Новый", "phone": "7"}, ')
+        
+        assert phonebook.load_from_file() is False
+        assert [c.id for c in phonebook.contacts] == [1, 2]
+
+
+class TestLoadReport:
+    """Тесты отчета о загрузке вместо вывода каждой ошибки"""
+    
+    @pytest.fixture
+    def dirty_file(self, temp_file):
+        """Создает файл с корректными и некорректными контактами"""
+        contacts = [{"id": 1, "name": "Тест", "phone": "1"}]
+        contacts += [{"id": i, "name": "", "phone": "1"} for i in range(2, 32)]
+        contacts += [{"id": 40, "phone": "1"}, "не объект", {"id": 41, "name": "Тест2", "phone": " "}]
+        with open(temp_file, 'w', encoding='utf-8') as f:
+            json.dump({"contacts": contacts}, f, ensure_ascii=False)
+        return temp_file
+    
+    def test_report_counts_and_examples(self, dirty_file, capsys):
+        """Тест что ошибки собираются в отчет без вывода на экран"""
+        phonebook = PhoneBook(filename=dirty_file)
+        assert phonebook.load_from_file() is True
+        assert capsys.readouterr().out == ""
+        
+        report = phonebook.load_report
+        assert report.loaded == 1
+        assert report.skipped == 33
+        assert report.counts == {
+            "Имя контакта не может быть пустым": 30,
+            "Контакт должен содержать поля 'name' и 'phone'": 1,
+            "Запись контакта должна быть объектом JSON": 1,
+            "Телефон контакта не может быть пустым": 1,
+        }
+        assert len(report.examples) == report.MAX_EXAMPLES
+        assert report.examples[0] == (2, "Имя контакта не может быть пустым")
+    
+    def test_report_reset_on_next_load(self, dirty_file, sample_json_data):
+        """Тест что отчет относится к последней загрузке"""
+        phonebook = PhoneBook(filename=dirty_file)
+        phonebook.load_from_file()
+        phonebook.filename = sample_json_data
+        phonebook.load_from_file()
+        assert phonebook.load_report.skipped == 0
+        assert phonebook.load_report.loaded == 2
+    
+    def test_view_renders_summary(self, dirty_file, capsys):
+        """Тест что View показывает сводку по отчету"""
+        phonebook = PhoneBook(filename=dirty_file)
+        phonebook.load_from_file()
+        View.show_load_report(phonebook.load_report)
+        output = capsys.readouterr().out
+        assert "Пропущено некорректных записей: 33" in output
+        assert "Имя контакта не может быть пустым: 30" in output
+        assert "и еще 23" in output
+    
+    def test_view_silent_for_clean_load(self, sample_json_data, capsys):
+        """Тест что для чистой загрузки сводка не выводится"""
+        phonebook = PhoneBook(filename=sample_json_data)
+        phonebook.load_from_file()
+        View.show_load_report(phonebook.load_report)
+        assert capsys.readouterr().out == ""
@@ -0,0 +1,130 @@
+"""
+Тесты для пакетного добавления и импорта контактов
+"""
+
+import pytest
+from model import Contact, PhoneBook
+from importers import ImportReport, import_contacts, detect_format
+from exceptions import FileOperationError
+
+
+@pytest.fixture
+def import_file(temp_file):
+    """Создает файл для импорта с заданным расширением и содержимым"""
+    paths = []
+    
+    def create(extension: str, content: str) -> str:
+        path = temp_file + extension
+        with open(path, 'w', encoding='utf-8', newline='') as f:
+            f.write(content)
+        paths.append(path)
+        return path
+    
+    return create
+
+
+class TestAddContacts:
+    """Тесты пакетного добавления контактов"""
+    
+    def test_ids_allocated_in_one_range(self, phonebook_with_contacts):
+        """Тест что ID выделяются подряд после существующих"""
+        added = phonebook_with_contacts.add_contacts(
+            Contact(name=f"Новый {i}", phone=str(i)) for i in range(3)
+        )
+        assert [c.id for c in added] == [4, 5, 6]
+        assert phonebook_with_contacts.next_id == 7
+        assert phonebook_with_contacts.count == 6
+        assert phonebook_with_contacts.has_unsaved_changes()
+    
+    def test_empty_batch(self, empty_phonebook):
+        """Тест что пустой пакет ничего не меняет"""
+        assert empty_phonebook.add_contacts([]) == []
+        assert not empty_phonebook.has_unsaved_changes()
+    
+    @pytest.mark.parametrize("batch_size", [1, 10])
+    def test_indexes_updated(self, temp_file, sample_contacts, batch_size):
+        """Тест что индексы учитывают добавленные пакетом контакты (добавлением и перестройкой)"""
+        phonebook = PhoneBook(filename=temp_file, search_index=True)
+        phonebook.add_contacts(sample_contacts)
+        phonebook.find_by_phone("1")
+        phonebook.add_contacts(Contact(name=f"Анна {i}", phone="+1 555") for i in range(batch_size))
+        assert len(phonebook.search("анна")) == batch_size
+        assert len(phonebook.find_by_phone("1555")) == batch_size
+        assert [c.id for c in phonebook.complete("анна", limit=1)] == [4]
+    
+    def test_journal_records(self, temp_file, sample_contacts):
+        """Тест что пакет попадает в журнал изменений"""
+        phonebook = PhoneBook(filename=temp_file, journal=True)
+        phonebook.load_from_file()
+        phonebook.save_to_file()
+        phonebook.add_contacts(sample_contacts)
+        phonebook.save_to_file()
+        
+        reloaded = PhoneBook(filename=temp_file, journal=True)
+        reloaded.load_from_file()
+        assert [c.id for c in reloaded.contacts] == [1, 2, 3]
+
+
+class TestImporters:
+    """Тесты импорта из CSV, vCard и NDJSON"""
+    
+    def test_csv(self, empty_phonebook, import_file):
+        """Тест импорта CSV с заголовком и BOM"""
+        path = import_file('.csv', '﻿Name,Phone,Comment\n'
+                                   'Иван,+7 999 123-45-67,"Друг, сосед"\n'
+                                   ',123,\n'
+                                   'Петр,abc,\n'
+                                   'Мария,555\n')
+        report = import_contacts(empty_phonebook, path)
+        assert report.imported == 2
+        assert [number for number, _ in report.errors] == [2, 3]
+        assert [(c.id, c.name, c.comment) for c in empty_phonebook.contacts] == [
+            (1, "Иван", "Друг, сосед"), (2, "Мария", ""),
+        ]
+    
+    def test_vcard(self, empty_phonebook, import_file):
+        """Тест импорта vCard с продолженными строками и экранированием"""
+        path = import_file('.vcf', 'BEGIN:VCARD\r\nVERSION:3.0\r\nFN:Иван\r\n  Иванов\r\n'
+                                   'TEL;TYPE=CELL:+7 999 123-45-67\r\nTEL:8 800\r\n'
+                                   'NOTE:Друг\\, сосед\\nвторая строка\r\nEND:VCARD\r\n'
+                                   'BEGIN:VCARD\r\nN:Петрова;Мария;;;\r\nTEL:555\r\nEND:VCARD\r\n'
+                                   'BEGIN:VCARD\r\nFN:Без телефона\r\nEND:VCARD\r\n')
+        report = import_contacts(empty_phonebook, path)
+        assert report.imported == 2
+        assert report.error_count == 1
+        first, second = empty_phonebook.contacts
+        assert (first.name, first.phone, first.comment) == ("Иван Иванов", "+7 999 123-45-67",
+                                                             "Друг, сосед\nвторая строка")
+        assert second.name == "Мария Петрова"
+    
+    def test_ndjson(self, empty_phonebook, import_file):
+        """Тест импорта NDJSON: ID из файла не используются, ошибки не прерывают импорт"""
+        path = import_file('.ndjson', '{"id": 50, "name": "Иван", "phone": "1"}\n'
+                                      '{"name": "Битый\n'
+                                      '[1, 2]\n'
+                                      '{"name": "Петр", "phone": 5}\n'
+                                      '\n'
+                                      '{"name": "Мария", "phone": "2", "comment": "Коллега"}\n')
+        report = import_contacts(empty_phonebook, path)
+        assert report.imported == 2
+        assert [number for number, _ in report.errors] == [2, 3, 4]
+        assert [c.id for c in empty_phonebook.contacts] == [1, 2]
+    
+    def test_report_is_compact(self, empty_phonebook, import_file):
+        """Тест что отчет хранит ограниченное число ошибок"""
+        path = import_file('.csv', 'name,phone\n' + ',1\n' * 50)
+        report = import_contacts(empty_phonebook, path)
+        assert report.error_count == 50
+        assert len(report.errors) == ImportReport.MAX_REPORTED_ERRORS
+        assert "и еще 30" in str(report)
+    
+    def test_unknown_format(self, empty_phonebook, temp_file):
+        """Тест что неизвестное расширение вызывает ошибку"""
+        with pytest.raises(FileOperationError):
+            import_contacts(empty_phonebook, temp_file + '.xlsx')
+        assert detect_format("CONTACTS.VCF") == 'vcard'
+    
+    def test_missing_file(self, empty_phonebook, temp_file):
+        """Тест что отсутствующий файл вызывает FileOperationError"""
+        with pytest.raises(FileOperationError):
+            import_contacts(empty_phonebook, temp_file + '.missing.csv')
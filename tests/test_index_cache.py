@@ -0,0 +1,125 @@
+"""
+Тесты для кеша вторичных индексов
+"""
+
+import pytest
+import os
+import json
+from model import Contact, PhoneBook
+from indexes import NGramIndex, PhoneIndex, PhoneTrie, NameRadixTree
+from index_cache import cache_path, load_index_cache, save_index_cache
+import index_cache
+
+
+@pytest.fixture
+def saved_phonebook(temp_file, sample_contacts):
+    """Создает сохраненный справочник с кешем индексов"""
+    phonebook = PhoneBook(filename=temp_file, search_index=True, index_cache=True)
+    for contact in sample_contacts:
+        phonebook.add_contact(contact)
+    phonebook.find_by_phone("8-800-555-35-35")
+    phonebook.complete("ив")
+    phonebook.save_to_file()
+    return phonebook
+
+
+class TestIndexState:
+    """Тесты сохранения и восстановления состояния индексов"""
+    
+    @pytest.mark.parametrize("factory", [
+        NGramIndex, PhoneIndex, PhoneTrie, lambda: PhoneTrie(reverse=True), lambda: NameRadixTree(top_k=2),
+    ])
+    def test_roundtrip(self, factory, sample_contacts, temp_file):
+        """Тест что восстановленный индекс отвечает так же, как исходный"""
+        index = factory()
+        index.build(sample_contacts)
+        assert save_index_cache(temp_file, [temp_file], {'index': index}) is True
+        restored = load_index_cache(temp_file, [temp_file])['index']
+        assert type(restored) is type(index)
+        assert restored.get_state() == index.get_state()
+    
+    def test_restored_radix_tree_supports_updates(self, sample_contacts):
+        """Тест что восстановленное дерево продолжает обновляться"""
+        tree = NameRadixTree()
+        tree.build(sample_contacts)
+        restored = NameRadixTree.from_state(tree.get_state())
+        restored.remove(sample_contacts[0])
+        restored.add(Contact(name="Ивонна", phone="1", contact_id=7))
+        assert restored.lookup("ив", 10) == [7]
+
+
+class TestPhoneBookIndexCache:
+    """Тесты использования кеша при загрузке справочника"""
+    
+    def test_cache_written_on_save(self, saved_phonebook):
+        """Тест что кеш записывается рядом с файлом справочника"""
+        path = cache_path(saved_phonebook.filename)
+        assert os.path.exists(path)
+        assert not os.path.exists(path + '.tmp')
+    
+    def test_fresh_cache_skips_rebuild(self, saved_phonebook, monkeypatch):
+        """Тест что при актуальном кеше индексы не строятся"""
+        def fail_build(self, contacts):
+            raise AssertionError("Индекс не должен строиться")
+        for cls in (NGramIndex, PhoneIndex, NameRadixTree):
+            monkeypatch.setattr(cls, 'build', fail_build)
+        
+        phonebook = PhoneBook(filename=saved_phonebook.filename, search_index=True, index_cache=True)
+        phonebook.load_from_file()
+        assert [c.id for c in phonebook.search("петров")] == [2]
+        assert [c.id for c in phonebook.find_by_phone("88005553535")] == [3]
+        assert [c.id for c in phonebook.complete("пет")] == [2, 3]
+    
+    def test_stale_cache_rebuilt(self, saved_phonebook):
+        """Тест что после изменения файла кеш перестраивается"""
+        with open(saved_phonebook.filename, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        data['contacts'][0]['name'] = "Олег Петров"
+        with open(saved_phonebook.filename, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False)
+        
+        phonebook = PhoneBook(filename=saved_phonebook.filename, search_index=True, index_cache=True)
+        phonebook.load_from_file()
+        assert [c.id for c in phonebook.search("олег")] == [1]
+        assert [c.id for c in phonebook.complete("олег")] == [1]
+    
+    def test_save_does_not_hash_files(self, saved_phonebook, monkeypatch):
+        """Тест что сохранение не читает файлы справочника целиком ради хеша"""
+        monkeypatch.setattr(index_cache, 'file_hash', lambda name: pytest.fail("Хеш при сохранении"))
+        saved_phonebook.add_contact(Contact(name="Новый", phone="1"))
+        assert saved_phonebook.save_to_file() is True
+        assert os.path.exists(cache_path(saved_phonebook.filename))
+    
+    def test_touched_file_validated_by_hash(self, saved_phonebook, monkeypatch):
+        """Тест что при смене только времени изменения кеш проверяется по хешу содержимого"""
+        # Первая загрузка дописывает хеш в кеш
+        PhoneBook(filename=saved_phonebook.filename, search_index=True, index_cache=True).load_from_file()
+        os.utime(saved_phonebook.filename, ns=(0, 0))
+        calls = []
+        original_hash = index_cache.file_hash
+        monkeypatch.setattr(index_cache, 'file_hash', lambda name: calls.append(name) or original_hash(name))
+        
+        phonebook = PhoneBook(filename=saved_phonebook.filename, search_index=True, index_cache=True)
+        phonebook.load_from_file()
+        assert calls == [saved_phonebook.filename]
+        assert [c.id for c in phonebook.search("сидоров")] == [3]
+    
+    def test_touched_file_without_hash_rebuilt(self, saved_phonebook):
+        """Тест что без записанного хеша смена времени изменения делает кеш устаревшим"""
+        os.utime(saved_phonebook.filename, ns=(0, 0))
+        assert load_index_cache(saved_phonebook.filename, [saved_phonebook.filename]) is None
+    
+    @pytest.mark.parametrize("content", [b"", b"not json\n", b'{"version": 999}\n', b'{"version": 1}\n'])
+    def test_corrupted_cache_ignored(self, saved_phonebook, content):
+        """Тест что поврежденный кеш игнорируется и перезаписывается"""
+        with open(cache_path(saved_phonebook.filename), 'wb') as f:
+            f.write(content)
+        phonebook = PhoneBook(filename=saved_phonebook.filename, search_index=True, index_cache=True)
+        phonebook.load_from_file()
+        assert [c.id for c in phonebook.search("иванов")] == [1]
+        assert load_index_cache(saved_phonebook.filename, [saved_phonebook.filename]) is not None
+    
+    def test_cache_disabled_by_default(self, phonebook_with_contacts):
+        """Тест что без параметра index_cache кеш не пишется"""
+        phonebook_with_contacts.save_to_file()
+        assert not os.path.exists(cache_path(phonebook_with_contacts.filename))
@@ -0,0 +1,316 @@
+"""
+Тесты для индексов поиска
+"""
+
+import pytest
+from model import Contact, PhoneBook
+from indexes import NGramIndex, NameRadixTree, PhoneIndex, PhoneTrie
+
+
+@pytest.fixture
+def indexed_phonebook(temp_file, sample_contacts):
+    """Создает справочник с индексом триграмм"""
+    phonebook = PhoneBook(filename=temp_file, search_index=True)
+    for contact in sample_contacts:
+        phonebook.add_contact(contact)
+    return phonebook
+
+
+class TestNGramIndex:
+    """Тесты для класса NGramIndex"""
+    
+    def test_invalid_n_raises_error(self):
+        """Тест что длина n-граммы должна быть положительной"""
+        with pytest.raises(ValueError):
+            NGramIndex(n=0)
+    
+    def test_candidates_short_term_returns_none(self, sample_contacts):
+        """Тест что для короткого запроса индекс не применяется"""
+        index = NGramIndex()
+        index.build(sample_contacts)
+        assert index.candidates("ив", "name") is None
+    
+    def test_candidates_by_field(self, sample_contacts):
+        """Тест поиска кандидатов по полю"""
+        index = NGramIndex()
+        index.build(sample_contacts)
+        assert index.candidates("иван", "name") == {1}
+        assert index.candidates("999", "phone") == {1, 2}
+        assert index.candidates("иван", "comment") == set()
+    
+    def test_candidates_all_fields(self, sample_contacts):
+        """Тест поиска кандидатов по всем полям"""
+        index = NGramIndex()
+        index.build(sample_contacts)
+        assert index.candidates("лег", None) == {2}
+        assert index.candidates("иван", None) == {1}
+    
+    def test_candidates_unknown_field(self, sample_contacts):
+        """Тест что неизвестное поле не дает кандидатов"""
+        index = NGramIndex()
+        index.build(sample_contacts)
+        assert index.candidates("иван", "email") == set()
+    
+    def test_remove_contact(self, sample_contacts):
+        """Тест удаления контакта из индекса"""
+        index = NGramIndex()
+        index.build(sample_contacts)
+        index.remove(sample_contacts[0])
+        assert index.candidates("иван", "name") == set()
+        assert index.candidates("999", "phone") == {2}
+
+
+class TestPhoneBookSearchIndex:
+    """Тесты поиска в справочнике с индексом триграмм"""
+    
+    @pytest.mark.parametrize("search_term,field", [
+        ("Иван", "name"),
+        ("иван", "name"),
+        ("ИВАН", None),
+        ("123-45", "phone"),
+        ("999", "phone"),
+        ("Друг", "comment"),
+        ("ег", None),
+        ("", "name"),
+        ("Несуществующий", None),
+        ("иван", "email"),
+    ])
+    def test_results_match_full_scan(self, indexed_phonebook, phonebook_with_contacts, search_term, field):
+        """Тест что результаты с индексом совпадают с полным перебором"""
+        expected = [c.id for c in phonebook_with_contacts.search(search_term, field)]
+        actual = [c.id for c in indexed_phonebook.search(search_term, field)]
+        assert actual == expected
+    
+    def test_index_updated_on_add(self, indexed_phonebook):
+        """Тест что индекс обновляется при добавлении"""
+        indexed_phonebook.add_contact(Contact(name="Иваненко", phone="555"))
+        results = indexed_phonebook.search("иван", "name")
+        assert [c.id for c in results] == [1, 4]
+    
+    def test_index_updated_on_update(self, indexed_phonebook):
+        """Тест что индекс обновляется при изменении контакта"""
+        indexed_phonebook.update_contact(1, name="Олег Олегов")
+        assert indexed_phonebook.search("иван", "name") == []
+        assert [c.id for c in indexed_phonebook.search("олег", "name")] == [1]
+    
+    def test_index_consistent_after_failed_update(self, indexed_phonebook):
+        """Тест что индекс согласован после ошибки валидации при изменении"""
+        with pytest.raises(Exception):
+            indexed_phonebook.update_contact(1, name="Олег", phone="")
+        assert [c.id for c in indexed_phonebook.search("олег", "name")] == [1]
+    
+    def test_index_updated_on_delete(self, indexed_phonebook):
+        """Тест что индекс обновляется при удалении"""
+        indexed_phonebook.delete_contact(1)
+        assert indexed_phonebook.search("иван", "name") == []
+    
+    def test_index_built_on_load(self, sample_json_data):
+        """Тест что индекс строится при загрузке файла"""
+        phonebook = PhoneBook(filename=sample_json_data, search_index=True)
+        phonebook.load_from_file()
+        assert [c.id for c in phonebook.search("ком2")] == [2]
+        assert [c.id for c in phonebook.search("тест")] == [1, 2]
+
+
+class TestPhoneIndex:
+    """Тесты для канонической формы телефона и индекса телефонов"""
+    
+    @pytest.mark.parametrize("phone,expected", [
+        ("+7 (999) 123-45-67", "79991234567"),
+        ("8-800-555-35-35", "88005553535"),
+        ("79991234567", "79991234567"),
+        ("123", "123"),
+        ("+7 ABC", None),
+        ("+-()", None),
+    ])
+    def test_normalize_phone(self, phone, expected):
+        """Тест приведения телефона к канонической форме"""
+        assert Contact.normalize_phone(phone) == expected
+    
+    def test_contact_canonical_phone(self):
+        """Тест что каноническая форма вычисляется при создании и в сеттере"""
+        contact = Contact(name="Тест", phone="+7 (999) 123-45-67")
+        assert contact.canonical_phone == "79991234567"
+        contact.phone = "8 (800) 555-35-35"
+        assert contact.canonical_phone == "88005553535"
+    
+    def test_lookup(self, sample_contacts):
+        """Тест поиска ID по канонической форме"""
+        index = PhoneIndex()
+        index.build(sample_contacts)
+        assert index.lookup("79991234567") == [1]
+        assert index.lookup("000") == []
+        index.remove(sample_contacts[0])
+        assert index.lookup("79991234567") == []
+    
+    def test_find_by_phone(self, phonebook_with_contacts):
+        """Тест поиска контакта по телефону в любом формате"""
+        results = phonebook_with_contacts.find_by_phone("79991234567")
+        assert [c.id for c in results] == [1]
+        results = phonebook_with_contacts.find_by_phone("+7 999 123 45 67")
+        assert [c.id for c in results] == [1]
+    
+    def test_find_by_phone_not_found(self, phonebook_with_contacts):
+        """Тест поиска несуществующего или некорректного телефона"""
+        assert phonebook_with_contacts.find_by_phone("000") == []
+        assert phonebook_with_contacts.find_by_phone("абв") == []
+    
+    def test_find_by_phone_duplicates(self, phonebook_with_contacts):
+        """Тест что находятся все контакты с одинаковым номером"""
+        phonebook_with_contacts.add_contact(Contact(name="Дубль", phone="8 800 555 35 35"))
+        results = phonebook_with_contacts.find_by_phone("88005553535")
+        assert [c.id for c in results] == [3, 4]
+    
+    def test_find_by_phone_after_update_and_delete(self, phonebook_with_contacts):
+        """Тест что индекс телефонов поддерживается при изменениях"""
+        phonebook_with_contacts.update_contact(1, phone="+7 (111) 222-33-44")
+        assert phonebook_with_contacts.find_by_phone("79991234567") == []
+        assert [c.id for c in phonebook_with_contacts.find_by_phone("71112223344")] == [1]
+        phonebook_with_contacts.delete_contact(1)
+        assert phonebook_with_contacts.find_by_phone("71112223344") == []
+    
+    def test_find_by_phone_after_load(self, sample_json_data):
+        """Тест что индекс телефонов строится при загрузке"""
+        phonebook = PhoneBook(filename=sample_json_data)
+        phonebook.load_from_file()
+        assert [c.id for c in phonebook.find_by_phone("222")] == [2]
+
+
+class TestPhoneTrie:
+    """Тесты для префиксного дерева телефонов"""
+    
+    def test_prefix_lookup(self, sample_contacts):
+        """Тест поиска по началу номера"""
+        trie = PhoneTrie()
+        trie.build(sample_contacts)
+        assert sorted(trie.lookup("7999")) == [1, 2]
+        assert trie.lookup("8800") == [3]
+        assert trie.lookup("5") == []
+    
+    def test_suffix_lookup(self, sample_contacts):
+        """Тест поиска по окончанию номера"""
+        trie = PhoneTrie(reverse=True)
+        trie.build(sample_contacts)
+        assert trie.lookup("4567") == [1]
+        assert trie.lookup("3535") == [3]
+        assert trie.lookup("9") == []
+    
+    def test_remove_prunes_nodes(self, sample_contacts):
+        """Тест что удаление убирает пустые узлы"""
+        trie = PhoneTrie()
+        trie.add(sample_contacts[2])
+        trie.remove(sample_contacts[2])
+        assert trie.lookup("") == []
+        assert trie._root == {}
+    
+    def test_search_phone_prefix(self, phonebook_with_contacts):
+        """Тест поиска по началу номера в справочнике"""
+        results = phonebook_with_contacts.search_phone_prefix("+7 999")
+        assert [c.id for c in results] == [1, 2]
+        assert phonebook_with_contacts.search_phone_prefix("абв") == []
+    
+    def test_search_phone_suffix(self, phonebook_with_contacts):
+        """Тест поиска по последним цифрам номера в справочнике"""
+        results = phonebook_with_contacts.search_phone_suffix("123-45-67")
+        assert [c.id for c in results] == [1]
+        assert phonebook_with_contacts.search_phone_suffix("000") == []
+    
+    def test_tries_maintained_on_changes(self, phonebook_with_contacts):
+        """Тест что деревья обновляются при изменении справочника"""
+        phonebook_with_contacts.search_phone_prefix("7")
+        phonebook_with_contacts.search_phone_suffix("7")
+        
+        phonebook_with_contacts.add_contact(Contact(name="Новый", phone="+7 (999) 000-00-07"))
+        phonebook_with_contacts.update_contact(2, phone="8 (495) 111-22-33")
+        phonebook_with_contacts.delete_contact(1)
+        
+        assert [c.id for c in phonebook_with_contacts.search_phone_prefix("7999")] == [4]
+        assert [c.id for c in phonebook_with_contacts.search_phone_prefix("8495")] == [2]
+        assert [c.id for c in phonebook_with_contacts.search_phone_suffix("07")] == [4]
+        assert phonebook_with_contacts.search_phone_suffix("4567") == []
+    
+    def test_tries_rebuilt_on_load(self, sample_json_data):
+        """Тест что деревья перестраиваются при загрузке"""
+        phonebook = PhoneBook(filename=sample_json_data)
+        phonebook.add_contact(Contact(name="Временный", phone="2221"))
+        assert len(phonebook.search_phone_prefix("222")) == 1
+        phonebook.load_from_file()
+        assert [c.id for c in phonebook.search_phone_prefix("222")] == [2]
+
+
+class TestNameRadixTree:
+    """Тесты для сжатого префиксного дерева имен"""
+    
+    @pytest.fixture
+    def tree(self, sample_contacts):
+        """Создает дерево по образцам контактов"""
+        tree = NameRadixTree(top_k=2)
+        tree.build(sample_contacts)
+        return tree
+    
+    def test_invalid_top_k_raises_error(self):
+        """Тест что размер кеша должен быть положительным"""
+        with pytest.raises(ValueError):
+            NameRadixTree(top_k=0)
+    
+    def test_lookup_by_first_word(self, tree):
+        """Тест автодополнения по первому слову имени"""
+        assert tree.lookup("ив", 10) == [1]
+        assert tree.lookup("м", 10) == [2]
+    
+    def test_lookup_by_surname(self, tree):
+        """Тест автодополнения по фамилии"""
+        assert tree.lookup("пет", 10) == [2, 3]
+        assert tree.lookup("сид", 10) == [3]
+    
+    def test_lookup_full_name(self, tree):
+        """Тест автодополнения по имени целиком"""
+        assert tree.lookup("иван и", 10) == [1]
+        assert tree.lookup("иван п", 10) == []
+    
+    def test_lookup_limit_uses_cache(self, tree):
+        """Тест что ограничение результатов берется из кеша узла"""
+        assert tree.lookup("", 2) == [1, 2]
+        assert tree.lookup("", 10) == [1, 2, 3]
+        assert tree.lookup("", 0) == []
+    
+    def test_remove_updates_cache_and_prunes(self, tree, sample_contacts):
+        """Тест что удаление обновляет кеш и убирает пустые узлы"""
+        tree.remove(sample_contacts[0])
+        assert tree.lookup("", 2) == [2, 3]
+        assert tree.lookup("ив", 10) == []
+        for contact in sample_contacts[1:]:
+            tree.remove(contact)
+        assert tree._root.children == {}
+        assert tree._root.top == []
+    
+    def test_shared_prefix_split_and_merge(self):
+        """Тест разделения и слияния ребер с общим префиксом"""
+        tree = NameRadixTree()
+        first = Contact(name="Александр", phone="1", contact_id=1)
+        second = Contact(name="Алексей", phone="2", contact_id=2)
+        tree.add(first)
+        tree.add(second)
+        assert tree.lookup("алекс", 10) == [1, 2]
+        assert tree.lookup("алексе", 10) == [2]
+        tree.remove(first)
+        assert tree.lookup("алекс", 10) == [2]
+        assert tree._root.children["а"].label == "алексей"
+    
+    def test_complete(self, phonebook_with_contacts):
+        """Тест автодополнения в справочнике"""
+        results = phonebook_with_contacts.complete("ПЕТ")
+        assert [c.name for c in results] == ["Мария Петрова", "Петр Сидоров"]
+        assert len(phonebook_with_contacts.complete("пет", limit=1)) == 1
+        assert phonebook_with_contacts.complete("xyz") == []
+    
+    def test_complete_maintained_on_changes(self, phonebook_with_contacts):
+        """Тест что автодополнение учитывает изменения справочника"""
+        phonebook_with_contacts.complete("и")
+        phonebook_with_contacts.add_contact(Contact(name="Игорь Петров", phone="555"))
+        phonebook_with_contacts.update_contact(1, name="Олег Иванов")
+        phonebook_with_contacts.delete_contact(2)
+        
+        assert [c.id for c in phonebook_with_contacts.complete("и")] == [1, 4]
+        assert [c.id for c in phonebook_with_contacts.complete("пет")] == [3, 4]
+        assert phonebook_with_contacts.complete("мар") == []
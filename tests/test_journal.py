@@ -0,0 +1,202 @@
+"""
+Тесты для журнала изменений
+"""
+
+import pytest
+import os
+import json
+from model import Contact, PhoneBook
+from journal import ChangeJournal
+from exceptions import FileCorruptedError
+
+
+@pytest.fixture
+def journal_phonebook(sample_json_data):
+    """Создает справочник в режиме журнала, загруженный из файла"""
+    phonebook = PhoneBook(filename=sample_json_data, journal=True)
+    phonebook.load_from_file()
+    return phonebook
+
+
+def read_snapshot(filename):
+    """Читает основной файл справочника"""
+    with open(filename, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+class TestChangeJournal:
+    """Тесты для класса ChangeJournal"""
+    
+    def test_records_written_only_on_flush(self, temp_file):
+        """Тест что записи попадают в файл только при flush"""
+        journal = ChangeJournal(temp_file + '.journal')
+        journal.record_add({'id': 1, 'name': 'Тест', 'phone': '1', 'comment': ''})
+        journal.record_update(1, {'name': 'Новое'})
+        journal.record_delete(1)
+        assert journal.pending_count == 3
+        assert journal.size == 0
+        assert list(journal.replay()) == []
+        
+        journal.flush()
+        assert journal.pending_count == 0
+        assert list(journal.replay()) == [
+            ['a', {'id': 1, 'name': 'Тест', 'phone': '1', 'comment': ''}],
+            ['u', 1, {'name': 'Новое'}],
+            ['d', 1],
+        ]
+    
+    def test_replay_skips_torn_tail(self, temp_file):
+        """Тест что оборванная последняя запись пропускается"""
+        path = temp_file + '.journal'
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write('["d",1]\n["d",')
+        assert list(ChangeJournal(path).replay()) == [['d', 1]]
+    
+    def test_replay_corrupted_line_raises(self, temp_file):
+        """Тест что поврежденная строка в середине журнала не обрывает чтение молча"""
+        path = temp_file + '.journal'
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write('["d",1]\n["d",\n["d",3]\n')
+        with pytest.raises(FileCorruptedError):
+            list(ChangeJournal(path).replay())
+    
+    def test_replay_corrupted_line_reported(self, temp_file):
+        """Тест что после поврежденной строки читаются следующие записи"""
+        path = temp_file + '.journal'
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write('["d",1]\n["d",\n["d",3]\n')
+        errors = []
+        records = list(ChangeJournal(path).replay(lambda line, message: errors.append(line)))
+        assert records == [['d', 1], ['d', 3]]
+        assert errors == [2]
+    
+    def test_flush_after_torn_tail(self, temp_file):
+        """Тест что новые записи не склеиваются с оборванной строкой"""
+        path = temp_file + '.journal'
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write('["d",1]\n["d",')
+        journal = ChangeJournal(path)
+        journal.record_delete(2)
+        journal.flush()
+        assert list(journal.replay()) == [['d', 1], ['d', 2]]
+    
+    def test_clear(self, temp_file):
+        """Тест удаления файла журнала"""
+        journal = ChangeJournal(temp_file + '.journal')
+        journal.record_delete(1)
+        journal.flush()
+        journal.clear()
+        assert not os.path.exists(journal.path)
+
+
+class TestPhoneBookJournal:
+    """Тесты справочника в режиме журнала"""
+    
+    def test_save_appends_to_journal(self, journal_phonebook, sample_json_data):
+        """Тест что сохранение дописывает журнал, не переписывая основной файл"""
+        snapshot_before = read_snapshot(sample_json_data)
+        journal_phonebook.add_contact(Contact(name="Новый", phone="333"))
+        journal_phonebook.update_contact(1, comment="Изменен")
+        journal_phonebook.delete_contact(2)
+        
+        assert journal_phonebook.save_to_file() is True
+        assert journal_phonebook.has_unsaved_changes() is False
+        assert read_snapshot(sample_json_data) == snapshot_before
+        assert os.path.getsize(sample_json_data + '.journal') > 0
+    
+    def test_load_replays_journal(self, journal_phonebook, sample_json_data):
+        """Тест что загрузка применяет журнал к снимку"""
+        journal_phonebook.add_contact(Contact(name="Новый", phone="333"))
+        journal_phonebook.update_contact(1, comment="Изменен")
+        journal_phonebook.delete_contact(2)
+        journal_phonebook.save_to_file()
+        
+        phonebook = PhoneBook(filename=sample_json_data, journal=True)
+        phonebook.load_from_file()
+        assert [c.id for c in phonebook.contacts] == [1, 3]
+        assert phonebook.get_contact(1).comment == "Изменен"
+        assert phonebook.get_contact(3).name == "Новый"
+        assert phonebook.next_id == 4
+        assert [c.id for c in phonebook.find_by_phone("333")] == [3]
+    
+    def test_load_keeps_records_after_corrupted_line(self, journal_phonebook, sample_json_data):
+        """Тест что поврежденная строка журнала попадает в отчет, а следующие применяются"""
+        journal_phonebook.add_contact(Contact(name="Новый", phone="333"))
+        journal_phonebook.save_to_file()
+        with open(sample_json_data + '.journal', 'a', encoding='utf-8') as f:
+            f.write('["d",\n["d",2]\n')
+        
+        phonebook = PhoneBook(filename=sample_json_data, journal=True)
+        assert phonebook.load_from_file() is True
+        assert [c.id for c in phonebook.contacts] == [1, 3]
+        assert phonebook.load_report.skipped == 1
+    
+    def test_unsaved_changes_not_persisted(self, journal_phonebook, sample_json_data):
+        """Тест что изменения без сохранения не попадают в журнал"""
+        journal_phonebook.delete_contact(1)
+        
+        phonebook = PhoneBook(filename=sample_json_data, journal=True)
+        phonebook.load_from_file()
+        assert phonebook.count == 2
+    
+    def test_compaction_over_threshold(self, sample_json_data):
+        """Тест что журнал переносится в основной файл при превышении порога"""
+        phonebook = PhoneBook(filename=sample_json_data, journal=True, journal_compact_size=10)
+        phonebook.load_from_file()
+        phonebook.add_contact(Contact(name="Новый", phone="333"))
+        phonebook.save_to_file()
+        
+        assert not os.path.exists(sample_json_data + '.journal')
+        assert len(read_snapshot(sample_json_data)['contacts']) == 3
+    
+    def test_first_save_without_load_writes_snapshot(self, temp_file):
+        """Тест что без загруженного снимка сохраняется полный файл"""
+        os.remove(temp_file)
+        phonebook = PhoneBook(filename=temp_file, journal=True)
+        phonebook.add_contact(Contact(name="Тест", phone="1"))
+        phonebook.save_to_file()
+        assert len(read_snapshot(temp_file)['contacts']) == 1
+        
+        phonebook.add_contact(Contact(name="Тест2", phone="2"))
+        phonebook.save_to_file()
+        assert len(read_snapshot(temp_file)['contacts']) == 1
+        
+        reloaded = PhoneBook(filename=temp_file, journal=True)
+        reloaded.load_from_file()
+        assert [c.name for c in reloaded.contacts] == ["Тест", "Тест2"]
+    
+    def test_changed_filename_writes_snapshot(self, journal_phonebook, temp_file):
+        """Тест что при смене файла сохраняется полный снимок в новый файл"""
+        other = temp_file + '.copy'
+        journal_phonebook.filename = other
+        journal_phonebook.save_to_file()
+        try:
+            assert len(read_snapshot(other)['contacts']) == 2
+        finally:
+            os.remove(other)
+    
+    def test_replay_is_idempotent_after_interrupted_compaction(self, journal_phonebook, sample_json_data):
+        """Тест что журнал, оставшийся после записи снимка, применяется повторно без дублей"""
+        journal_phonebook.add_contact(Contact(name="Новый", phone="333"))
+        journal_phonebook.delete_contact(1)
+        journal_phonebook.save_to_file()
+        with open(sample_json_data + '.journal', 'r', encoding='utf-8') as f:
+            journal_content = f.read()
+        
+        # Имитируем сбой: снимок записан, а журнал не удален
+        journal_phonebook.compact_journal()
+        with open(sample_json_data + '.journal', 'w', encoding='utf-8') as f:
+            f.write(journal_content)
+        
+        phonebook = PhoneBook(filename=sample_json_data, journal=True)
+        phonebook.load_from_file()
+        assert [c.id for c in phonebook.contacts] == [2, 3]
+    
+    def test_journal_ignored_without_journal_mode(self, journal_phonebook, sample_json_data):
+        """Тест что обычный режим не читает журнал"""
+        journal_phonebook.delete_contact(1)
+        journal_phonebook.save_to_file()
+        
+        phonebook = PhoneBook(filename=sample_json_data)
+        phonebook.load_from_file()
+        assert phonebook.count == 2
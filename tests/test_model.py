@@ -5,7 +5,7 @@
 import pytest
 import os
 import json
-from model import Contact, PhoneBook, FileHandler
+from model import Contact, PhoneBook, FileHandler, DataClassMeta
 from exceptions import (
     ContactValidationError,
     ContactNotFoundError,
@@ -170,6 +170,61 @@ class TestContact:
         contact3 = Contact(name="Другой", phone="123", contact_id=1)
         assert contact1 == contact2
         assert contact1 != contact3
+    
+    def test_contact_uses_slots(self):
+        """Тест что контакт не хранит атрибуты в __dict__"""
+        contact = Contact(name="Тест", phone="123")
+        assert not hasattr(contact, '__dict__')
+        with pytest.raises(AttributeError):
+            contact.extra = 1
+    
+    def test_contact_dataclass_repr_uses_fields(self):
+        """Тест что __repr__ строится по объявленным полям"""
+        contact = Contact(name="Тест", phone="123", comment="ком", contact_id=1)
+        assert repr(contact) == "Contact(id=1, name='Тест', phone='123', comment='ком')"
+    
+    def test_contact_dataclass_hash(self):
+        """Тест что __hash__ согласован с __eq__"""
+        contact1 = Contact(name="Тест", phone="123", contact_id=1)
+        contact2 = Contact(name="Тест", phone="123", contact_id=1)
+        contact3 = Contact(name="Тест", phone="456", contact_id=1)
+        assert hash(contact1) == hash(contact2)
+        assert len({contact1, contact2, contact3}) == 2
+    
+    def test_dataclass_meta_without_fields_uses_dict(self):
+        """Тест что метакласс без объявленных полей сравнивает __dict__"""
+        class Point(metaclass=DataClassMeta):
+            def __init__(self, x, y):
+                self.x = x
+                self.y = y
+        
+        assert Point(1, 2) == Point(1, 2)
+        assert Point(1, 2) != Point(2, 1)
+        assert repr(Point(1, 2)) == "Point(x=1, y=2)"
+    
+    def test_contact_search_keys_casefolded(self):
+        """Тест что ключи поиска вычисляются через casefold"""
+        contact = Contact(name="Straße ИВАН", phone="+7 ABC", comment="Друг")
+        assert contact.name_key == "strasse иван"
+        assert contact.phone_key == "+7 abc"
+        assert contact.comment_key == "друг"
+    
+    def test_contact_search_keys_updated_by_setters(self):
+        """Тест что сеттеры обновляют ключи поиска"""
+        contact = Contact(name="Тест", phone="123", comment="ком")
+        contact.name = "  Новое ИМЯ "
+        contact.phone = "456"
+        contact.comment = " КОММЕНТАРИЙ "
+        assert contact.name_key == "новое имя"
+        assert contact.phone_key == "456"
+        assert contact.comment_key == "комментарий"
+    
+    def test_contact_search_keys_unchanged_after_failed_set(self):
+        """Тест что неудачный сеттер не портит ключ поиска"""
+        contact = Contact(name="Тест", phone="123")
+        with pytest.raises(ContactValidationError):
+            contact.name = "   "
+        assert contact.name_key == "тест"
 
 
 class TestFileHandler:
@@ -365,6 +420,18 @@ class TestPhoneBook:
         results = phonebook_with_contacts.search("ИВАН", field="name")
         assert len(results) == 1
     
+    def test_phonebook_search_uses_casefold(self, empty_phonebook):
+        """Тест что поиск сравнивает строки через casefold"""
+        empty_phonebook.add_contact(Contact(name="Hans Straße", phone="123"))
+        assert len(empty_phonebook.search("STRASSE", field="name")) == 1
+        assert len(empty_phonebook.search("strasse")) == 1
+    
+    def test_phonebook_search_after_update(self, phonebook_with_contacts):
+        """Тест что поиск учитывает измененные поля"""
+        phonebook_with_contacts.update_contact(1, comment="Сосед")
+        assert len(phonebook_with_contacts.search("сосед", field="comment")) == 1
+        assert len(phonebook_with_contacts.search("друг", field="comment")) == 0
+    
     def test_phonebook_search_no_results(self, phonebook_with_contacts):
         """Тест поиска без результатов"""
         results = phonebook_with_contacts.search("Несуществующий", field="name")
@@ -420,10 +487,86 @@ class TestPhoneBook:
         assert empty_phonebook.has_unsaved_changes() is True
     
     def test_phonebook_contacts_property_returns_copy(self, phonebook_with_contacts):
-        """Тест что свойство contacts возвращает копию"""
+        """Тест что свойство contacts возвращает неизменяемое представление"""
         contacts = phonebook_with_contacts.contacts
         original_count = phonebook_with_contacts.count
-        contacts.append(Contact(name="Новый", phone="999"))
+        with pytest.raises(AttributeError):
+            contacts.append(Contact(name="Новый", phone="999"))
         # Оригинальный список не должен измениться
         assert phonebook_with_contacts.count == original_count
-
+    
+    def test_phonebook_delete_keeps_order(self, phonebook_with_contacts):
+        """Тест что удаление не меняет порядок остальных контактов"""
+        phonebook_with_contacts.delete_contact(2)
+        names = [c.name for c in phonebook_with_contacts.contacts]
+        assert names == ["Иван Иванов", "Петр Сидоров"]
+        assert phonebook_with_contacts.find_by_id(2) is None
+        assert phonebook_with_contacts.get_contact(3).name == "Петр Сидоров"
+    
+    def test_phonebook_delete_many_compacts_list(self, empty_phonebook):
+        """Тест что после массового удаления индекс ID остается согласованным"""
+        for i in range(200):
+            empty_phonebook.add_contact(Contact(name=f"Тест{i}", phone=str(i + 1)))
+        for contact_id in range(1, 200, 2):
+            empty_phonebook.delete_contact(contact_id)
+        
+        assert empty_phonebook.count == 100
+        assert [c.id for c in empty_phonebook.contacts] == list(range(2, 201, 2))
+        for contact_id in range(2, 201, 2):
+            assert empty_phonebook.get_contact(contact_id).name == f"Тест{contact_id - 1}"
+    
+    def test_phonebook_add_after_delete(self, phonebook_with_contacts):
+        """Тест добавления контакта после удаления"""
+        phonebook_with_contacts.delete_contact(1)
+        added = phonebook_with_contacts.add_contact(Contact(name="Новый", phone="999"))
+        assert added.id == 4
+        assert phonebook_with_contacts.get_contact(4) is added
+        assert phonebook_with_contacts.count == 3
+    
+    def test_phonebook_load_indexes_assigned_ids(self, temp_file):
+        """Тест что ID, присвоенные при загрузке, доступны для поиска по ID"""
+        data = {
+            "contacts": [
+                {"name": "Тест1", "phone": "111"},
+                {"id": 5, "name": "Тест2", "phone": "222"}
+            ]
+        }
+        with open(temp_file, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False)
+        
+        phonebook = PhoneBook(filename=temp_file)
+        phonebook.load_from_file()
+        assert phonebook.get_contact(6).name == "Тест1"
+        assert phonebook.get_contact(5).name == "Тест2"
+    
+    def test_phonebook_delete_duplicate_id(self, temp_file):
+        """Тест что после удаления контакта с дублирующимся ID находится следующий контакт с этим ID"""
+        data = {
+            "contacts": [
+                {"id": 1, "name": "Первый", "phone": "111"},
+                {"id": 2, "name": "Другой", "phone": "222"},
+                {"id": 1, "name": "Второй", "phone": "333"},
+                {"id": 1, "name": "Третий", "phone": "444"}
+            ]
+        }
+        with open(temp_file, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False)
+        
+        phonebook = PhoneBook(filename=temp_file)
+        phonebook.load_from_file()
+        assert phonebook.get_contact(1).name == "Первый"
+        phonebook.delete_contact(1)
+        assert phonebook.get_contact(1).name == "Второй"
+        phonebook.delete_contact(1)
+        assert phonebook.get_contact(1).name == "Третий"
+        phonebook.delete_contact(1)
+        assert phonebook.find_by_id(1) is None
+        assert [c.name for c in phonebook.contacts] == ["Другой"]
+    
+    def test_phonebook_save_after_delete(self, phonebook_with_contacts, temp_file):
+        """Тест что удаленные контакты не попадают в файл"""
+        phonebook_with_contacts.delete_contact(1)
+        phonebook_with_contacts.save_to_file()
+        with open(temp_file, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        assert [c['id'] for c in data['contacts']] == [2, 3]
@@ -0,0 +1,205 @@
+"""
+Тесты для формата NDJSON с индексом смещений
+"""
+
+import pytest
+import os
+from model import PhoneBook, FileHandler
+from ndjson_file import NDJSONFile
+from exceptions import FileCorruptedError
+
+
+@pytest.fixture
+def ndjson_path(temp_file):
+    """Возвращает путь к файлу NDJSON (удаляется вместе с temp_file)"""
+    return temp_file + '.ndjson'
+
+
+@pytest.fixture
+def ndjson_data(ndjson_path, sample_contacts):
+    """Создает файл NDJSON с образцами контактов"""
+    FileHandler.save_to_file(ndjson_path, sample_contacts)
+    return ndjson_path
+
+
+class TestNDJSONFile:
+    """Тесты чтения и частичной записи файла NDJSON"""
+    
+    def test_one_contact_per_line(self, ndjson_data):
+        """Тест что каждый контакт записан отдельной строкой"""
+        with open(ndjson_data, 'r', encoding='utf-8') as f:
+            lines = f.read().splitlines()
+        assert len(lines) == 3
+        assert '"Мария Петрова"' in lines[1]
+        assert os.path.exists(ndjson_data + '.idx')
+    
+    def test_read_by_id(self, ndjson_data):
+        """Тест чтения отдельного контакта"""
+        ndjson = FileHandler.open_ndjson(ndjson_data)
+        assert ndjson.read(2)['name'] == "Мария Петрова"
+        assert ndjson.read(10) is None
+    
+    def test_update_appends_and_keeps_order(self, ndjson_data):
+        """Тест что изменение дописывает строку, а порядок контактов не меняется"""
+        ndjson = FileHandler.open_ndjson(ndjson_data)
+        size = os.path.getsize(ndjson_data)
+        ndjson.put({'id': 1, 'name': "Олег", 'phone': "1", 'comment': ""})
+        assert os.path.getsize(ndjson_data) > size
+        assert ndjson.dead_bytes > 0
+        assert ndjson.read(1)['name'] == "Олег"
+        assert [data['id'] for data in ndjson] == [1, 2, 3]
+    
+    def test_delete(self, ndjson_data):
+        """Тест удаления меткой"""
+        ndjson = FileHandler.open_ndjson(ndjson_data)
+        assert ndjson.delete(2) is True
+        assert ndjson.delete(2) is False
+        assert ndjson.read(2) is None
+        assert len(ndjson) == 2
+    
+    def test_tail_appended_after_index_is_read(self, ndjson_data):
+        """Тест что строки, дописанные после сохранения индекса, учитываются при открытии"""
+        ndjson = FileHandler.open_ndjson(ndjson_data)
+        ndjson.put({'id': 4, 'name': "Новый", 'phone': "4", 'comment': ""})
+        ndjson.delete(1)
+        # Индекс не сохранен - новый экземпляр дочитывает хвост файла
+        reopened = FileHandler.open_ndjson(ndjson_data)
+        assert [data['id'] for data in reopened] == [2, 3, 4]
+    
+    def test_missing_index_is_rebuilt(self, ndjson_data):
+        """Тест что индекс строится заново, если его нет или он поврежден"""
+        ndjson = FileHandler.open_ndjson(ndjson_data)
+        ndjson.put({'id': 2, 'name': "Мария", 'phone': "2", 'comment': ""})
+        ndjson.flush_index()
+        with open(ndjson_data + '.idx', 'wb') as f:
+            f.write(b"garbage")
+        reopened = FileHandler.open_ndjson(ndjson_data)
+        assert reopened.read(2)['name'] == "Мария"
+        assert [data['id'] for data in reopened] == [1, 2, 3]
+    
+    def test_rewritten_data_file_rebuilds_index(self, ndjson_data):
+        """Тест что индекс не используется, если файл данных заменен другим содержимым не меньшего размера"""
+        FileHandler.open_ndjson(ndjson_data).flush_index()
+        with open(ndjson_data, 'w', encoding='utf-8') as f:
+            for i in range(1, 7):
+                f.write(f'{{"id": {i}, "name": "Контакт номер {i}", "phone": "{i}{i}{i}", "comment": ""}}\n')
+        phonebook = PhoneBook(filename=ndjson_data)
+        assert phonebook.load_from_file() is True
+        assert [c.id for c in phonebook.contacts] == [1, 2, 3, 4, 5, 6]
+        assert phonebook.load_report.skipped == 0
+    
+    def test_index_kept_after_appended_tail(self, ndjson_data, monkeypatch):
+        """Тест что индекс остается действительным, если в файл только дописаны строки"""
+        FileHandler.open_ndjson(ndjson_data).flush_index()
+        size = os.path.getsize(ndjson_data)
+        with open(ndjson_data, 'a', encoding='utf-8') as f:
+            f.write('{"id": 4, "name": "Новый", "phone": "4", "comment": ""}\n')
+        scans = []
+        original_scan = NDJSONFile._scan
+        monkeypatch.setattr(NDJSONFile, '_scan', lambda self, start: (scans.append(start), original_scan(self, start)))
+        ndjson = FileHandler.open_ndjson(ndjson_data)
+        assert scans == [size]
+        assert [data['id'] for data in ndjson] == [1, 2, 3, 4]
+    
+    def test_torn_last_line(self, ndjson_data):
+        """Тест что недописанная строка игнорируется и отрезается при следующей записи"""
+        os.remove(ndjson_data + '.idx')
+        with open(ndjson_data, 'ab') as f:
+            f.write(b'{"id": 9, "na')
+        ndjson = FileHandler.open_ndjson(ndjson_data)
+        assert 9 not in ndjson
+        ndjson.put({'id': 4, 'name': "Новый", 'phone': "4", 'comment': ""})
+        reopened = NDJSONFile(ndjson_data)
+        assert [data['id'] for data in reopened] == [1, 2, 3, 4]
+        assert reopened.read(4)['name'] == "Новый"
+    
+    def test_corrupted_line(self, ndjson_path):
+        """Тест что неверная строка в середине файла передается при переборе как ошибка"""
+        with open(ndjson_path, 'w', encoding='utf-8') as f:
+            f.write('{"id": 1, "name": "А", "phone": "1"}\nне json\n[2]\n{"id": 3, "name": "Б", "phone": "3"}\n')
+        records = list(NDJSONFile(ndjson_path))
+        assert records[0]['id'] == 1 and records[3]['id'] == 3
+        assert isinstance(records[1], ValueError)
+        assert records[2] == [2]
+    
+    def test_read_by_id_of_overwritten_line(self, ndjson_data):
+        """Тест что строка с ID, испорченная в обход индекса, вызывает FileCorruptedError"""
+        ndjson = FileHandler.open_ndjson(ndjson_data)
+        ndjson.flush_index()
+        offset, _ = ndjson.entries()[1]
+        with open(ndjson_data, 'r+b') as f:
+            f.seek(offset)
+            f.write(b'X')
+        with pytest.raises(FileCorruptedError):
+            FileHandler.open_ndjson(ndjson_data).read(2)
+    
+    def test_compact(self, ndjson_data):
+        """Тест что уплотнение убирает устаревшие строки"""
+        ndjson = FileHandler.open_ndjson(ndjson_data)
+        original_size = os.path.getsize(ndjson_data)
+        for i in range(5):
+            ndjson.put({'id': 3, 'name': f"Петр {i}", 'phone': "3", 'comment': ""})
+        ndjson.delete(1)
+        assert ndjson.compact() > 0
+        assert ndjson.dead_bytes == 0
+        assert os.path.getsize(ndjson_data) < original_size
+        assert [data['name'] for data in NDJSONFile(ndjson_data)] == ["Мария Петрова", "Петр 4"]
+        assert ndjson.compact() == 0
+
+
+class TestPhoneBookNDJSON:
+    """Тесты загрузки и сохранения справочника в NDJSON"""
+    
+    def test_save_and_load(self, ndjson_path, phonebook_with_contacts):
+        """Тест сохранения и потоковой загрузки справочника"""
+        phonebook_with_contacts.filename = ndjson_path
+        assert phonebook_with_contacts.save_to_file() is True
+        
+        phonebook = PhoneBook(filename=ndjson_path)
+        assert phonebook.load_from_file() is True
+        assert phonebook.contacts == phonebook_with_contacts.contacts
+    
+    def test_lines_without_id_get_ids(self, ndjson_path):
+        """Тест что контактам без ID назначаются ID при загрузке"""
+        with open(ndjson_path, 'w', encoding='utf-8') as f:
+            f.write('{"name": "Без ID", "phone": "1"}\n{"id": 3, "name": "С ID", "phone": "2"}\n')
+        phonebook = PhoneBook(filename=ndjson_path)
+        phonebook.load_from_file()
+        assert [(c.id, c.name) for c in phonebook.contacts] == [(4, "Без ID"), (3, "С ID")]
+    
+    @pytest.mark.parametrize("load_workers", [1, 2])
+    def test_corrupted_lines_are_skipped(self, ndjson_path, load_workers):
+        """Тест что неверные строки учитываются в отчете загрузки, а не прерывают ее"""
+        with open(ndjson_path, 'w', encoding='utf-8') as f:
+            f.write('{"id": 1, "name": "А", "phone": "1"}\nне json\n"строка"\n{"id": 2, "name": "Б", "phone": "2"}\n')
+        phonebook = PhoneBook(filename=ndjson_path, load_workers=load_workers)
+        assert phonebook.load_from_file() is True
+        assert [c.id for c in phonebook.contacts] == [1, 2]
+        report = phonebook.load_report
+        assert report.skipped == 2
+        assert report.counts == {"Неверная строка JSON": 1, "Запись контакта должна быть объектом JSON": 1}
+        assert [number for number, _ in report.examples] == [2, 3]
+    
+    def test_duplicate_ids_kept_on_save(self, temp_file, ndjson_path):
+        """Тест что контакты с повторяющимся ID сохраняются в NDJSON так же, как в JSON"""
+        with open(temp_file, 'w', encoding='utf-8') as f:
+            f.write('{"contacts": [{"id": 1, "name": "Первый", "phone": "1"}, '
+                    '{"id": 2, "name": "Другой", "phone": "2"}, {"id": 1, "name": "Второй", "phone": "3"}]}')
+        phonebook = PhoneBook(filename=temp_file)
+        phonebook.load_from_file()
+        phonebook.filename = ndjson_path
+        assert phonebook.save_to_file() is True
+        
+        for rebuild_index in (False, True):
+            if rebuild_index:
+                os.remove(ndjson_path + '.idx')
+            loaded = PhoneBook(filename=ndjson_path)
+            assert loaded.load_from_file() is True
+            assert [(c.id, c.name) for c in loaded.contacts] == [(1, "Первый"), (2, "Другой"), (1, "Второй")]
+            assert loaded.get_contact(1).name == "Первый"
+            assert FileHandler.open_ndjson(ndjson_path).read(1)['name'] == "Первый"
+    
+    def test_convert_json_to_ndjson(self, sample_json_data, ndjson_path):
+        """Тест конвертации JSON -> NDJSON"""
+        assert FileHandler.convert(sample_json_data, ndjson_path) == 2
+        assert FileHandler.open_ndjson(ndjson_path).read(2)['name'] == "Тест2"
@@ -0,0 +1,67 @@
+"""
+Тесты для параллельной загрузки справочника
+"""
+
+import pytest
+import json
+import pickle
+from model import PhoneBook
+
+
+@pytest.fixture
+def large_file(temp_file, request):
+    """Создает файл (JSON или NDJSON) с контактами, среди которых есть некорректные и без ID"""
+    records = []
+    for i in range(1, 21):
+        if i % 7 == 0:
+            records.append({"id": i, "name": "", "phone": "1"})
+        elif i % 5 == 0:
+            records.append({"name": f"Без ID {i}", "phone": str(i)})
+        else:
+            records.append({"id": i * 10, "name": f"Контакт {i}", "phone": str(i)})
+    
+    path = temp_file + request.param
+    if request.param == '.ndjson':
+        with open(path, 'w', encoding='utf-8') as f:
+            for record in records:
+                f.write(json.dumps(record, ensure_ascii=False) + '\n')
+    else:
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({"contacts": records}, f, ensure_ascii=False)
+    return path
+
+
+@pytest.mark.parametrize("large_file", ['.json', '.ndjson'], indirect=True)
+class TestParallelLoad:
+    """Тесты что параллельная загрузка дает тот же результат, что и последовательная"""
+    
+    def test_same_as_serial(self, large_file, monkeypatch):
+        """Тест порядка контактов, назначения ID и отчета об ошибках"""
+        monkeypatch.setattr(PhoneBook, 'PARALLEL_CHUNK_SIZE', 3)
+        serial = PhoneBook(filename=large_file)
+        serial.load_from_file()
+        parallel = PhoneBook(filename=large_file, load_workers=2)
+        assert parallel.load_from_file() is True
+        
+        assert parallel.contacts == serial.contacts
+        assert parallel.next_id == serial.next_id
+        assert parallel.has_unsaved_changes() == serial.has_unsaved_changes()
+        assert parallel.load_report.examples == serial.load_report.examples
+        assert [number for number, _ in parallel.load_report.examples] == [7, 14]
+    
+    def test_single_chunk_without_pool(self, large_file):
+        """Тест что маленький файл загружается без пула процессов"""
+        phonebook = PhoneBook(filename=large_file, load_workers=4)
+        assert phonebook.load_from_file() is True
+        assert phonebook.count == 18
+
+
+class TestContactPickle:
+    """Тесты передачи контактов между процессами"""
+    
+    def test_pickle_roundtrip(self, sample_contact):
+        """Тест что контакт восстанавливается вместе с ключами поиска"""
+        restored = pickle.loads(pickle.dumps(sample_contact))
+        assert restored == sample_contact
+        assert restored.name_key == sample_contact.name_key
+        assert restored.canonical_phone == "79991234567"
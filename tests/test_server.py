@@ -0,0 +1,171 @@
+"""
+Тесты для HTTP/JSON сервиса справочника
+"""
+
+import pytest
+import http.client
+import json
+import threading
+from model import Contact, PhoneBook
+from server import make_server
+from thread_safe import ThreadSafePhoneBook
+
+
+@pytest.fixture
+def server(temp_file, sample_contacts):
+    """Запускает сервер на свободном порту со справочником из трех контактов"""
+    phonebook = ThreadSafePhoneBook(filename=temp_file)
+    for contact in sample_contacts:
+        phonebook.add_contact(Contact(name=contact.name, phone=contact.phone, comment=contact.comment))
+    server = make_server(phonebook, port=0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def client(server):
+    """Соединение keep-alive с сервером"""
+    connection = http.client.HTTPConnection('127.0.0.1', server.server_port, timeout=5)
+    
+    def request(method, path, body=None, headers=None):
+        payload = None if body is None else json.dumps(body).encode('utf-8')
+        connection.request(method, path, body=payload, headers=headers or {})
+        response = connection.getresponse()
+        raw = response.read()
+        return response, (json.loads(raw) if raw else None)
+    
+    yield request
+    connection.close()
+
+
+class TestServer:
+    """Тесты маршрутов, пакетных запросов и ETag"""
+    
+    def test_get_and_search(self, client):
+        """Тест получения всех контактов, поиска и контакта по ID"""
+        response, data = client('GET', '/contacts')
+        assert response.status == 200
+        assert [c['id'] for c in data['contacts']] == [1, 2, 3]
+        
+        response, data = client('GET', '/contacts?q=999&field=phone')
+        assert [c['id'] for c in data['contacts']] == [1, 2]
+        
+        response, data = client('GET', '/contacts/2')
+        assert data['name'] == "Мария Петрова"
+        
+        response, data = client('GET', '/contacts/42')
+        assert response.status == 404
+        response, data = client('GET', '/contacts?q=a&field=id')
+        assert response.status == 400
+    
+    def test_create_update_delete(self, client, server, temp_file):
+        """Тест создания, изменения, удаления и сохранения"""
+        response, data = client('POST', '/contacts', {"name": "Новый", "phone": "+1 555"})
+        assert response.status == 201
+        assert data['id'] == 4
+        
+        response, data = client('PATCH', '/contacts/4', {"comment": "Сосед"})
+        assert response.status == 200
+        assert data['comment'] == "Сосед"
+        response, data = client('PATCH', '/contacts/4', {"phone": "abc"})
+        assert response.status == 400
+        
+        response, data = client('DELETE', '/contacts/1')
+        assert response.status == 204
+        response, data = client('POST', '/contacts', {"name": "", "phone": "1"})
+        assert response.status == 400
+        
+        response, data = client('POST', '/save')
+        assert response.status == 200
+        loaded = PhoneBook(filename=temp_file)
+        loaded.load_from_file()
+        assert [c.id for c in loaded.contacts] == [2, 3, 4]
+    
+    @pytest.mark.parametrize("fields", [
+        {"name": "Новое имя", "phone": ""},
+        {"name": "Новое имя", "phone": "   "},
+        {"name": "Новое имя", "phone": "abc"},
+        {"name": " ", "comment": "Новый комментарий"},
+    ])
+    def test_invalid_update_changes_nothing(self, client, fields):
+        """Тест что ошибка в одном поле не оставляет частично измененный контакт"""
+        _, before = client('GET', '/contacts/1')
+        response, data = client('PATCH', '/contacts/1', fields)
+        assert response.status == 400
+        _, after = client('GET', '/contacts/1')
+        assert after == before
+    
+    def test_batch_endpoints(self, client):
+        """Тест пакетного получения и создания"""
+        response, data = client('POST', '/contacts/batch/get', {"ids": [3, 1, 99]})
+        assert [c['id'] for c in data['contacts']] == [3, 1]
+        assert data['missing'] == [99]
+        
+        response, data = client('POST', '/contacts/batch/create', {"contacts": [
+            {"name": "А", "phone": "1"}, {"name": "", "phone": "2"}, {"name": "Б", "phone": "3"}
+        ]})
+        assert response.status == 201
+        assert [c['id'] for c in data['created']] == [4, 5]
+        assert data['errors'][0]['index'] == 1
+        
+        response, data = client('POST', '/contacts/batch/get', {"ids": "1"})
+        assert response.status == 400
+    
+    def test_etag(self, client):
+        """Тест что неизмененный справочник отдается ответом 304"""
+        response, _ = client('GET', '/contacts')
+        etag = response.getheader('ETag')
+        response, data = client('GET', '/contacts', headers={'If-None-Match': etag})
+        assert response.status == 304
+        assert data is None
+        
+        client('POST', '/contacts', {"name": "Новый", "phone": "1"})
+        response, data = client('GET', '/contacts', headers={'If-None-Match': etag})
+        assert response.status == 200
+        assert response.getheader('ETag') != etag
+        assert len(data['contacts']) == 4
+    
+    def test_write_etag_matches_state(self, client):
+        """Тест что ETag ответа на изменение соответствует состоянию после этого изменения"""
+        response, data = client('POST', '/contacts', {"name": "Новый", "phone": "1"})
+        etag = response.getheader('ETag')
+        assert response.getheader('X-PhoneBook-Version') == etag.strip('"').rsplit('-', 1)[1]
+        response, _ = client('POST', '/contacts/batch/get', {"ids": [data['id']]})
+        assert response.getheader('ETag') == etag
+        response, _ = client('GET', '/contacts', headers={'If-None-Match': etag})
+        assert response.status == 304
+    
+    def test_etag_differs_between_servers(self, client, server):
+        """Тест что ETag другого запуска сервера с тем же номером изменения не совпадает"""
+        response, _ = client('GET', '/contacts')
+        etag = response.getheader('ETag')
+        other = make_server(server.phonebook, port=0)
+        thread = threading.Thread(target=other.serve_forever, daemon=True)
+        thread.start()
+        try:
+            connection = http.client.HTTPConnection('127.0.0.1', other.server_port, timeout=5)
+            connection.request('GET', '/contacts', headers={'If-None-Match': etag})
+            response = connection.getresponse()
+            response.read()
+            connection.close()
+        finally:
+            other.shutdown()
+            other.server_close()
+        assert response.status == 200
+        assert response.getheader('ETag') != etag
+    
+    def test_errors_keep_connection(self, client):
+        """Тест что ошибки не разрывают соединение keep-alive"""
+        response, _ = client('POST', '/unknown', {"a": 1})
+        assert response.status == 404
+        response, _ = client('PUT', '/contacts/1', {"a": 1})
+        assert response.status == 405
+        response, _ = client('DELETE', '/contacts', None)
+        assert response.status == 405
+        response, data = client('POST', '/contacts', None, headers={'Content-Type': 'application/json'})
+        assert response.status == 400
+        response, data = client('GET', '/contacts/1')
+        assert response.status == 200
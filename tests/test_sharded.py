@@ -0,0 +1,140 @@
+"""
+Тесты для справочника, разделенного на шарды
+"""
+
+import pytest
+import json
+import os
+from model import Contact, PhoneBook
+from sharded import ShardedPhoneBook
+
+
+@pytest.fixture
+def manifest(tmp_path):
+    """Путь к файлу манифеста во временном каталоге"""
+    return str(tmp_path / "phonebook.json")
+
+
+@pytest.fixture
+def sharded(manifest):
+    """Справочник из 4 шардов с 10 контактами"""
+    phonebook = ShardedPhoneBook(filename=manifest, shards=4)
+    for i in range(1, 11):
+        phonebook.add_contact(Contact(name=f"Контакт {i}", phone=f"+7 900 000-00-{i:02d}"))
+    return phonebook
+
+
+class TestShardedPhoneBook:
+    """Тесты маршрутизации, поиска и сохранения шардов"""
+    
+    def test_invalid_shard_count(self, manifest):
+        """Тест что число шардов должно быть положительным"""
+        with pytest.raises(ValueError):
+            ShardedPhoneBook(filename=manifest, shards=0)
+    
+    def test_routing_by_id(self, sharded):
+        """Тест что контакты распределяются по шардам по ID и находятся по ID"""
+        assert sharded.count == 10
+        assert [contact.id for contact in sharded.contacts] == list(range(1, 11))
+        assert sharded.find_by_id(7).name == "Контакт 7"
+        assert sharded.find_by_id(42) is None
+        assert [shard.count for shard in sharded._shards] == [2, 3, 3, 2]
+    
+    def test_update_and_delete(self, sharded):
+        """Тест изменения и удаления контакта в его шарде"""
+        sharded.update_contact(5, comment="Изменен")
+        assert sharded.get_contact(5).comment == "Изменен"
+        assert sharded.delete_contact(6) is True
+        assert sharded.find_by_id(6) is None
+        assert sharded.count == 9
+    
+    def test_search_fans_out(self, sharded):
+        """Тест что поиск объединяет результаты всех шардов по возрастанию ID"""
+        assert [contact.id for contact in sharded.search("контакт 1")] == [1, 10]
+        assert [contact.id for contact in sharded.search("900", field="phone")] == list(range(1, 11))
+        assert [contact.id for contact in sharded.find_by_phone("+79000000003")] == [3]
+    
+    def test_default_filename_differs_from_phonebook(self):
+        """Тест что манифест по умолчанию не совпадает с файлом обычного справочника"""
+        phonebook = ShardedPhoneBook()
+        assert phonebook.filename == "phonebook.shards.json"
+        assert phonebook.filename != PhoneBook().filename
+    
+    def test_missing_ids_assigned_globally(self, manifest, tmp_path):
+        """Тест что контакты без ID в разных шардах получают общие ID и переносятся в свои шарды"""
+        phonebook = ShardedPhoneBook(filename=manifest, shards=2)
+        phonebook.add_contacts(Contact(name=f"Контакт {i}", phone=str(i)) for i in range(1, 5))
+        phonebook.save_to_file()
+        for number in range(2):
+            path = tmp_path / f"phonebook.shard{number}.json"
+            data = json.loads(path.read_text(encoding='utf-8'))
+            data['contacts'].append({"name": f"Без ID {number}", "phone": "0"})
+            path.write_text(json.dumps(data, ensure_ascii=False), encoding='utf-8')
+        
+        loaded = ShardedPhoneBook(filename=manifest, shards=2)
+        assert loaded.load_from_file() is True
+        assert [(c.id, c.name) for c in loaded.contacts][4:] == [(5, "Без ID 0"), (6, "Без ID 1")]
+        for number, shard in enumerate(loaded._shards):
+            assert all(contact.id % 2 == number for contact in shard.contacts)
+        assert loaded.find_by_id(6).name == "Без ID 1"
+        assert loaded.next_id == 7
+        assert loaded.dirty_shards == [0, 1]
+        
+        assert loaded.save_to_file() is True
+        reloaded = ShardedPhoneBook(filename=manifest, shards=2)
+        reloaded.load_from_file()
+        assert [c.id for c in reloaded.contacts] == list(range(1, 7))
+        assert reloaded.has_unsaved_changes() is False
+    
+    def test_save_and_load(self, sharded, manifest):
+        """Тест сохранения манифеста и шардов и последующей загрузки"""
+        assert sharded.save_to_file() is True
+        assert sharded.has_unsaved_changes() is False
+        for number in range(4):
+            assert os.path.exists(os.path.join(os.path.dirname(manifest), f"phonebook.shard{number}.json"))
+        
+        loaded = ShardedPhoneBook(filename=manifest, shards=2)
+        assert loaded.load_from_file() is True
+        assert loaded.shard_count == 4
+        assert loaded.contacts == sharded.contacts
+        assert loaded.next_id == 11
+        assert loaded.add_contact(Contact(name="Новый", phone="123")).id == 11
+    
+    def test_only_dirty_shards_rewritten(self, sharded, manifest):
+        """Тест что сохраняются только шарды, измененные после последнего сохранения"""
+        sharded.save_to_file()
+        assert sharded.dirty_shards == []
+        shard_file = os.path.join(os.path.dirname(manifest), "phonebook.shard{}.json")
+        mtimes = [os.stat(shard_file.format(number)).st_mtime_ns for number in range(4)]
+        os.utime(shard_file.format(1), ns=(0, 0))
+        
+        sharded.update_contact(5, comment="Изменен")
+        assert sharded.dirty_shards == [1]
+        assert sharded.save_to_file() is True
+        assert os.stat(shard_file.format(1)).st_mtime_ns != 0
+        assert [os.stat(shard_file.format(n)).st_mtime_ns for n in (0, 2, 3)] == [mtimes[n] for n in (0, 2, 3)]
+    
+    def test_missing_manifest_is_empty(self, manifest):
+        """Тест загрузки несуществующего справочника"""
+        phonebook = ShardedPhoneBook(filename=manifest, shards=3)
+        assert phonebook.load_from_file() is True
+        assert phonebook.count == 0
+        assert phonebook.next_id == 1
+    
+    def test_corrupted_manifest(self, manifest):
+        """Тест что поврежденный манифест не загружается"""
+        with open(manifest, 'w', encoding='utf-8') as f:
+            json.dump({"contacts": []}, f)
+        phonebook = ShardedPhoneBook(filename=manifest)
+        assert phonebook.load_from_file() is False
+    
+    def test_rename_rewrites_all_shards(self, sharded, tmp_path):
+        """Тест что после смены имени файла все шарды пишутся рядом с новым манифестом"""
+        sharded.save_to_file()
+        sharded.filename = str(tmp_path / "copy.json")
+        assert sharded.dirty_shards == [0, 1, 2, 3]
+        assert sharded.save_to_file() is True
+        
+        loaded = ShardedPhoneBook(filename=str(tmp_path / "copy.json"))
+        assert loaded.load_from_file() is True
+        assert loaded.contacts == sharded.contacts
@@ -0,0 +1,208 @@
+"""
+Тесты для двоичного снимка .pbk
+"""
+
+import pytest
+import os
+import json
+from model import Contact, PhoneBook, FileHandler, MappedContactStore
+from snapshot import SnapshotReader, write_snapshot
+from exceptions import FileCorruptedError, ContactNotFoundError
+
+
+@pytest.fixture
+def pbk_file(temp_file):
+    """Возвращает путь для файла снимка (удаляется после теста)"""
+    path = temp_file + '.pbk'
+    yield path
+    if os.path.exists(path):
+        os.remove(path)
+
+
+@pytest.fixture
+def pbk_data(pbk_file, sample_contacts):
+    """Создает снимок .pbk с образцами контактов"""
+    write_snapshot(pbk_file, (contact.to_dict() for contact in sample_contacts))
+    return pbk_file
+
+
+class TestSnapshotFormat:
+    """Тесты чтения и записи формата .pbk"""
+    
+    def test_roundtrip(self, pbk_data, sample_contacts):
+        """Тест что записи читаются в исходном виде и порядке"""
+        snapshot = SnapshotReader(pbk_data)
+        try:
+            assert len(snapshot) == 3
+            assert snapshot.max_id == 3
+            assert snapshot.missing_ids == 0
+            assert list(snapshot) == [contact.to_dict() for contact in sample_contacts]
+        finally:
+            snapshot.close()
+    
+    def test_find_row_unsorted_ids(self, pbk_file):
+        """Тест двоичного поиска по ID, идущим не по порядку"""
+        ids = [7, 3, 10, 1, 3]
+        write_snapshot(pbk_file, [{'id': i, 'name': f"Тест{i}", 'phone': str(i), 'comment': ''} for i in ids])
+        snapshot = SnapshotReader(pbk_file)
+        try:
+            for row, contact_id in enumerate(ids[:4]):
+                assert snapshot.find_row(contact_id) == row
+            assert snapshot.find_row(5) is None
+            assert snapshot.find_row(100) is None
+        finally:
+            snapshot.close()
+    
+    def test_missing_ids(self, pbk_file):
+        """Тест записей без ID"""
+        write_snapshot(pbk_file, [{'id': None, 'name': "Тест", 'phone': "1", 'comment': "😀"}])
+        snapshot = SnapshotReader(pbk_file)
+        try:
+            assert snapshot.missing_ids == 1
+            assert snapshot.record(0) == {'id': None, 'name': "Тест", 'phone': "1", 'comment': "😀"}
+        finally:
+            snapshot.close()
+    
+    @pytest.mark.parametrize("content", [b"", b"PBK", b"NOTAPBKFILE" * 10])
+    def test_corrupted_snapshot(self, pbk_file, content):
+        """Тест что поврежденный снимок вызывает FileCorruptedError"""
+        with open(pbk_file, 'wb') as f:
+            f.write(content)
+        with pytest.raises(FileCorruptedError):
+            SnapshotReader(pbk_file)
+    
+    def test_truncated_snapshot(self, pbk_data):
+        """Тест что обрезанный снимок вызывает FileCorruptedError"""
+        with open(pbk_data, 'rb+') as f:
+            f.truncate(100)
+        with pytest.raises(FileCorruptedError):
+            SnapshotReader(pbk_data)
+
+
+class TestFileHandlerSnapshot:
+    """Тесты выбора формата и конвертации"""
+    
+    def test_format_by_extension(self, pbk_file, temp_file):
+        """Тест что формат выбирается по расширению"""
+        assert FileHandler.is_snapshot(pbk_file)
+        assert FileHandler.is_snapshot("BOOK.PBK")
+        assert not FileHandler.is_snapshot(temp_file)
+    
+    def test_save_and_load_pbk(self, pbk_file, sample_contacts):
+        """Тест сохранения и загрузки через FileHandler"""
+        FileHandler.save_to_file(pbk_file, sample_contacts)
+        data = FileHandler.load_from_file(pbk_file)
+        assert data['contacts'] == [contact.to_dict() for contact in sample_contacts]
+    
+    def test_convert_json_to_pbk_and_back(self, sample_json_data, pbk_file, temp_file):
+        """Тест конвертации JSON -> .pbk -> JSON"""
+        assert FileHandler.convert(sample_json_data, pbk_file) == 2
+        json_copy = temp_file + '.copy.json'
+        try:
+            assert FileHandler.convert(pbk_file, json_copy) == 2
+            with open(json_copy, 'r', encoding='utf-8') as f:
+                converted = json.load(f)
+            with open(sample_json_data, 'r', encoding='utf-8') as f:
+                original = json.load(f)
+            assert converted['contacts'] == original['contacts']
+        finally:
+            os.remove(json_copy)
+
+
+class TestPhoneBookSnapshot:
+    """Тесты справочника, загруженного из .pbk"""
+    
+    def test_load_uses_mapped_store(self, pbk_data):
+        """Тест что загрузка .pbk не разбирает записи целиком"""
+        phonebook = PhoneBook(filename=pbk_data)
+        assert phonebook.load_from_file() is True
+        assert isinstance(phonebook._store, MappedContactStore)
+        assert phonebook.count == 3
+        assert phonebook.next_id == 4
+        assert phonebook.get_contact(2).name == "Мария Петрова"
+    
+    def test_operations_over_snapshot(self, pbk_data):
+        """Тест изменений поверх снимка"""
+        phonebook = PhoneBook(filename=pbk_data)
+        phonebook.load_from_file()
+        
+        phonebook.add_contact(Contact(name="Новый", phone="+1 (555) 000-00-00"))
+        phonebook.update_contact(1, name="Олег")
+        phonebook.delete_contact(2)
+        
+        assert [c.name for c in phonebook.contacts] == ["Олег", "Петр Сидоров", "Новый"]
+        assert [c.id for c in phonebook.search("олег")] == [1]
+        assert [c.id for c in phonebook.search_phone_prefix("1555")] == [4]
+        with pytest.raises(ContactNotFoundError):
+            phonebook.get_contact(2)
+    
+    def test_save_over_mapped_file(self, pbk_data):
+        """Тест сохранения в тот же файл .pbk, который открыт через mmap"""
+        phonebook = PhoneBook(filename=pbk_data)
+        phonebook.load_from_file()
+        phonebook.delete_contact(1)
+        phonebook.add_contact(Contact(name="Новый", phone="1"))
+        assert phonebook.save_to_file() is True
+        assert phonebook.get_contact(3).name == "Петр Сидоров"
+        
+        reloaded = PhoneBook(filename=pbk_data)
+        reloaded.load_from_file()
+        assert [c.id for c in reloaded.contacts] == [2, 3, 4]
+    
+    def test_load_json_after_pbk(self, pbk_data, sample_json_data):
+        """Тест что после .pbk можно снова загрузить JSON"""
+        phonebook = PhoneBook(filename=pbk_data)
+        phonebook.load_from_file()
+        phonebook.filename = sample_json_data
+        phonebook.load_from_file()
+        assert [c.name for c in phonebook.contacts] == ["Тест1", "Тест2"]
+    
+    def test_pbk_with_missing_ids_loaded_eagerly(self, pbk_file):
+        """Тест что снимок с записями без ID загружается с назначением ID"""
+        write_snapshot(pbk_file, [
+            {'id': None, 'name': "Тест1", 'phone': "1", 'comment': ''},
+            {'id': 5, 'name': "Тест2", 'phone': "2", 'comment': ''},
+        ])
+        phonebook = PhoneBook(filename=pbk_file)
+        phonebook.load_from_file()
+        assert [c.id for c in phonebook.contacts] == [6, 5]
+    
+    def test_store_load_drops_snapshot(self, pbk_data):
+        """Тест что после load хранилище не ищет контакты по строкам старого снимка"""
+        store = MappedContactStore(SnapshotReader(pbk_data))
+        store.load([Contact(name="Тест3", phone="3", contact_id=3), Contact(name="Тест5", phone="5", contact_id=5)])
+        assert store.snapshot is None
+        assert store.get(1) is None
+        assert store.get(3).name == "Тест3"
+        assert store.get(5).name == "Тест5"
+        assert [c.id for c in store] == [3, 5]
+    
+    def test_failed_reload_keeps_mapped_book(self, pbk_data, temp_file):
+        """Тест что ошибка загрузки другого файла не очищает справочник, загруженный из .pbk"""
+        phonebook = PhoneBook(filename=pbk_data)
+        phonebook.load_from_file()
+        with open(temp_file, 'w', encoding='utf-8') as f:
+            f.write('{"contacts": [{"id": 7, "name": "Новый", "phone": "7"}, ')
+        phonebook.filename = temp_file
+        
+        assert phonebook.load_from_file() is False
+        assert phonebook.count == 3
+        assert phonebook.get_contact(2).name == "Мария Петрова"
+        assert phonebook.next_id == 4
+    
+    def test_reload_closes_previous_snapshot(self, pbk_data):
+        """Тест что при повторной загрузке отображение прежнего снимка закрывается"""
+        phonebook = PhoneBook(filename=pbk_data)
+        phonebook.load_from_file()
+        previous = phonebook._store
+        phonebook.load_from_file()
+        assert previous.snapshot is None
+        assert phonebook._store.snapshot is not None
+        assert phonebook.get_contact(3).name == "Петр Сидоров"
+    
+    def test_corrupted_pbk_load_returns_false(self, pbk_file):
+        """Тест что поврежденный .pbk не загружается"""
+        with open(pbk_file, 'wb') as f:
+            f.write(b"garbage")
+        phonebook = PhoneBook(filename=pbk_file)
+        assert phonebook.load_from_file() is False
@@ -0,0 +1,141 @@
+"""
+Тесты для справочника в базе SQLite
+"""
+
+import pytest
+import sqlite3
+from model import Contact
+from sqlite_storage import SQLitePhoneBook, SQLiteContactStore, migrate_from_json
+from exceptions import ContactNotFoundError
+
+
+@pytest.fixture
+def db_file(temp_file):
+    """Возвращает путь к файлу базы (удаляется вместе с temp_file)"""
+    return temp_file + '.db'
+
+
+@pytest.fixture
+def sqlite_phonebook(db_file, sample_contacts):
+    """Создает сохраненный справочник SQLite с контактами"""
+    phonebook = SQLitePhoneBook(filename=db_file)
+    phonebook.load_from_file()
+    for contact in sample_contacts:
+        phonebook.add_contact(contact)
+    phonebook.save_to_file()
+    yield phonebook
+    phonebook.close()
+
+
+class TestSQLitePhoneBook:
+    """Тесты основных операций справочника SQLite"""
+    
+    def test_crud(self, sqlite_phonebook):
+        """Тест добавления, получения, изменения и удаления"""
+        contact = sqlite_phonebook.add_contact(Contact(name="Анна", phone="123"))
+        assert contact.id == 4
+        assert sqlite_phonebook.count == 4
+        assert sqlite_phonebook.get_contact(4).name == "Анна"
+        
+        sqlite_phonebook.update_contact(4, comment="Соседка")
+        assert sqlite_phonebook.get_contact(4).comment == "Соседка"
+        
+        sqlite_phonebook.delete_contact(4)
+        with pytest.raises(ContactNotFoundError):
+            sqlite_phonebook.get_contact(4)
+        assert sqlite_phonebook.count == 3
+    
+    def test_changes_committed_only_on_save(self, sqlite_phonebook, db_file):
+        """Тест что несохраненные изменения не видны в файле"""
+        sqlite_phonebook.delete_contact(1)
+        assert sqlite_phonebook.has_unsaved_changes()
+        
+        other = SQLitePhoneBook(filename=db_file)
+        other.load_from_file()
+        assert other.count == 3
+        other.close()
+        
+        sqlite_phonebook.save_to_file()
+        assert not sqlite_phonebook.has_unsaved_changes()
+        other.load_from_file()
+        assert other.count == 2
+        assert other.next_id == 4
+        other.close()
+    
+    def test_reload_discards_changes(self, sqlite_phonebook):
+        """Тест что повторная загрузка отменяет несохраненные изменения"""
+        sqlite_phonebook.update_contact(1, name="Олег")
+        sqlite_phonebook.load_from_file()
+        assert sqlite_phonebook.get_contact(1).name == "Иван Иванов"
+        assert not sqlite_phonebook.has_unsaved_changes()
+    
+    @pytest.mark.parametrize("term,field,expected", [
+        ("иванов", None, [1]),
+        ("ИВАН", None, [1]),
+        ("999", 'phone', [1, 2]),
+        ("999", 'name', []),
+        ("колл", 'comment', [2]),
+        ("ов", None, [1, 2, 3]),
+        ("\"*", None, []),
+        ("иванов", 'unknown', []),
+    ])
+    def test_search(self, sqlite_phonebook, term, field, expected):
+        """Тест поиска по индексу FTS5 (и полного просмотра для коротких запросов)"""
+        assert [c.id for c in sqlite_phonebook.search(term, field)] == expected
+    
+    def test_search_after_update(self, sqlite_phonebook):
+        """Тест что индекс FTS5 обновляется при изменении контакта"""
+        sqlite_phonebook.update_contact(3, name="Олег Кузнецов")
+        assert sqlite_phonebook.search("сидоров") == []
+        assert [c.id for c in sqlite_phonebook.search("кузнец")] == [3]
+    
+    def test_save_to_new_file(self, sqlite_phonebook, db_file):
+        """Тест сохранения в другой файл"""
+        new_file = db_file + '.copy.db'
+        sqlite_phonebook.filename = new_file
+        assert sqlite_phonebook.save_to_file() is True
+        sqlite_phonebook.add_contact(Contact(name="Анна", phone="123"))
+        sqlite_phonebook.save_to_file()
+        
+        copy = SQLitePhoneBook(filename=new_file)
+        copy.load_from_file()
+        assert copy.count == 4
+        copy.close()
+    
+    def test_corrupted_file(self, temp_file):
+        """Тест что файл, не являющийся базой, не загружается"""
+        with open(temp_file, 'w') as f:
+            f.write("не база данных" * 100)
+        phonebook = SQLitePhoneBook(filename=temp_file)
+        assert phonebook.load_from_file() is False
+    
+    def test_duplicate_id_keeps_first(self):
+        """Тест что при дублирующихся ID сохраняется первый контакт"""
+        store = SQLiteContactStore()
+        store.load([Contact("А", "1", contact_id=1), Contact("Б", "2", contact_id=1)])
+        assert len(store) == 1
+        assert store.get(1).name == "А"
+
+
+class TestMigrateFromJson:
+    """Тесты переноса справочника из JSON в SQLite"""
+    
+    def test_migrate(self, sample_json_data, db_file):
+        """Тест переноса контактов"""
+        assert migrate_from_json(sample_json_data, db_file) == 2
+        phonebook = SQLitePhoneBook(filename=db_file)
+        phonebook.load_from_file()
+        assert [c.name for c in phonebook.contacts] == ["Тест1", "Тест2"]
+        assert [c.id for c in phonebook.search("ком2")] == [2]
+        phonebook.close()
+    
+    def test_migrate_assigns_missing_ids(self, temp_file, db_file):
+        """Тест что контакты без ID получают новые ID, а некорректные пропускаются"""
+        with open(temp_file, 'w', encoding='utf-8') as f:
+            f.write('{"contacts": [{"name": "Без ID", "phone": "1"}, '
+                    '{"id": 5, "name": "С ID", "phone": "2"}, {"id": 6, "name": "", "phone": "3"}]}')
+        assert migrate_from_json(temp_file, db_file) == 2
+        connection = sqlite3.connect(db_file)
+        rows = connection.execute("SELECT id, name FROM contacts ORDER BY id").fetchall()
+        connection.close()
+        assert rows == [(5, "С ID"), (6, "Без ID")]
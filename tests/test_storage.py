@@ -0,0 +1,261 @@
+"""
+Тесты для хранилищ контактов
+"""
+
+import pytest
+import json
+from model import Contact, ContactsView, PhoneBook, ListContactStore, ColumnarContactStore
+from exceptions import ContactNotFoundError
+
+
+@pytest.fixture(params=[ListContactStore, ColumnarContactStore])
+def store(request):
+    """Создает пустое хранилище каждого типа"""
+    return request.param()
+
+
+@pytest.fixture(params=[ListContactStore, ColumnarContactStore])
+def store_phonebook(request, temp_file, sample_contacts):
+    """Создает справочник с контактами поверх хранилища каждого типа"""
+    phonebook = PhoneBook(filename=temp_file, store=request.param())
+    for contact in sample_contacts:
+        phonebook.add_contact(contact)
+    return phonebook
+
+
+class TestContactStore:
+    """Общие тесты для хранилищ контактов"""
+    
+    def test_append_and_get(self, store, sample_contacts):
+        """Тест добавления и получения контактов"""
+        for contact in sample_contacts:
+            store.append(contact)
+        assert len(store) == 3
+        assert store.get(2) == sample_contacts[1]
+        assert store.get(999) is None
+    
+    def test_iteration_order(self, store, sample_contacts):
+        """Тест что перебор идет в порядке добавления"""
+        for contact in reversed(sample_contacts):
+            store.append(contact)
+        assert [c.id for c in store] == [3, 2, 1]
+        assert store.get(1) == sample_contacts[0]
+    
+    def test_remove(self, store, sample_contacts):
+        """Тест удаления контакта"""
+        store.load(sample_contacts)
+        store.remove(2)
+        assert len(store) == 2
+        assert store.get(2) is None
+        assert [c.id for c in store] == [1, 3]
+    
+    @pytest.mark.parametrize("ids", [[1, 1, 1], [5, 1, 1, 1]])
+    def test_remove_duplicate_id(self, store, ids):
+        """Тест что после удаления контакта с дублирующимся ID находится следующий"""
+        store.load(Contact(name=f"Контакт {i}", phone=str(i), contact_id=contact_id)
+                   for i, contact_id in enumerate(ids))
+        first = len(ids) - 3
+        for i in range(first, len(ids)):
+            assert store.get(1).name == f"Контакт {i}"
+            store.remove(1)
+        assert store.get(1) is None
+        assert len(store) == len(ids) - 3
+    
+    def test_get_many_keeps_store_order(self, store, sample_contacts):
+        """Тест что get_many возвращает контакты в порядке хранилища"""
+        store.load(sample_contacts)
+        assert [c.id for c in store.get_many({3, 1, 999})] == [1, 3]
+    
+    def test_update(self, store, sample_contacts):
+        """Тест сохранения измененных полей"""
+        store.load(sample_contacts)
+        contact = store.get(1)
+        contact.name = "Новое имя"
+        contact.comment = ""
+        store.update(contact)
+        assert store.get(1).name == "Новое имя"
+        assert store.get(1).comment == ""
+    
+    def test_many_removals_compact(self, store):
+        """Тест что уплотнение сохраняет оставшиеся записи"""
+        store.load(Contact(name=f"Тест{i}", phone=str(i), contact_id=i) for i in range(1, 201))
+        for contact_id in range(1, 201, 2):
+            store.remove(contact_id)
+        assert len(store) == 100
+        assert [c.id for c in store] == list(range(2, 201, 2))
+        assert store.get(100).name == "Тест100"
+
+
+class TestColumnarContactStore:
+    """Тесты для колоночного хранилища"""
+    
+    def test_contact_without_id_rejected(self):
+        """Тест что контакт без ID не принимается"""
+        with pytest.raises(ValueError):
+            ColumnarContactStore().append(Contact(name="Тест", phone="123"))
+    
+    def test_unicode_roundtrip(self):
+        """Тест хранения строк с кириллицей и эмодзи"""
+        store = ColumnarContactStore()
+        store.append(Contact(name="Иван", phone="+7 (999) 123-45-67", comment="Друг 😀", contact_id=1))
+        contact = store.get(1)
+        assert contact.name == "Иван"
+        assert contact.comment == "Друг 😀"
+    
+    def test_unsorted_ids(self):
+        """Тест поиска по ID, если ID добавлены не по возрастанию"""
+        store = ColumnarContactStore()
+        for contact_id in (5, 2, 9, 1):
+            store.append(Contact(name=f"Тест{contact_id}", phone="1", contact_id=contact_id))
+        for contact_id in (5, 2, 9, 1):
+            assert store.get(contact_id).name == f"Тест{contact_id}"
+        store.remove(2)
+        assert store.get(2) is None
+        assert [c.id for c in store] == [5, 9, 1]
+    
+    def test_updates_reclaim_heap(self):
+        """Тест что многократные изменения не раздувают буфер строк"""
+        store = ColumnarContactStore()
+        store.append(Contact(name="Тест", phone="123", contact_id=1))
+        contact = store.get(1)
+        for i in range(2000):
+            contact.comment = f"Комментарий номер {i} " * 5
+            store.update(contact)
+        assert store.heap_size < 2 * ColumnarContactStore._COMPACT_MIN_GARBAGE
+        assert store.get(1).comment == contact.comment
+    
+    def test_materializes_new_objects(self):
+        """Тест что контакты создаются при каждом обращении"""
+        store = ColumnarContactStore()
+        store.append(Contact(name="Тест", phone="123", contact_id=1))
+        assert store.get(1) == store.get(1)
+        assert store.get(1) is not store.get(1)
+
+
+class TestPhoneBookWithStore:
+    """Тесты справочника поверх разных хранилищ"""
+    
+    def test_public_api(self, store_phonebook):
+        """Тест основных операций справочника"""
+        assert store_phonebook.count == 3
+        assert store_phonebook.get_contact(1).name == "Иван Иванов"
+        
+        store_phonebook.update_contact(1, name="Олег", phone="8 (800) 000-00-00")
+        assert store_phonebook.get_contact(1).name == "Олег"
+        assert [c.id for c in store_phonebook.find_by_phone("88000000000")] == [1]
+        
+        store_phonebook.delete_contact(2)
+        assert store_phonebook.count == 2
+        with pytest.raises(ContactNotFoundError):
+            store_phonebook.get_contact(2)
+    
+    def test_search_and_lookups(self, store_phonebook):
+        """Тест поиска, автодополнения и поиска по телефону"""
+        assert [c.id for c in store_phonebook.search("ив")] == [1]
+        assert [c.id for c in store_phonebook.search("999", field="phone")] == [1, 2]
+        assert [c.id for c in store_phonebook.complete("пет")] == [2, 3]
+        assert [c.id for c in store_phonebook.search_phone_suffix("3535")] == [3]
+    
+    def test_contacts_property_returns_copy(self, store_phonebook):
+        """Тест что contacts возвращает независимое неизменяемое представление"""
+        contacts = store_phonebook.contacts
+        with pytest.raises(AttributeError):
+            contacts.append(Contact(name="Новый", phone="999"))
+        store_phonebook.add_contact(Contact(name="Новый", phone="999"))
+        store_phonebook.delete_contact(4)
+        assert len(contacts) == 3
+        assert store_phonebook.count == 3
+        assert [c.id for c in store_phonebook.contacts] == [1, 2, 3]
+    
+    def test_save_and_load(self, store_phonebook, temp_file):
+        """Тест сохранения и загрузки"""
+        store_phonebook.save_to_file()
+        phonebook = PhoneBook(filename=temp_file, store=ColumnarContactStore())
+        assert phonebook.load_from_file() is True
+        assert [c.name for c in phonebook.contacts] == [c.name for c in store_phonebook.contacts]
+        assert phonebook.next_id == 4
+    
+    def test_load_streams_into_store(self, temp_file, monkeypatch):
+        """Тест что загрузка передает контакты в хранилище потоково, без общего списка"""
+        with open(temp_file, 'w', encoding='utf-8') as f:
+            json.dump({"contacts": [{"id": 1, "name": "А", "phone": "1"}, {"id": 2, "name": "Б", "phone": "2"}]}, f)
+        received = []
+        original_load = ColumnarContactStore.load
+        
+        def load(store, contacts):
+            received.append(contacts)
+            original_load(store, contacts)
+        
+        monkeypatch.setattr(ColumnarContactStore, 'load', load)
+        phonebook = PhoneBook(filename=temp_file, store=ColumnarContactStore())
+        assert phonebook.load_from_file() is True
+        assert not isinstance(received[0], (list, tuple))
+        assert phonebook.count == 2
+    
+    @pytest.mark.parametrize("store_factory", [None, ColumnarContactStore])
+    def test_load_assigns_missing_ids_in_file_order(self, temp_file, store_factory):
+        """Тест что контакты без ID получают ID после максимального и остаются на своих местах"""
+        with open(temp_file, 'w', encoding='utf-8') as f:
+            json.dump({"contacts": [
+                {"name": "Без ID 1", "phone": "1"},
+                {"id": 7, "name": "С ID", "phone": "2"},
+                {"id": 3, "name": "Неверный"},
+                {"name": "Без ID 2", "phone": "3"}
+            ]}, f, ensure_ascii=False)
+        store = store_factory() if store_factory else None
+        phonebook = PhoneBook(filename=temp_file, store=store)
+        assert phonebook.load_from_file() is True
+        assert [(c.id, c.name) for c in phonebook.contacts] == [(8, "Без ID 1"), (7, "С ID"), (9, "Без ID 2")]
+        assert phonebook.get_contact(9).name == "Без ID 2"
+        assert phonebook.next_id == 10
+        assert phonebook.load_report.skipped == 1
+    
+    def test_failed_load_keeps_store(self, store_phonebook, temp_file):
+        """Тест что ошибка в середине файла не портит загруженное хранилище"""
+        with open(temp_file, 'w', encoding='utf-8') as f:
+            f.write('{"contacts": [{"id": 9, "name": "Новый", "phone": "9"}, ')
+        assert store_phonebook.load_from_file() is False
+        assert [c.id for c in store_phonebook.contacts] == [1, 2, 3]
+
+
+class TestContactsView:
+    """Тесты представлений контактов с копированием при записи"""
+    
+    def test_view_shares_list_until_write(self, sample_contacts):
+        """Тест что представление не копирует список, а удаление под ним копирует"""
+        store = ListContactStore()
+        store.load(sample_contacts)
+        view = store.view()
+        assert view._contacts is store._contacts
+        
+        # Добавление в конец не видно представлению и не требует копии
+        store.append(Contact(name="Новый", phone="999", contact_id=4))
+        assert view._contacts is store._contacts
+        assert [c.id for c in view] == [1, 2, 3]
+        
+        store.remove(2)
+        assert view._contacts is not store._contacts
+        assert [c.id for c in view] == [1, 2, 3]
+        assert [c.id for c in store.view()] == [1, 3, 4]
+    
+    def test_no_copy_without_live_views(self, sample_contacts):
+        """Тест что без живых представлений удаление не копирует список"""
+        store = ListContactStore()
+        store.load(sample_contacts)
+        assert len(store.view()) == 3
+        contacts = store._contacts
+        store.remove(2)
+        assert store._contacts is contacts
+    
+    def test_sequence_protocol(self, sample_contacts):
+        """Тест индексации, срезов и сравнения представления"""
+        view = ContactsView(list(sample_contacts) + [None], length=3)
+        assert len(view) == 3
+        assert view[-1].id == 3
+        assert [c.id for c in view[1:]] == [2, 3]
+        assert view == sample_contacts
+        assert view != sample_contacts[:2]
+        assert sample_contacts[0] in view
+        with pytest.raises(IndexError):
+            view[3]
+        assert not ContactsView([])
@@ -0,0 +1,163 @@
+"""
+Тесты для потокобезопасного справочника
+"""
+
+import pytest
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from model import Contact, PhoneBook
+from thread_safe import ReadWriteLock, ThreadSafePhoneBook
+
+
+class TestReadWriteLock:
+    """Тесты блокировки чтения/записи"""
+    
+    def test_readers_run_in_parallel(self):
+        """Тест что несколько читателей держат блокировку одновременно"""
+        lock = ReadWriteLock()
+        barrier = threading.Barrier(3, timeout=5)
+        
+        def reader():
+            with lock.read():
+                # Все три потока должны дойти до барьера, не выходя из блокировки
+                barrier.wait()
+        
+        threads = [threading.Thread(target=reader) for _ in range(3)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert not barrier.broken
+    
+    def test_writer_excludes_readers(self):
+        """Тест что читатель ждет, пока писатель держит блокировку"""
+        lock = ReadWriteLock()
+        events = []
+        
+        def reader():
+            with lock.read():
+                events.append('read')
+        
+        with lock.write():
+            thread = threading.Thread(target=reader)
+            thread.start()
+            thread.join(timeout=0.1)
+            events.append('write done')
+        thread.join(timeout=5)
+        assert events == ['write done', 'read']
+    
+    def test_reentrant(self):
+        """Тест повторного входа в том же потоке"""
+        lock = ReadWriteLock()
+        with lock.write():
+            with lock.read():
+                with lock.write():
+                    pass
+        with lock.read():
+            with lock.read():
+                pass
+    
+    def test_upgrade_forbidden(self):
+        """Тест что повышение блокировки чтения до записи запрещено"""
+        lock = ReadWriteLock()
+        with lock.read():
+            with pytest.raises(RuntimeError):
+                with lock.write():
+                    pass
+        # Блокировка освобождена и снова доступна для записи
+        with lock.write():
+            pass
+
+
+class TestThreadSafePhoneBook:
+    """Тесты справочника при одновременном доступе"""
+    
+    def test_same_behaviour(self, temp_file, sample_contacts):
+        """Тест что в одном потоке справочник работает как обычный"""
+        phonebook = ThreadSafePhoneBook(filename=temp_file)
+        for contact in sample_contacts:
+            phonebook.add_contact(contact)
+        phonebook.update_contact(2, comment="Изменен")
+        phonebook.delete_contact(3)
+        assert phonebook.save_to_file() is True
+        assert phonebook.has_unsaved_changes() is False
+        
+        loaded = PhoneBook(filename=temp_file)
+        loaded.load_from_file()
+        assert loaded.contacts == phonebook.contacts
+        assert [contact.id for contact in phonebook.find_by_phone("+7 (999) 123-45-67")] == [1]
+    
+    def test_write_lock_makes_operations_atomic(self, temp_file):
+        """Тест что изменение и номер изменения, взятые под write_lock, не разделяются чужой записью"""
+        phonebook = ThreadSafePhoneBook(filename=temp_file)
+        with phonebook.write_lock():
+            writer = threading.Thread(target=phonebook.add_contact, args=(Contact(name="Другой", phone="2"),))
+            writer.start()
+            contact = phonebook.add_contact(Contact(name="Первый", phone="1"))
+            version = phonebook.version
+            writer.join(timeout=0.05)
+            assert writer.is_alive()
+            assert phonebook.count == 1
+        writer.join()
+        assert contact.id == 1
+        assert version == 1
+        assert phonebook.version == 2
+    
+    def test_stress(self, temp_file):
+        """Стресс-тест: одновременные добавления, изменения, поиск и сохранения"""
+        phonebook = ThreadSafePhoneBook(filename=temp_file, search_index=True)
+        writers, per_writer = 8, 50
+        errors = []
+        
+        def writer(number):
+            for i in range(per_writer):
+                contact = phonebook.add_contact(Contact(name=f"Писатель {number} {i}", phone=f"{number} {i}"))
+                phonebook.update_contact(contact.id, comment=f"Обновлен {number}")
+                if i % 10 == 0:
+                    phonebook.save_to_file()
+        
+        def reader(_):
+            for _ in range(100):
+                for contact in phonebook.search("писатель"):
+                    if phonebook.find_by_id(contact.id) is None:
+                        errors.append(contact.id)
+                phonebook.find_by_phone("1 1")
+                phonebook.count
+        
+        with ThreadPoolExecutor(max_workers=16) as executor:
+            futures = [executor.submit(writer, number) for number in range(writers)]
+            futures += [executor.submit(reader, number) for number in range(8)]
+            for future in futures:
+                future.result()
+        
+        assert errors == []
+        ids = [contact.id for contact in phonebook.contacts]
+        # ID выделены атомарно: без пропусков и повторов
+        assert sorted(ids) == list(range(1, writers * per_writer + 1))
+        assert phonebook.next_id == writers * per_writer + 1
+        assert len(phonebook.search("обновлен")) == writers * per_writer
+        
+        assert phonebook.save_to_file() is True
+        loaded = PhoneBook(filename=temp_file)
+        loaded.load_from_file()
+        assert loaded.count == writers * per_writer
+    
+    def test_save_keeps_changes_made_during_write(self, temp_file, monkeypatch):
+        """Тест что изменения, сделанные во время записи файла, не считаются сохраненными"""
+        phonebook = ThreadSafePhoneBook(filename=temp_file)
+        phonebook.add_contact(Contact(name="Первый", phone="1"))
+        
+        from model import FileHandler
+        original_save = FileHandler.save_to_file
+        
+        def slow_save(filename, contacts):
+            # Пока файл пишется, другой поток изменяет справочник - читатели и писатели не ждут записи
+            thread = threading.Thread(target=phonebook.add_contact, args=(Contact(name="Второй", phone="2"),))
+            thread.start()
+            thread.join(timeout=5)
+            return original_save(filename, contacts)
+        
+        monkeypatch.setattr(FileHandler, 'save_to_file', staticmethod(slow_save))
+        assert phonebook.save_to_file() is True
+        assert phonebook.count == 2
+        assert phonebook.has_unsaved_changes() is True
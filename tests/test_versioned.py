@@ -0,0 +1,181 @@
+"""
+Тесты для справочника с историей версий
+"""
+
+import pytest
+import copy
+import random
+from model import Contact, MappedContactStore, PhoneBook
+from snapshot import SnapshotReader, write_snapshot
+from versioned import PersistentMap, VersionedPhoneBook
+from exceptions import ContactNotFoundError, ContactValidationError, InvalidInputError
+
+
+class TestPersistentMap:
+    """Тесты персистентного словаря (HAMT)"""
+    
+    def test_matches_dict(self):
+        """Тест случайных операций в сравнении со словарем (ключи с общими младшими битами)"""
+        rng = random.Random(1)
+        keys = [rng.randrange(1, 5000) * 32 for _ in range(300)] + list(range(1, 200))
+        state, expected = PersistentMap(), {}
+        for _ in range(3000):
+            key = rng.choice(keys)
+            if rng.random() < 0.35:
+                state = state.delete(key)
+                expected.pop(key, None)
+            else:
+                state = state.set(key, key * 2)
+                expected[key] = key * 2
+            assert len(state) == len(expected)
+        assert sorted(state) == sorted(expected)
+        assert all(state.get(key) == value for key, value in expected.items())
+        assert state.get(7 * 32 + 3) is None or 7 * 32 + 3 in expected
+    
+    def test_old_versions_unchanged(self):
+        """Тест что set и delete не изменяют исходный словарь"""
+        first = PersistentMap().set(1, 'a').set(33, 'b')
+        second = first.set(1, 'c').delete(33)
+        assert (first.get(1), first.get(33), len(first)) == ('a', 'b', 2)
+        assert (second.get(1), second.get(33), len(second)) == ('c', None, 1)
+        assert first.delete(999) is first
+
+
+class TestVersionedPhoneBook:
+    """Тесты версий, чтения по версии и отката"""
+    
+    @pytest.fixture
+    def versioned(self, temp_file, sample_contacts):
+        """Справочник с тремя контактами (версии 1-3)"""
+        phonebook = VersionedPhoneBook(filename=temp_file)
+        for contact in sample_contacts:
+            phonebook.add_contact(Contact(name=contact.name, phone=contact.phone, comment=contact.comment))
+        return phonebook
+    
+    def test_each_change_creates_version(self, versioned):
+        """Тест что каждое изменение создает версию"""
+        assert versioned.version == 3
+        versioned.update_contact(1, comment="Старый друг")
+        versioned.delete_contact(2)
+        assert versioned.version == 5
+        
+        assert versioned.at_version(0).count == 0
+        assert [c.id for c in versioned.at_version(3).contacts] == [1, 2, 3]
+        assert versioned.at_version(3).get_contact(1).comment == "Друг"
+        assert versioned.at_version(4).get_contact(1).comment == "Старый друг"
+        assert versioned.at_version(5).find_by_id(2) is None
+        with pytest.raises(ContactNotFoundError):
+            versioned.at_version(5).get_contact(2)
+        assert [c.id for c in versioned.at_version(4).search("мария")] == [2]
+    
+    def test_history_is_read_only(self, versioned):
+        """Тест что изменение полученного контакта не меняет историю"""
+        contact = versioned.at_version(3).get_contact(1)
+        contact.name = "Другое имя"
+        versioned.get_contact(1).name = "Изменено на месте"
+        assert versioned.at_version(3).get_contact(1).name == "Иван Иванов"
+    
+    def test_failed_update_recorded(self, versioned):
+        """Тест что поля, измененные до ошибки валидации, попадают в историю"""
+        with pytest.raises(ContactValidationError):
+            versioned.update_contact(1, name="Новое имя", phone="")
+        assert versioned.at_version(versioned.version).get_contact(1).name == "Новое имя"
+    
+    def test_rollback(self, versioned):
+        """Тест отката: состояние версии становится новой версией, ID не переиспользуются"""
+        versioned.delete_contact(1)
+        versioned.update_contact(3, name="Петр Петров")
+        assert versioned.rollback(3) == 6
+        assert [(c.id, c.name) for c in versioned.contacts] == [
+            (1, "Иван Иванов"), (2, "Мария Петрова"), (3, "Петр Сидоров")
+        ]
+        assert versioned.search("петров")[0].id == 2
+        assert versioned.has_unsaved_changes() is True
+        assert versioned.add_contact(Contact(name="Новый", phone="1")).id == 4
+        
+        # Откат тоже можно отменить
+        versioned.rollback(5)
+        assert versioned.find_by_id(1) is None
+        
+        with pytest.raises(InvalidInputError):
+            versioned.rollback(100)
+    
+    def test_rollback_over_mapped_snapshot(self, temp_file, sample_contacts):
+        """Тест отката справочника, загруженного из .pbk (хранилище поверх mmap)"""
+        pbk_file = temp_file + '.pbk'
+        write_snapshot(pbk_file, (contact.to_dict() for contact in sample_contacts))
+        phonebook = VersionedPhoneBook(filename=pbk_file)
+        phonebook.load_from_file()
+        assert isinstance(phonebook._store, MappedContactStore)
+        
+        phonebook.delete_contact(2)
+        phonebook.add_contact(Contact(name="Новый", phone="4"))
+        phonebook.rollback(1)
+        phonebook.add_contact(Contact(name="После отката", phone="5"))
+        
+        assert phonebook.find_by_id(3).name == "Петр Сидоров"
+        assert phonebook.find_by_id(4) is None
+        assert phonebook.find_by_id(5).name == "После отката"
+        assert [c.id for c in phonebook.contacts] == [1, 3, 5]
+        assert phonebook.save_to_file() is True
+        
+        loaded = PhoneBook(filename=pbk_file)
+        loaded.load_from_file()
+        assert [c.id for c in loaded.contacts] == [1, 3, 5]
+    
+    def test_load_starts_history(self, versioned, temp_file):
+        """Тест что загрузка начинает историю с версии 0"""
+        versioned.save_to_file()
+        loaded = VersionedPhoneBook(filename=temp_file)
+        assert loaded.load_from_file() is True
+        assert loaded.version == 0
+        assert loaded.at_version(0).contacts == versioned.contacts
+    
+    def test_load_does_not_decode_snapshot(self, temp_file, sample_contacts, monkeypatch):
+        """Тест что загрузка .pbk не декодирует записи для версии 0, а изменения копируют только свой контакт"""
+        pbk_file = temp_file + '.pbk'
+        write_snapshot(pbk_file, (contact.to_dict() for contact in sample_contacts))
+        decoded = []
+        original_record = SnapshotReader.record
+        monkeypatch.setattr(SnapshotReader, 'record',
+                            lambda self, row: decoded.append(row) or original_record(self, row))
+        phonebook = VersionedPhoneBook(filename=pbk_file)
+        assert phonebook.load_from_file() is True
+        assert decoded == []
+        
+        phonebook.update_contact(2, comment="Новый комментарий")
+        phonebook.delete_contact(3)
+        assert set(decoded) == {1, 2}
+        
+        first = phonebook.at_version(0)
+        assert first.count == 3
+        assert first.get_contact(2).comment == sample_contacts[1].comment
+        assert first.get_contact(3).name == "Петр Сидоров"
+        assert phonebook.at_version(1).get_contact(2).comment == "Новый комментарий"
+        assert [c.id for c in phonebook.at_version(2).contacts] == [1, 2]
+        assert phonebook.at_version(2).count == 2
+    
+    def test_search_copies_only_matches(self, versioned, monkeypatch):
+        """Тест что поиск по версии копирует только найденные контакты"""
+        copies = []
+        original_copy = copy.copy
+        monkeypatch.setattr(copy, 'copy', lambda value: copies.append(value) or original_copy(value))
+        results = versioned.at_version(3).search("петр")
+        assert [c.id for c in results] == [2, 3]
+        assert len(copies) == 2
+        results[0].name = "Изменено"
+        assert versioned.at_version(3).get_contact(2).name == "Мария Петрова"
+    
+    def test_rollback_with_journal(self, temp_file):
+        """Тест что после отката в режиме журнала сохраняется полный снимок"""
+        phonebook = VersionedPhoneBook(filename=temp_file, journal=True)
+        phonebook.load_from_file()
+        phonebook.add_contact(Contact(name="Первый", phone="1"))
+        phonebook.save_to_file()
+        phonebook.add_contact(Contact(name="Второй", phone="2"))
+        phonebook.rollback(1)
+        assert phonebook.save_to_file() is True
+        
+        loaded = PhoneBook(filename=temp_file, journal=True)
+        loaded.load_from_file()
+        assert [c.name for c in loaded.contacts] == ["Первый"]
@@ -0,0 +1,245 @@
+"""
+Модуль Thread Safe - справочник для одновременного доступа из нескольких потоков
+
+Чтение (поиск, получение контакта) выполняется параллельно под блокировкой чтения,
+изменения - под блокировкой записи. Сохранение копирует контакты под блокировкой
+чтения и пишет файл без блокировки, не мешая читателям.
+"""
+
+import copy
+import threading
+from contextlib import contextmanager
+from typing import Iterable, Iterator, List, Optional
+from model import Contact, ContactsView, FileHandler, PhoneBook
+from indexes import ContactIndex
+from exceptions import FileOperationError
+
+
+class ReadWriteLock:
+    """
+    Блокировка чтения/записи с приоритетом писателей.
+    
+    Повторный вход в том же потоке разрешен (вложенные вызовы методов справочника),
+    но повышение блокировки чтения до записи запрещено: это ведет к взаимной блокировке.
+    """
+    
+    def __init__(self):
+        self._condition = threading.Condition(threading.Lock())
+        self._readers = 0
+        self._writer = False
+        self._waiting_writers = 0
+        # Режим ('r' или 'w') и глубина вложенности блокировки в текущем потоке
+        self._local = threading.local()
+    
+    def _acquire_read(self):
+        with self._condition:
+            # Новые читатели ждут, пока пишет или ждет писатель, чтобы писатели не голодали
+            while self._writer or self._waiting_writers:
+                self._condition.wait()
+            self._readers += 1
+    
+    def _release_read(self):
+        with self._condition:
+            self._readers -= 1
+            if self._readers == 0:
+                self._condition.notify_all()
+    
+    def _acquire_write(self):
+        with self._condition:
+            self._waiting_writers += 1
+            try:
+                while self._writer or self._readers:
+                    self._condition.wait()
+            finally:
+                self._waiting_writers -= 1
+            self._writer = True
+    
+    def _release_write(self):
+        with self._condition:
+            self._writer = False
+            self._condition.notify_all()
+    
+    @contextmanager
+    def _hold(self, mode: str, acquire, release):
+        """Захватывает блокировку или увеличивает глубину вложенности, если поток уже ее держит"""
+        local = self._local
+        depth = getattr(local, 'depth', 0)
+        if depth:
+            if mode == 'w' and local.mode == 'r':
+                raise RuntimeError("Нельзя повысить блокировку чтения до блокировки записи")
+            local.depth = depth + 1
+            try:
+                yield
+            finally:
+                local.depth = depth
+            return
+        
+        acquire()
+        local.mode, local.depth = mode, 1
+        try:
+            yield
+        finally:
+            local.depth = 0
+            release()
+    
+    def read(self):
+        """Контекстный менеджер блокировки чтения"""
+        return self._hold('r', self._acquire_read, self._release_read)
+    
+    def write(self):
+        """Контекстный менеджер блокировки записи"""
+        return self._hold('w', self._acquire_write, self._release_write)
+
+
+class ThreadSafePhoneBook(PhoneBook):
+    """Телефонный справочник, безопасный для одновременного использования из нескольких потоков"""
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._lock = ReadWriteLock()
+        # Построение индекса при первом обращении выполняется читателем, поэтому защищено отдельно
+        self._index_lock = threading.Lock()
+        # Сохранения выполняются по одному
+        self._save_lock = threading.Lock()
+        # Номер изменения: сохранение сбрасывает флаг изменений, только если после снимка их не было
+        self._version = 0
+    
+    @property
+    def version(self) -> int:
+        """Геттер для номера изменения (увеличивается при каждом изменении и загрузке)"""
+        return self._version
+    
+    def read_lock(self):
+        """Контекстный менеджер блокировки чтения: несколько операций видят одно состояние справочника"""
+        return self._lock.read()
+    
+    def write_lock(self):
+        """Контекстный менеджер блокировки записи: изменение и чтение результата выполняются атомарно"""
+        return self._lock.write()
+    
+    @property
+    def filename(self) -> str:
+        """Геттер для имени файла"""
+        return self._filename
+    
+    @filename.setter
+    def filename(self, value: str):
+        """Сеттер для имени файла"""
+        with self._lock.write():
+            PhoneBook.filename.fset(self, value)
+    
+    @property
+    def contacts(self) -> ContactsView:
+        """Геттер для представления контактов"""
+        # Получение представления может уплотнить список хранилища, поэтому это запись (обычно O(1))
+        with self._lock.write():
+            return self._store.view()
+    
+    def iter_contacts(self) -> Iterator[Contact]:
+        """Перебирает контакты, список которых взят под блокировкой"""
+        return iter(self.contacts)
+    
+    @property
+    def count(self) -> int:
+        """Геттер для количества контактов"""
+        with self._lock.read():
+            return len(self._store)
+    
+    def load_from_file(self) -> bool:
+        """Загружает контакты из файла"""
+        with self._lock.write():
+            self._version += 1
+            return super().load_from_file()
+    
+    def save_to_file(self) -> bool:
+        """Сохраняет контакты в файл: копия берется под блокировкой чтения, запись идет без нее"""
+        with self._save_lock:
+            if self._journal_enabled or self._index_cache:
+                # Журнал и кеш индексов связаны с состоянием справочника - сохраняем целиком под записью
+                with self._lock.write():
+                    return super().save_to_file()
+            
+            with self._lock.read():
+                filename = self._filename
+                version = self._version
+                # Контакты изменяются на месте, поэтому копируются сами объекты, а не только список
+                snapshot = [copy.copy(contact) for contact in self._store]
+            
+            try:
+                FileHandler.save_to_file(filename, snapshot)
+            except FileOperationError as e:
+                print(f"Ошибка: {e}")
+                return False
+            
+            with self._lock.write():
+                if self._version == version:
+                    self._modified = False
+            return True
+    
+    def compact_journal(self):
+        """Переносит журнал в основной файл"""
+        with self._lock.write():
+            super().compact_journal()
+    
+    def _get_index(self, name: str, factory) -> ContactIndex:
+        """Возвращает вторичный индекс; построение при первом обращении выполняет один поток"""
+        index = self._indexes.get(name)
+        if index is not None:
+            return index
+        with self._index_lock:
+            return super()._get_index(name, factory)
+    
+    def add_contact(self, contact: Contact) -> Contact:
+        """Добавляет новый контакт (ID выделяется атомарно)"""
+        with self._lock.write():
+            self._version += 1
+            return super().add_contact(contact)
+    
+    def add_contacts(self, contacts: Iterable[Contact]) -> List[Contact]:
+        """Добавляет контакты пакетом"""
+        contacts = list(contacts)
+        with self._lock.write():
+            self._version += 1
+            return super().add_contacts(contacts)
+    
+    def find_by_id(self, contact_id: int) -> Optional[Contact]:
+        """Находит контакт по ID"""
+        with self._lock.read():
+            return super().find_by_id(contact_id)
+    
+    def update_contact(self, contact_id: int, **kwargs) -> Contact:
+        """Обновляет контакт"""
+        with self._lock.write():
+            self._version += 1
+            return super().update_contact(contact_id, **kwargs)
+    
+    def delete_contact(self, contact_id: int) -> bool:
+        """Удаляет контакт"""
+        with self._lock.write():
+            self._version += 1
+            return super().delete_contact(contact_id)
+    
+    def search(self, search_term: str, field: Optional[str] = None) -> List[Contact]:
+        """Поиск контактов"""
+        with self._lock.read():
+            return super().search(search_term, field)
+    
+    def find_by_phone(self, phone: str) -> List[Contact]:
+        """Находит контакты по канонической форме телефона"""
+        with self._lock.read():
+            return super().find_by_phone(phone)
+    
+    def search_phone_prefix(self, prefix: str) -> List[Contact]:
+        """Находит контакты по началу телефона"""
+        with self._lock.read():
+            return super().search_phone_prefix(prefix)
+    
+    def search_phone_suffix(self, suffix: str) -> List[Contact]:
+        """Находит контакты по окончанию телефона"""
+        with self._lock.read():
+            return super().search_phone_suffix(suffix)
+    
+    def complete(self, prefix: str, limit: int = 10) -> List[Contact]:
+        """Автодополнение по имени"""
+        with self._lock.read():
+            return super().complete(prefix, limit)
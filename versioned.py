@@ -0,0 +1,387 @@
+"""
+Модуль Versioned - справочник с историей версий на персистентной структуре данных
+
+Каждое изменение справочника создает новую версию словаря ID -> контакт, в котором
+хранятся только контакты, измененные после загрузки; остальные читаются из состояния
+после загрузки (версии 0). Словарь реализован как HAMT (hash array mapped trie): новая
+версия копирует только путь от корня до измененного листа (O(log n) узлов), остальные
+узлы общие с предыдущей версией. Поэтому хранение всей истории дешево, а чтение любой
+версии не требует ее восстановления.
+"""
+
+import copy
+from typing import Dict, Iterator, List, Optional, Tuple
+from model import Contact, ContactStore, ContactsView, PhoneBook
+from exceptions import ContactNotFoundError, InvalidContactIDError, InvalidInputError
+
+
+# Число бит ключа на один уровень дерева (32 ветви в узле)
+_BITS = 5
+_MASK = (1 << _BITS) - 1
+
+
+class _Node:
+    """Узел HAMT: битовая карта занятых ветвей и плотный кортеж записей (лист (ключ, значение) или узел)"""
+    
+    __slots__ = ('bitmap', 'entries')
+    
+    def __init__(self, bitmap: int, entries: tuple):
+        self.bitmap = bitmap
+        self.entries = entries
+
+
+_EMPTY = _Node(0, ())
+
+# Метки в изменениях версии: контакт удален / контакт не менялся после загрузки
+_DELETED = object()
+_UNCHANGED = object()
+
+
+def _replace(entries: tuple, index: int, entry) -> tuple:
+    """Возвращает копию кортежа с замененной записью"""
+    return entries[:index] + (entry,) + entries[index + 1:]
+
+
+def _pair(first: tuple, second: tuple, shift: int) -> _Node:
+    """Создает узел из двух листов, ключи которых совпали на предыдущих уровнях"""
+    first_bit = 1 << ((first[0] >> shift) & _MASK)
+    second_bit = 1 << ((second[0] >> shift) & _MASK)
+    if first_bit == second_bit:
+        return _Node(first_bit, (_pair(first, second, shift + _BITS),))
+    if first_bit < second_bit:
+        return _Node(first_bit | second_bit, (first, second))
+    return _Node(first_bit | second_bit, (second, first))
+
+
+def _set(node: _Node, key: int, value, shift: int) -> Tuple[_Node, bool]:
+    """Возвращает новый узел с записью key и признак того, что ключ добавлен"""
+    bit = 1 << ((key >> shift) & _MASK)
+    index = (node.bitmap & (bit - 1)).bit_count()
+    if not node.bitmap & bit:
+        entries = node.entries[:index] + ((key, value),) + node.entries[index:]
+        return _Node(node.bitmap | bit, entries), True
+    
+    entry = node.entries[index]
+    if isinstance(entry, _Node):
+        child, added = _set(entry, key, value, shift + _BITS)
+        return _Node(node.bitmap, _replace(node.entries, index, child)), added
+    if entry[0] == key:
+        return _Node(node.bitmap, _replace(node.entries, index, (key, value))), False
+    child = _pair(entry, (key, value), shift + _BITS)
+    return _Node(node.bitmap, _replace(node.entries, index, child)), True
+
+
+def _delete(node: _Node, key: int, shift: int):
+    """Возвращает новый узел без ключа (лист, если в узле осталась одна запись) или None, если ключа нет"""
+    bit = 1 << ((key >> shift) & _MASK)
+    if not node.bitmap & bit:
+        return None
+    index = (node.bitmap & (bit - 1)).bit_count()
+    entry = node.entries[index]
+    if isinstance(entry, _Node):
+        child = _delete(entry, key, shift + _BITS)
+        if child is None:
+            return None
+        if isinstance(child, _Node):
+            return _Node(node.bitmap, _replace(node.entries, index, child))
+        # Во вложенном узле остался один лист - поднимаем его на этот уровень
+        if len(node.entries) == 1 and shift:
+            return child
+        return _Node(node.bitmap, _replace(node.entries, index, child))
+    if entry[0] != key:
+        return None
+    
+    entries = node.entries[:index] + node.entries[index + 1:]
+    if len(entries) == 1 and not isinstance(entries[0], _Node) and shift:
+        return entries[0]
+    return _Node(node.bitmap & ~bit, entries)
+
+
+def _iter_leaves(node: _Node) -> Iterator[tuple]:
+    """Перебирает листы (ключ, значение) узла"""
+    stack = [node]
+    while stack:
+        for entry in reversed(stack.pop().entries):
+            if isinstance(entry, _Node):
+                stack.append(entry)
+            else:
+                yield entry
+
+
+class PersistentMap:
+    """Неизменяемый словарь с целыми ключами; set и delete возвращают новый словарь"""
+    
+    __slots__ = ('_root', '_size')
+    
+    def __init__(self, root: _Node = _EMPTY, size: int = 0):
+        self._root = root
+        self._size = size
+    
+    def __len__(self) -> int:
+        return self._size
+    
+    def __contains__(self, key: int) -> bool:
+        return self.get(key) is not None
+    
+    def __iter__(self) -> Iterator[int]:
+        return (key for key, _ in _iter_leaves(self._root))
+    
+    def get(self, key: int, default=None):
+        """Возвращает значение по ключу"""
+        node, shift = self._root, 0
+        while True:
+            bit = 1 << ((key >> shift) & _MASK)
+            if not node.bitmap & bit:
+                return default
+            entry = node.entries[(node.bitmap & (bit - 1)).bit_count()]
+            if not isinstance(entry, _Node):
+                return entry[1] if entry[0] == key else default
+            node, shift = entry, shift + _BITS
+    
+    def set(self, key: int, value) -> 'PersistentMap':
+        """Возвращает новый словарь с записью key -> value"""
+        root, added = _set(self._root, key, value, 0)
+        return PersistentMap(root, self._size + added)
+    
+    def delete(self, key: int) -> 'PersistentMap':
+        """Возвращает новый словарь без ключа (тот же словарь, если ключа нет)"""
+        root = _delete(self._root, key, 0)
+        if root is None:
+            return self
+        return PersistentMap(root, self._size - 1)
+    
+    def values(self) -> Iterator:
+        """Перебирает значения"""
+        return (value for _, value in _iter_leaves(self._root))
+
+
+class _Base:
+    """
+    Состояние справочника после загрузки (версия 0), относительно которого версии хранят изменения.
+    
+    Контакты, не изменявшиеся после загрузки, читаются из хранилища справочника без копирования
+    (снимок .pbk не декодируется заранее). Перед первым изменением контакта его исходное
+    состояние копируется в originals.
+    """
+    
+    def __init__(self, store: ContactStore, next_id: int):
+        self._store: Optional[ContactStore] = store
+        # Контакты с ID меньше next_id загружены из файла, остальные добавлены позже
+        self._next_id = next_id
+        self._originals: Dict[int, Contact] = {}
+        self._count = len(store)
+    
+    @property
+    def count(self) -> int:
+        """Геттер для количества контактов после загрузки"""
+        return self._count
+    
+    def get(self, contact_id: int) -> Optional[Contact]:
+        """Возвращает контакт в состоянии после загрузки (не копию) или None"""
+        if contact_id >= self._next_id:
+            return None
+        if contact_id in self._originals or self._store is None:
+            return self._originals.get(contact_id)
+        return self._store.get(contact_id)
+    
+    def remember(self, contact_id: int):
+        """Сохраняет исходное состояние контакта перед его первым изменением"""
+        if self._store is None or contact_id >= self._next_id or contact_id in self._originals:
+            return
+        contact = self._store.get(contact_id)
+        if contact is not None:
+            self._originals[contact_id] = copy.copy(contact)
+    
+    def remember_all(self):
+        """Сохраняет исходное состояние всех контактов (перед заменой содержимого хранилища)"""
+        if self._store is None:
+            return
+        for contact in self._store:
+            # При дублирующихся ID сохраняется первый контакт, как и в хранилищах
+            if contact.id < self._next_id and contact.id not in self._originals:
+                self._originals[contact.id] = copy.copy(contact)
+        self._store = None
+    
+    def __iter__(self) -> Iterator[Contact]:
+        """Перебирает контакты после загрузки (по одному на ID, не копии)"""
+        yield from self._originals.values()
+        if self._store is None:
+            return
+        seen = set()
+        for contact in self._store:
+            if contact.id < self._next_id and contact.id not in self._originals and contact.id not in seen:
+                seen.add(contact.id)
+                yield contact
+
+
+class PhoneBookVersion:
+    """Версия справочника только для чтения"""
+    
+    def __init__(self, number: int, base: _Base, changes: PersistentMap, count: int):
+        self._number = number
+        self._base = base
+        self._changes = changes
+        self._count = count
+    
+    @property
+    def number(self) -> int:
+        """Геттер для номера версии"""
+        return self._number
+    
+    @property
+    def count(self) -> int:
+        """Геттер для количества контактов"""
+        return self._count
+    
+    def _get(self, contact_id: int) -> Optional[Contact]:
+        """Возвращает контакт версии (не копию) или None"""
+        value = self._changes.get(contact_id, _UNCHANGED)
+        if value is _UNCHANGED:
+            return self._base.get(contact_id)
+        return None if value is _DELETED else value
+    
+    def _iter(self) -> Iterator[Contact]:
+        """Перебирает контакты версии (не копии) без определенного порядка"""
+        for contact in self._base:
+            if contact.id not in self._changes:
+                yield contact
+        for value in self._changes.values():
+            if value is not _DELETED:
+                yield value
+    
+    @property
+    def contacts(self) -> ContactsView:
+        """Геттер для представления контактов версии (по возрастанию ID)"""
+        contacts = sorted(self._iter(), key=lambda contact: contact.id)
+        # Контакты истории не изменяются, поэтому наружу отдаются копии
+        return ContactsView([copy.copy(contact) for contact in contacts])
+    
+    def find_by_id(self, contact_id: int) -> Optional[Contact]:
+        """Находит контакт по ID"""
+        if contact_id <= 0:
+            raise InvalidContactIDError(f"ID должен быть положительным числом, получено: {contact_id}")
+        contact = self._get(contact_id)
+        return copy.copy(contact) if contact is not None else None
+    
+    def get_contact(self, contact_id: int) -> Contact:
+        """Получает контакт по ID или выбрасывает исключение"""
+        contact = self.find_by_id(contact_id)
+        if contact is None:
+            raise ContactNotFoundError(f"Контакт с ID {contact_id} не найден в версии {self._number}")
+        return contact
+    
+    def search(self, search_term: str, field: Optional[str] = None) -> List[Contact]:
+        """Поиск контактов с той же семантикой, что и PhoneBook.search (результаты по возрастанию ID)"""
+        search_term = search_term.casefold()
+        fields = ('name', 'phone', 'comment') if field is None else (field,)
+        # Копируются только найденные контакты
+        results = [
+            copy.copy(contact) for contact in self._iter()
+            if any(search_term in getattr(contact, f'{name}_key', '') for name in fields)
+        ]
+        results.sort(key=lambda contact: contact.id)
+        return results
+
+
+class VersionedPhoneBook(PhoneBook):
+    """
+    Справочник с историей версий.
+    
+    Версия 0 - состояние после загрузки, каждое изменение создает следующую версию.
+    История хранится в памяти и начинается заново при загрузке файла. Контакты версии 0
+    не копируются при загрузке, поэтому изменять их нужно через методы справочника.
+    """
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._base = _Base(self._store, self._next_id)
+        # Изменения относительно версии 0 и количество контактов каждой версии
+        self._versions: List[Tuple[PersistentMap, int]] = [(PersistentMap(), self._base.count)]
+    
+    @property
+    def version(self) -> int:
+        """Геттер для номера текущей версии"""
+        return len(self._versions) - 1
+    
+    def _commit(self, changes: PersistentMap, count: int):
+        """Добавляет новую версию в историю"""
+        self._versions.append((changes, count))
+    
+    def _current(self) -> PhoneBookVersion:
+        """Возвращает текущую версию"""
+        return self.at_version(self.version)
+    
+    def load_from_file(self) -> bool:
+        """Загружает контакты из файла и начинает историю с версии 0"""
+        if not super().load_from_file():
+            return False
+        self._base = _Base(self._store, self._next_id)
+        self._versions = [(PersistentMap(), self._base.count)]
+        return True
+    
+    def add_contact(self, contact: Contact) -> Contact:
+        """Добавляет новый контакт"""
+        contact = super().add_contact(contact)
+        changes, count = self._versions[-1]
+        self._commit(changes.set(contact.id, copy.copy(contact)), count + 1)
+        return contact
+    
+    def add_contacts(self, contacts) -> List[Contact]:
+        """Добавляет контакты пакетом (одна версия на пакет)"""
+        contacts = super().add_contacts(contacts)
+        if contacts:
+            changes, count = self._versions[-1]
+            for contact in contacts:
+                changes = changes.set(contact.id, copy.copy(contact))
+            self._commit(changes, count + len(contacts))
+        return contacts
+    
+    def update_contact(self, contact_id: int, **kwargs) -> Contact:
+        """Обновляет контакт"""
+        self._base.remember(contact_id)
+        try:
+            return super().update_contact(contact_id, **kwargs)
+        finally:
+            # Поля, измененные до ошибки валидации, уже применены - они тоже попадают в историю
+            contact = self._store.get(contact_id)
+            if contact is not None and contact != self._current()._get(contact_id):
+                changes, count = self._versions[-1]
+                self._commit(changes.set(contact_id, copy.copy(contact)), count)
+    
+    def delete_contact(self, contact_id: int) -> bool:
+        """Удаляет контакт"""
+        self._base.remember(contact_id)
+        result = super().delete_contact(contact_id)
+        changes, count = self._versions[-1]
+        self._commit(changes.set(contact_id, _DELETED), count - 1)
+        return result
+    
+    def _check_version(self, version: int):
+        """Проверяет, что версия есть в истории"""
+        if not 0 <= version < len(self._versions):
+            raise InvalidInputError(f"Версия {version} не существует: доступны версии 0-{self.version}")
+    
+    def at_version(self, version: int) -> PhoneBookVersion:
+        """Возвращает версию справочника только для чтения"""
+        self._check_version(version)
+        changes, count = self._versions[version]
+        return PhoneBookVersion(version, self._base, changes, count)
+    
+    def rollback(self, version: int) -> int:
+        """
+        Возвращает справочник к состоянию версии и записывает его как новую версию
+        (откат тоже можно отменить). Контакты выстраиваются по возрастанию ID,
+        выданные ID повторно не используются. Возвращает номер новой версии.
+        """
+        self._check_version(version)
+        # Содержимое хранилища заменяется: версия 0 больше не может читаться из него
+        self._base.remember_all()
+        target = self.at_version(version)
+        contacts = sorted(target._iter(), key=lambda contact: contact.id)
+        self._store.load(copy.copy(contact) for contact in contacts)
+        self._rebuild_indexes()
+        # Откат не выражается записями журнала: при сохранении будет записан полный снимок
+        self._journal = None
+        self._modified = True
+        self._commit(*self._versions[version])
+        return self.version
@@ -3,7 +3,7 @@
 """
 
 from typing import List
-from model import Contact
+from model import Contact, LoadReport
 
 
 class View:
@@ -36,6 +36,22 @@ class View:
         print(f"\nНайден файл {filename}. Загружаю...")
         print(f"Загружено контактов: {count}")
     
+    @staticmethod
+    def show_load_report(report: LoadReport):
+        """Показывает сводку пропущенных при загрузке записей"""
+        if not report.skipped:
+            return
+        print(f"Пропущено некорректных записей: {report.skipped}")
+        for error_type, count in sorted(report.counts.items(), key=lambda item: -item[1]):
+            print(f"  {error_type}: {count}")
+        examples = report.examples
+        if examples:
+            print("Примеры:")
+            for record_number, message in examples:
+                print(f"  запись #{record_number}: {message}")
+            if report.skipped > len(examples):
+                print(f"  ... и еще {report.skipped - len(examples)}")
+    
     @staticmethod
     def show_file_not_found(filename: str):
         """Показывает сообщение о том, что файл не найден"""